@@ -0,0 +1,92 @@
+"""
+Benchmark: one insert cursor per feature vs. the buffered FeatureWriter (inline and with a writer thread).
+
+Features are produced on the fly (PolygonSet -> WKB) so producing and
+writing compete as they do in the scripts. The cursor-per-feature path, the
+pattern of create_polygon_from_utm called once per polygon, is timed on a
+sample and extrapolated, which is only fair while opening a cursor costs the
+same however many features the output already holds. That holds for a file
+geodatabase and for the local arcpy stand-in, whose cursors append to the
+shapefile in place; time against a real geodatabase for numbers that carry
+over to ArcGIS. With --workspace pointing at a file geodatabase (requires
+arcpy) the FeatureWriter batches run as edit operations of one edit
+session; by default a temporary shapefile folder is used.
+
+Run from the repository root:
+    python benchmarks/bench_feature_writer.py --features 100000 --batch-size 10000 --sample 200
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "scripts"))
+
+from arcpy_backend import BACKEND, arcpy  # noqa: E402
+from bench_local_backend import UTM_EPSG, synthetic_polygons  # noqa: E402
+from feature_writer import write_features  # noqa: E402
+
+
+def create_output(workspace, name):
+    path = os.path.join(workspace, name)
+    if arcpy.Exists(path):
+        arcpy.management.Delete(path)
+    arcpy.management.CreateFeatureclass(workspace, name, "POLYGON", spatial_reference=arcpy.SpatialReference(UTM_EPSG))
+    arcpy.management.AddField(path, "Seq", "LONG")
+    return path
+
+
+def rows(polygons):
+    for i, wkb in enumerate(polygons.to_wkb()):
+        yield wkb, [i]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--features", type=int, default=100000)
+    parser.add_argument("--vertices", type=int, default=16)
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument("--sample", type=int, default=200, help="features timed on the cursor-per-feature path")
+    parser.add_argument("--workspace", help="folder or file geodatabase to write into (default: a temporary folder)")
+    args = parser.parse_args()
+
+    polygons = synthetic_polygons(args.features, args.vertices)
+    temporary = None if args.workspace else tempfile.mkdtemp(prefix="bench_feature_writer_")
+    workspace = args.workspace or temporary
+    suffix = "" if workspace.lower().endswith((".gdb", ".sde")) else ".shp"
+    sample = min(args.sample, args.features)
+    results = {}
+    try:
+        path = create_output(workspace, "per_feature" + suffix)
+        start = time.perf_counter()
+        for wkb, attributes in rows(polygons[:sample]):
+            with arcpy.da.InsertCursor(path, ["SHAPE@WKB", "Seq"]) as cursor:
+                cursor.insertRow([wkb] + attributes)
+        results[f"cursor per feature ({sample:,} timed)"] = sample / (time.perf_counter() - start)
+
+        for label, background in (("FeatureWriter", False), ("FeatureWriter, writer thread", True)):
+            path = create_output(workspace, ("threaded" if background else "inline") + suffix)
+            stats = write_features(path, rows(polygons), ["Seq"], "SHAPE@WKB", batch_size=args.batch_size,
+                                   background=background)
+            count = int(arcpy.management.GetCount(path)[0])
+            if count != args.features:
+                raise RuntimeError(f"{label} wrote {count} features instead of {args.features}.")
+            results[f"{label} ({stats['batches']} batches)"] = stats["rows_per_second"]
+    finally:
+        if temporary:
+            shutil.rmtree(temporary, ignore_errors=True)
+
+    baseline = next(iter(results.values()))
+    print(f"Features: {args.features:,} x {args.vertices} vertices; batch size {args.batch_size:,}; workspace: "
+          f"{'temporary folder' if temporary else workspace} ({BACKEND} backend)")
+    print(f"Cursor per feature: extrapolated from {sample:,} features; assumes opening a cursor does not "
+          f"slow down as the output grows.")
+    for label, rate in results.items():
+        print(f"{label + ':':44s}{rate:12,.0f} features/s  ({rate / baseline:6.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
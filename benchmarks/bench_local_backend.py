@@ -0,0 +1,80 @@
+"""
+Benchmark: a polygon shapefile round trip (create, insert, project, read back) through arcpy_backend.
+
+Without ArcGIS (or with ARCPY_BACKEND=local) this runs on the pure-Python
+stand-in, which gives the other benchmarks a reproducible baseline on any
+machine; with arcpy it times the same calls on ArcGIS.
+
+Run from the repository root:
+    python benchmarks/bench_local_backend.py --polygons 20000 --vertices 16
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "scripts"))
+
+from arcpy_backend import BACKEND, arcpy  # noqa: E402
+from polygon_set import PolygonSet  # noqa: E402
+
+UTM_EPSG = 32717
+
+
+def synthetic_polygons(n_polygons, n_vertices, seed=0):
+    """Clockwise star-shaped rings in UTM zone 17S coordinates."""
+    rng = np.random.default_rng(seed)
+    center_x = rng.uniform(500000, 700000, (n_polygons, 1))
+    center_y = rng.uniform(9700000, 9900000, (n_polygons, 1))
+    angles = -np.linspace(0, 2 * np.pi, n_vertices, endpoint=False)
+    radius = rng.uniform(50, 500, (n_polygons, 1)) * rng.uniform(0.6, 1.0, (n_polygons, n_vertices))
+    x = (center_x + radius * np.cos(angles)).ravel()
+    y = (center_y + radius * np.sin(angles)).ravel()
+    return PolygonSet(x, y, np.arange(n_polygons + 1) * n_vertices)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--polygons", type=int, default=20000)
+    parser.add_argument("--vertices", type=int, default=16)
+    args = parser.parse_args()
+
+    polygons = synthetic_polygons(args.polygons, args.vertices)
+    folder = tempfile.mkdtemp(prefix="bench_local_backend_")
+    timings = {}
+    try:
+        start = time.perf_counter()
+        arcpy.management.CreateFeatureclass(folder, "polygons.shp", "POLYGON",
+                                            spatial_reference=arcpy.SpatialReference(UTM_EPSG))
+        with arcpy.da.InsertCursor(os.path.join(folder, "polygons.shp"), ["SHAPE@WKB", "Id"]) as cursor:
+            for i, wkb in enumerate(polygons.to_wkb()):
+                cursor.insertRow([wkb, i % 100000])
+        timings["create + insert"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        arcpy.management.Project(os.path.join(folder, "polygons.shp"), os.path.join(folder, "wgs84.shp"),
+                                 arcpy.SpatialReference(4326))
+        timings["project to WGS 84"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with arcpy.da.SearchCursor(os.path.join(folder, "wgs84.shp"), ["SHAPE@"],
+                                   spatial_reference=arcpy.SpatialReference(UTM_EPSG)) as cursor:
+            areas = np.array([row[0].area for row in cursor])
+        timings["read back (projected on read)"] = time.perf_counter() - start
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+    error = np.max(np.abs(areas - polygons.area()) / polygons.area())
+    print(f"Backend: {BACKEND}; polygons: {args.polygons:,} x {args.vertices} vertices")
+    for step, seconds in timings.items():
+        print(f"{step + ':':32s}{seconds:8.3f} s  ({args.polygons / seconds:,.0f} features/s)")
+    print(f"Largest relative area change after the round trip: {error:.1e}")
+
+
+if __name__ == "__main__":
+    main()
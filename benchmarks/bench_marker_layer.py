@@ -0,0 +1,65 @@
+"""
+Benchmark: one marker layer per point vs. one bulk multi-point marker layer.
+
+Requires ArcGIS Pro's Python (arcpy) and a project with a map to draw into;
+the project is not saved. The per-point path is timed on a sample of the
+points and extrapolated to the full count.
+
+Run from the repository root:
+    python benchmarks/bench_marker_layer.py --aprx project.aprx --map Map --points 50000 --sample 200
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+import arcpy
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "scripts"))
+
+from fundamentals import create_basic_marker_layer, map_session  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--aprx", required=True, help="ArcGIS Pro project (.aprx) holding the target map")
+    parser.add_argument("--map", default="Map")
+    parser.add_argument("--points", type=int, default=50000)
+    parser.add_argument("--sample", type=int, default=200, help="points timed on the per-point path")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    points = np.column_stack([rng.uniform(-81.0, -75.0, args.points), rng.uniform(-5.0, 1.5, args.points)])
+    site_ids = np.arange(args.points)
+
+    aprx = arcpy.mp.ArcGISProject(args.aprx)
+    session = map_session(aprx, args.map)
+    sample = min(args.sample, args.points)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        for i in range(sample):
+            create_basic_marker_layer(aprx, args.map, f"bench_site_{i}", tuple(points[i]), session=session)
+        per_point_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        layer = create_basic_marker_layer(aprx, args.map, "bench_sites", points, attributes={"site_id": site_ids},
+                                          session=session)
+        bulk_seconds = time.perf_counter() - start
+
+    inserted = int(arcpy.management.GetCount(layer)[0]) if layer is not None else 0
+    session.remove_many([f"bench_site_{i}" for i in range(sample)] + ["bench_sites"])
+
+    estimated_seconds = per_point_seconds / sample * args.points
+    print(f"Points: {args.points:,}")
+    print(f"Per-point layers ({sample:,} timed): {per_point_seconds:8.3f} s  (~{estimated_seconds:,.0f} s for all points)")
+    print(f"One bulk layer:                 {bulk_seconds:8.3f} s  ({inserted:,} features)")
+    print(f"Estimated speedup:              {estimated_seconds / bulk_seconds:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
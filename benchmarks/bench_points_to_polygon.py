@@ -0,0 +1,99 @@
+"""
+Benchmark: PointsToLine → FeatureToPolygon → FeatureClassToShapefile vs. the direct in-memory path.
+
+Requires ArcGIS Pro's Python (arcpy). Synthetic vertex tables, one ring per
+sheet like the "Hoja1$Event" inputs, are written to a scratch geodatabase and
+converted with both paths; the polygon areas of both outputs are compared.
+
+Run from the repository root:
+    python benchmarks/bench_points_to_polygon.py --sheets 20 --vertices 500
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import arcpy
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "scripts"))
+
+from points_to_polygon_conversion import points_to_polygon_direct, process_points_to_polygon  # noqa: E402
+
+
+def make_sheets(gdb, n_sheets, n_vertices, seed=0):
+    """Write one point feature class per sheet, each holding a star-shaped parcel boundary in order."""
+    rng = np.random.default_rng(seed)
+    spatial_ref = arcpy.SpatialReference(32717)  # WGS 84 / UTM zone 17S
+    sheets = []
+    for i in range(n_sheets):
+        name = f"Sheet{i}_Event"
+        arcpy.management.CreateFeatureclass(gdb, name, "POINT", spatial_reference=spatial_ref)
+        center = rng.uniform([500000, 9700000], [700000, 9900000])
+        angles = np.sort(rng.uniform(0, 2 * np.pi, n_vertices))[::-1]  # clockwise
+        radii = rng.uniform(100, 200, n_vertices)
+        with arcpy.da.InsertCursor(os.path.join(gdb, name), ["SHAPE@XY"]) as cursor:
+            for x, y in zip(center[0] + radii * np.cos(angles), center[1] + radii * np.sin(angles)):
+                cursor.insertRow([(float(x), float(y))])
+        sheets.append(os.path.join(gdb, name))
+    return sheets
+
+
+def shapefile_areas(folder):
+    """Polygon areas of every shapefile in a folder, sorted by file name."""
+    areas = []
+    for filename in sorted(os.listdir(folder)):
+        if filename.endswith(".shp"):
+            with arcpy.da.SearchCursor(os.path.join(folder, filename), ["SHAPE@AREA"]) as cursor:
+                areas.extend(row[0] for row in cursor)
+    return np.asarray(areas)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sheets", type=int, default=20)
+    parser.add_argument("--vertices", type=int, default=500)
+    args = parser.parse_args()
+
+    workspace = tempfile.mkdtemp(prefix="bench_points_to_polygon_")
+    try:
+        arcpy.env.overwriteOutput = True
+        arcpy.management.CreateFileGDB(workspace, "input.gdb")
+        arcpy.management.CreateFileGDB(workspace, "scratch.gdb")
+        sheets = make_sheets(os.path.join(workspace, "input.gdb"), args.sheets, args.vertices)
+
+        tools_folder = os.path.join(workspace, "tools")
+        direct_folder = os.path.join(workspace, "direct")
+        os.makedirs(tools_folder)
+        os.makedirs(direct_folder)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            tools_ok = all([process_points_to_polygon(sheet, os.path.join(workspace, "scratch.gdb"), tools_folder)
+                            for sheet in sheets])
+            tools_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            direct_ok = all([points_to_polygon_direct(sheet, direct_folder) for sheet in sheets])
+            direct_seconds = time.perf_counter() - start
+
+        tools_areas = shapefile_areas(tools_folder)
+        direct_areas = shapefile_areas(direct_folder)
+        matches = tools_areas.shape == direct_areas.shape and np.allclose(tools_areas, direct_areas)
+
+        print(f"Sheets: {args.sheets:,}  Vertices per sheet: {args.vertices:,}")
+        print(f"Three-tool chain:  {tools_seconds:8.3f} s  ({'ok' if tools_ok else 'FAILED'})")
+        print(f"Direct in-memory:  {direct_seconds:8.3f} s  ({'ok' if direct_ok else 'FAILED'})")
+        print(f"Speedup:           {tools_seconds / direct_seconds:8.1f}x")
+        print(f"Areas identical:   {matches}")
+    finally:
+        shutil.rmtree(workspace, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark: memory and area/centroid time of per-vertex point objects vs. an array-backed PolygonSet.
+
+arcpy is not needed: the object-per-point model is represented by a small
+Point class carrying the same X/Y/Z/M/ID attributes as arcpy.Point (real
+arcpy Points are heavier still, as each wraps a native object). Peak
+memory is measured with tracemalloc while the polygons are held.
+
+Run from the repository root:
+    python benchmarks/bench_polygon_set.py --polygons 50000 --vertices 20
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "scripts"))
+
+from polygon_set import PolygonSet  # noqa: E402
+
+
+class Point:
+    def __init__(self, X, Y, Z=None, M=None, ID=0):
+        self.X, self.Y, self.Z, self.M, self.ID = X, Y, Z, M, ID
+
+
+def synthetic_coordinates(n_polygons, n_vertices, seed=0):
+    """Clockwise star-shaped rings in UTM zone 17S coordinates."""
+    rng = np.random.default_rng(seed)
+    center_x = rng.uniform(500000, 700000, (n_polygons, 1))
+    center_y = rng.uniform(9700000, 9900000, (n_polygons, 1))
+    angles = -np.linspace(0, 2 * np.pi, n_vertices, endpoint=False)
+    radius = rng.uniform(50, 500, (n_polygons, 1)) * rng.uniform(0.6, 1.0, (n_polygons, n_vertices))
+    return center_x + radius * np.cos(angles), center_y + radius * np.sin(angles)
+
+
+def point_area_centroid(points):
+    """Shoelace area and centroid of one ring of Point objects, in Python."""
+    x0, y0 = points[0].X, points[0].Y
+    area = cx = cy = 0.0
+    for p, q in zip(points, points[1:] + points[:1]):
+        px, py, qx, qy = p.X - x0, p.Y - y0, q.X - x0, q.Y - y0
+        cross = px * qy - qx * py
+        area += cross
+        cx += (px + qx) * cross
+        cy += (py + qy) * cross
+    return abs(area / 2), x0 + cx / (3 * area), y0 + cy / (3 * area)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--polygons", type=int, default=50000)
+    parser.add_argument("--vertices", type=int, default=20)
+    args = parser.parse_args()
+
+    xs, ys = synthetic_coordinates(args.polygons, args.vertices)
+    coordinates = [list(zip(x.tolist(), y.tolist())) for x, y in zip(xs, ys)]
+
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    point_polygons = [[Point(x, y) for x, y in ring] for ring in coordinates]
+    point_bytes = tracemalloc.get_traced_memory()[0] - baseline
+    baseline = tracemalloc.get_traced_memory()[0]
+    polygons = PolygonSet.from_coordinates(coordinates)
+    set_bytes = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    point_results = np.array([point_area_centroid(ring) for ring in point_polygons])
+    point_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    area, centroid = polygons.area(), polygons.centroid()
+    set_seconds = time.perf_counter() - start
+
+    matches = np.allclose(point_results[:, 0], area, rtol=1e-9) and np.allclose(point_results[:, 1:], centroid,
+                                                                                rtol=0, atol=1e-6)
+    n_vertices = args.polygons * args.vertices
+    print(f"Polygons: {args.polygons:,} x {args.vertices} vertices ({n_vertices:,} vertices)")
+    print(f"Point objects: {point_bytes / 2 ** 20:8.1f} MiB  area+centroid {point_seconds:8.3f} s")
+    print(f"PolygonSet:    {set_bytes / 2 ** 20:8.1f} MiB  area+centroid {set_seconds:8.3f} s")
+    print(f"Memory ratio:  {point_bytes / max(set_bytes, 1):8.1f}x   speedup {point_seconds / set_seconds:8.1f}x")
+    print(f"Areas and centroids identical: {matches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark: reprojecting polygon vertices every run vs. through the on-disk ProjectionCache, and cached SpatialReferences.
+
+The first cached pass projects and stores the arrays (misses); the second
+pass, as on a re-run over unchanged inputs, only hashes and loads them
+(hits). SpatialReference construction is timed through arcpy_backend
+(ArcGIS when installed, otherwise the local stand-in).
+
+Run from the repository root:
+    python benchmarks/bench_projection_cache.py --polygons 100000 --vertices 16 --chunk-size 10000
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "scripts"))
+
+from arcpy_backend import BACKEND, arcpy  # noqa: E402
+from bench_local_backend import UTM_EPSG, synthetic_polygons  # noqa: E402
+from projection_cache import ProjectionCache, spatial_reference, spatial_reference_cache_info  # noqa: E402
+from utm_projection import WGS84_EPSG  # noqa: E402
+
+
+def project_chunks(polygons, chunk_size, cache=None):
+    """Project the set chunk by chunk, as create_kml_from_utm_batch does; returns the projected sets."""
+    return [polygons[start:start + chunk_size].project(UTM_EPSG, WGS84_EPSG, cache=cache)
+            for start in range(0, len(polygons), chunk_size)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--polygons", type=int, default=100000)
+    parser.add_argument("--vertices", type=int, default=16)
+    parser.add_argument("--chunk-size", type=int, default=10000, help="polygons per projected (and cached) chunk")
+    parser.add_argument("--references", type=int, default=2000, help="SpatialReference lookups to time")
+    args = parser.parse_args()
+
+    polygons = synthetic_polygons(args.polygons, args.vertices)
+    folder = tempfile.mkdtemp(prefix="bench_projection_cache_")
+    try:
+        start = time.perf_counter()
+        expected = project_chunks(polygons, args.chunk_size)
+        plain_seconds = time.perf_counter() - start
+
+        cache = ProjectionCache(folder)
+        start = time.perf_counter()
+        project_chunks(polygons, args.chunk_size, cache)
+        cold_seconds = time.perf_counter() - start
+        misses = cache.misses
+
+        start = time.perf_counter()
+        cached = project_chunks(polygons, args.chunk_size, cache)
+        warm_seconds = time.perf_counter() - start
+        stats = cache.stats()
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+    for a, b in zip(expected, cached):
+        if not (np.array_equal(a.x, b.x) and np.array_equal(a.y, b.y)):
+            raise RuntimeError("Cached coordinates differ from a fresh projection.")
+
+    codes = [UTM_EPSG, WGS84_EPSG, 32718, 32617] * (args.references // 4)
+    start = time.perf_counter()
+    for code in codes:
+        arcpy.SpatialReference(code)
+    construct_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    for code in codes:
+        spatial_reference(code)
+    lookup_seconds = time.perf_counter() - start
+    info = spatial_reference_cache_info()
+
+    print(f"Vertices: {polygons.n_vertices:,} in chunks of {args.chunk_size:,} polygons; "
+          f"cache: {stats['entries']} entries, {stats['bytes'] / 2 ** 20:.1f} MiB")
+    rows = [("Project every run", plain_seconds, ""),
+            (f"Cached, first run ({misses} misses)", cold_seconds, ""),
+            (f"Cached, re-run ({stats['hits']} hits)", warm_seconds, f"  ({plain_seconds / warm_seconds:.1f}x)")]
+    for label, seconds, note in rows:
+        print(f"{label + ':':36s}{seconds:8.3f} s{note}")
+    print(f"SpatialReference x {len(codes):,} ({BACKEND}): {construct_seconds * 1000:.1f} ms built, "
+          f"{lookup_seconds * 1000:.1f} ms cached ({info.hits} hits, {info.misses} misses)")
+
+
+if __name__ == "__main__":
+    main()
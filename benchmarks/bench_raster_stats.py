@@ -0,0 +1,149 @@
+"""
+Benchmark: whole-raster NumPy statistics vs. streaming block-wise statistics on a synthetic GeoTIFF.
+
+A tiled GeoTIFF (uncompressed or Deflate) is written to a temporary folder
+with a minimal writer, then summarized twice: once by assembling the full
+raster in memory, and once with raster_stats.raster_statistics. Peak Python
+memory of both paths is measured with tracemalloc.
+
+Run from the repository root:
+    python benchmarks/bench_raster_stats.py --size 8192 --bands 3 --compress deflate
+"""
+
+import argparse
+import os
+import shutil
+import struct
+import sys
+import tempfile
+import time
+import tracemalloc
+import zlib
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "scripts"))
+
+from raster_stats import _open_blocks, raster_statistics  # noqa: E402
+
+TILE = 256
+
+
+def write_tiled_geotiff(path, size, bands, compress, seed=0):
+    """Write a size x size, pixel-interleaved uint16 GeoTIFF (UTM 17S) tile by tile."""
+    rng = np.random.default_rng(seed)
+    tiles_across = -(-size // TILE)
+    offsets, counts = [], []
+    with open(path, "wb") as f:
+        f.write(b"II*\0" + struct.pack("<I", 0))  # IFD offset patched below
+        for row in range(tiles_across):
+            for col in range(tiles_across):
+                base = 1000 + 10 * row + col  # smooth trend plus noise, like terrain or imagery
+                tile = (base + rng.normal(0, 200, (TILE, TILE, bands))).clip(1, 65535).astype("<u2")
+                if row == 0 and col == 0:
+                    tile[:32, :32] = 0  # some NoData
+                data = tile.tobytes()
+                if compress == "deflate":
+                    data = zlib.compress(data, 1)
+                offsets.append(f.tell())
+                counts.append(len(data))
+                f.write(data)
+
+        n_tiles = len(offsets)
+        arrays_offset = f.tell()
+        f.write(struct.pack(f"<{n_tiles}I", *offsets))
+        f.write(struct.pack(f"<{n_tiles}I", *counts))
+        f.write(struct.pack(f"<{bands}H", *[16] * bands))
+        f.write(struct.pack(f"<{bands}H", *[1] * bands))
+        f.write(struct.pack("<3d", 0.1, 0.1, 0.0))
+        f.write(struct.pack("<6d", 0, 0, 0, 600000.0, 9800000.0, 0))
+        f.write(struct.pack("<16H", 1, 1, 0, 3, 1024, 0, 1, 1, 1025, 0, 1, 1, 3072, 0, 1, 32717))
+        bits_offset = arrays_offset + 8 * n_tiles
+        format_offset = bits_offset + 2 * bands
+        scale_offset = format_offset + 2 * bands
+        tie_offset = scale_offset + 24
+        keys_offset = tie_offset + 48
+
+        def entry(tag, field_type, count, value):
+            return struct.pack("<HHII", tag, field_type, count, value)
+
+        entries = [
+            entry(256, 4, 1, size), entry(257, 4, 1, size),
+            entry(258, 3, bands, bits_offset if bands > 2 else 16 | (16 << 16) * (bands == 2)),
+            entry(259, 3, 1, 8 if compress == "deflate" else 1),
+            entry(262, 3, 1, 1), entry(277, 3, 1, bands), entry(284, 3, 1, 1),
+            entry(322, 3, 1, TILE), entry(323, 3, 1, TILE),
+            entry(324, 4, n_tiles, arrays_offset), entry(325, 4, n_tiles, arrays_offset + 4 * n_tiles),
+            entry(339, 3, bands, format_offset if bands > 2 else 1 | (1 << 16) * (bands == 2)),
+            entry(33550, 12, 3, scale_offset), entry(33922, 12, 6, tie_offset),
+            entry(34735, 3, 16, keys_offset), entry(42113, 2, 2, ord("0")),  # GDAL_NODATA "0", stored inline
+        ]
+        ifd_offset = f.tell()
+        f.write(struct.pack("<H", len(entries)) + b"".join(entries) + struct.pack("<I", 0))
+        f.seek(4)
+        f.write(struct.pack("<I", ifd_offset))
+
+
+def whole_raster_statistics(path, size):
+    """Baseline: decode every block into one full array, then let NumPy reduce it."""
+    blocks = _open_blocks(path)
+    try:
+        across = size // TILE
+        full = np.empty((blocks.bands, size, size), dtype=blocks.dtype)
+        for i in range(blocks.count):
+            row, col = divmod(i, across)
+            for band, values in blocks.decode(i):
+                full[band, row * TILE:(row + 1) * TILE, col * TILE:(col + 1) * TILE] = values
+        results = []
+        for band in full:
+            valid = band[band != 0].astype(np.float64)
+            results.append({"min": valid.min(), "max": valid.max(), "mean": valid.mean(), "std": valid.std()})
+        del full
+        return results
+    finally:
+        blocks.close()
+
+
+def timed(function, *args, **kwargs):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, seconds, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=8192, help="raster width and height in pixels")
+    parser.add_argument("--bands", type=int, default=3)
+    parser.add_argument("--compress", choices=["none", "deflate"], default="deflate")
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    size = -(-args.size // TILE) * TILE
+    folder = tempfile.mkdtemp(prefix="bench_raster_stats_")
+    try:
+        path = os.path.join(folder, "synthetic.tif")
+        write_tiled_geotiff(path, size, args.bands, args.compress)
+        raw_mb = size * size * args.bands * 2 / 2 ** 20
+
+        baseline, baseline_seconds, baseline_peak = timed(whole_raster_statistics, path, size)
+        _, serial_seconds, serial_peak = timed(raster_statistics, path, max_workers=1)
+        streamed, parallel_seconds, parallel_peak = timed(raster_statistics, path, max_workers=args.workers)
+
+        matches = all(np.isclose(b["mean"], s["mean"]) and np.isclose(b["std"], s["std"])
+                      and b["min"] == s["min"] and b["max"] == s["max"] for b, s in zip(baseline, streamed))
+
+        print(f"Raster: {size:,} x {size:,} x {args.bands} uint16 ({raw_mb:,.0f} MiB), {args.compress}")
+        print(f"Whole raster in memory:   {baseline_seconds:8.3f} s  peak {baseline_peak / 2 ** 20:8.1f} MiB")
+        print(f"Streaming, 1 thread:      {serial_seconds:8.3f} s  peak {serial_peak / 2 ** 20:8.1f} MiB")
+        print(f"Streaming, {args.workers} threads:     {parallel_seconds:8.3f} s  peak {parallel_peak / 2 ** 20:8.1f} MiB")
+        print(f"Statistics identical:     {matches}")
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Benchmark: point-in-sheet lookups by full scan, through the carta STRtree, and through the SheetIndex grid hash.
+
+Sheets are a regular grid of rectangles (15' x 10'-style UTM tiles) with a
+few irregular sheets on top, as in the cartas JSON files. The full scan,
+what a lookup costs without an index, is timed on a sample and
+extrapolated; all three must agree on the sheet of every sampled point.
+
+Run from the repository root:
+    python benchmarks/bench_sheet_index.py --points 5000000 --sheets 5000 --irregular 20 --sample 2000
+"""
+
+import argparse
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "scripts"))
+
+from carta_index import STRtree  # noqa: E402
+from sheet_index import SheetIndex  # noqa: E402
+
+SHEET_WIDTH, SHEET_HEIGHT = 27750.0, 18500.0  # metres
+
+
+def synthetic_sheets(n_sheets, n_irregular, seed=0):
+    rng = np.random.default_rng(seed)
+    across = int(math.ceil(math.sqrt(n_sheets)))
+    col, row = np.meshgrid(np.arange(across), np.arange(-(-n_sheets // across)))
+    xmin = 166021.44 + col.ravel()[:n_sheets] * SHEET_WIDTH
+    ymin = 8800000.0 + row.ravel()[:n_sheets] * SHEET_HEIGHT
+    grid = np.column_stack([xmin, ymin, xmin + SHEET_WIDTH, ymin + SHEET_HEIGHT])
+    corner = rng.uniform(grid[:, :2].min(axis=0), grid[:, 2:].max(axis=0), (n_irregular, 2))
+    size = rng.uniform(0.3, 2.0, (n_irregular, 2)) * (SHEET_WIDTH, SHEET_HEIGHT)
+    return np.vstack([grid, np.column_stack([corner, corner + size])])
+
+
+def scan_locate(bounds, x, y):
+    """First sheet (in record order) containing each point, testing every sheet."""
+    found = np.full(len(x), -1, dtype=np.intp)
+    for i, (px, py) in enumerate(zip(x.tolist(), y.tolist())):
+        hits = np.flatnonzero((bounds[:, 0] <= px) & (px < bounds[:, 2]) & (bounds[:, 1] <= py) & (py < bounds[:, 3]))
+        if len(hits):
+            found[i] = hits[0]
+    return found
+
+
+def tree_locate(tree, bounds, x, y):
+    """First sheet containing each point, from STRtree envelope candidates."""
+    queries, items = tree.query_bulk(np.column_stack([x, y, x, y]))
+    box = bounds[items]
+    contained = (x[queries] < box[:, 2]) & (y[queries] < box[:, 3])
+    queries, first = np.unique(queries[contained], return_index=True)
+    found = np.full(len(x), -1, dtype=np.intp)
+    found[queries] = items[contained][first]
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--points", type=int, default=5000000)
+    parser.add_argument("--sheets", type=int, default=5000)
+    parser.add_argument("--irregular", type=int, default=20, help="extra sheets off the grid")
+    parser.add_argument("--sample", type=int, default=2000, help="points timed on the full scan")
+    parser.add_argument("--chunk-size", type=int, default=1 << 20, help="points per STRtree query")
+    args = parser.parse_args()
+
+    bounds = synthetic_sheets(args.sheets, args.irregular)
+    rng = np.random.default_rng(1)
+    x = rng.uniform(bounds[:, 0].min(), bounds[:, 2].max(), args.points)
+    y = rng.uniform(bounds[:, 1].min(), bounds[:, 3].max(), args.points)
+    sample = min(args.sample, args.points)
+
+    start = time.perf_counter()
+    scanned = scan_locate(bounds, x[:sample], y[:sample])
+    scan_seconds = (time.perf_counter() - start) / sample * args.points
+
+    start = time.perf_counter()
+    tree = STRtree(bounds)
+    tree_found = np.concatenate([tree_locate(tree, bounds, x[i:i + args.chunk_size], y[i:i + args.chunk_size])
+                                 for i in range(0, args.points, args.chunk_size)])
+    tree_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index = SheetIndex([f"Carta_{i}" for i in range(len(bounds))], bounds)
+    build_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    found = index.locate(x, y)
+    index_seconds = time.perf_counter() - start
+
+    if not (np.array_equal(found[:sample], scanned) and np.array_equal(found, tree_found)):
+        raise RuntimeError("The lookups disagree.")
+
+    print(f"Points: {args.points:,}; sheets: {len(bounds):,} ({index!r})")
+    print(f"Full scan ({sample:,} timed):  ~{scan_seconds:10.2f} s")
+    print(f"STRtree candidates:        {tree_seconds:10.3f} s  ({args.points / tree_seconds:,.0f} points/s)")
+    print(f"SheetIndex grid hash:      {index_seconds:10.3f} s  ({args.points / index_seconds:,.0f} points/s, "
+          f"built in {build_seconds * 1000:.1f} ms)")
+    print(f"Speedup vs. STRtree:       {tree_seconds / index_seconds:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
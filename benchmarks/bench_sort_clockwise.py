@@ -0,0 +1,99 @@
+"""
+Benchmark: per-point Python clockwise sorting vs. the vectorized batch API.
+
+Run from the repository root:
+    python benchmarks/bench_sort_clockwise.py --rings 20000 --vertices 40
+"""
+
+import argparse
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "scripts"))
+
+from sort_utm_clockwise import pack_rings, sort_rings_clockwise  # noqa: E402
+
+
+def sort_clockwise_python(points):
+    """The original per-point implementation, kept as the benchmark baseline."""
+    if not points:
+        return []
+    if len(points) < 3:
+        return points[:]
+
+    center_x = sum(p[0] for p in points) / len(points)
+    center_y = sum(p[1] for p in points) / len(points)
+
+    def calculate_angle(point):
+        return math.atan2(point[1] - center_y, point[0] - center_x)
+
+    sorted_points = sorted(points, key=lambda p: (calculate_angle(p) + 2 * math.pi) % (2 * math.pi))
+
+    smallest_angle_index = 0
+    smallest_angle = (calculate_angle(sorted_points[0]) + 2 * math.pi) % (2 * math.pi)
+    for i, point in enumerate(sorted_points[1:], 1):
+        angle = (calculate_angle(point) + 2 * math.pi) % (2 * math.pi)
+        if angle < smallest_angle:
+            smallest_angle = angle
+            smallest_angle_index = i
+    sorted_points = sorted_points[smallest_angle_index:] + sorted_points[:smallest_angle_index]
+
+    p1, p2, p3 = sorted_points[:3]
+    if (p2[0] - p1[0]) * (p3[1] - p1[1]) - (p2[1] - p1[1]) * (p3[0] - p1[0]) > 0:
+        sorted_points.reverse()
+    return sorted_points
+
+
+def make_rings(n_rings, n_vertices, seed=0):
+    """Random convex parcels (shuffled vertices) over a UTM zone 17S extent."""
+    rng = np.random.default_rng(seed)
+    centers = rng.uniform([500000, 9700000], [700000, 9900000], size=(n_rings, 2))
+    angles = rng.uniform(0, 2 * np.pi, size=(n_rings, n_vertices))
+    radii = rng.uniform(20, 200, size=(n_rings, 1))
+    xs = centers[:, :1] + radii * np.cos(angles)
+    ys = centers[:, 1:] + radii * np.sin(angles)
+    return [list(zip(x.tolist(), y.tolist())) for x, y in zip(xs, ys)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rings", type=int, default=20000)
+    parser.add_argument("--vertices", type=int, default=40)
+    args = parser.parse_args()
+
+    rings = make_rings(args.rings, args.vertices)
+    n_points = args.rings * args.vertices
+
+    start = time.perf_counter()
+    expected = [sort_clockwise_python(ring) for ring in rings]
+    python_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    x, y, offsets = pack_rings(rings)
+    pack_seconds = time.perf_counter() - start
+
+    batch_seconds = float("inf")
+    for _ in range(3):  # best of three, the first run pays NumPy warm-up costs
+        start = time.perf_counter()
+        sorted_x, sorted_y = sort_rings_clockwise(x, y, offsets)
+        batch_seconds = min(batch_seconds, time.perf_counter() - start)
+
+    # Both paths must agree on the clockwise orientation of every ring.
+    got = np.stack([sorted_x, sorted_y], axis=1)
+    want = np.asarray([p for ring in expected for p in ring])
+    matches = np.allclose(got, want)
+
+    print(f"Rings: {args.rings:,}  Vertices: {n_points:,}")
+    print(f"Per-point Python path: {python_seconds:8.3f} s")
+    print(f"Batch pack_rings:      {pack_seconds:8.3f} s")
+    print(f"Batch vectorized sort: {batch_seconds:8.3f} s")
+    print(f"Speedup (sort only):   {python_seconds / batch_seconds:8.1f}x")
+    print(f"Results identical:     {matches}")
+
+
+if __name__ == "__main__":
+    main()
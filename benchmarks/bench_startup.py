@@ -0,0 +1,78 @@
+"""
+Benchmark: cold import time of each helper module, and what the first arcpy use adds on top.
+
+Every measurement runs in a fresh interpreter, so module caches never carry
+over between entry points. "arcpy at import" shows whether importing the
+module already loaded the arcpy backend; with the lazy proxy in
+arcpy_backend it should be "no" everywhere, and the cost moves to the
+"first arcpy use" column, paid only by jobs that actually write through
+arcpy. Modules that run a workflow on import (the example scripts) are not
+listed.
+
+Run from the repository root:
+    python benchmarks/bench_startup.py --repeat 5
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+SCRIPTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "scripts")
+
+ENTRY_POINTS = [
+    "utm_projection", "sort_utm_clockwise", "polygon_set", "carta_index", "shapefile_writer", "shapefile_reader",
+    "kml_writer", "kml_reader", "tile_cache", "gdb_catalog", "raster_header", "raster_stats",
+    "utm_coords_to_polygon_shapefiles", "utm_coords_to_polygon_kml", "points_to_polygon_conversion",
+    "split_by_attributes", "shapefile_ingest", "layout_batch_export", "basemaps", "fundamentals",
+]
+
+_PROBE = """
+import time
+start = time.perf_counter()
+import {module}
+imported = time.perf_counter()
+import arcpy_backend
+loaded_at_import = arcpy_backend.is_loaded()
+arcpy_backend.arcpy.Exists
+used = time.perf_counter()
+print(imported - start, used - imported, int(loaded_at_import))
+"""
+
+
+def measure(module, repeat):
+    """Best-of-`repeat` (import seconds, first-use seconds, backend loaded at import)."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [SCRIPTS, os.environ.get("PYTHONPATH")])))
+    runs = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", _PROBE.format(module=module)], env=env, check=True,
+                                capture_output=True, text=True).stdout.split()
+        runs.append((float(output[0]), float(output[1]), output[2] == "1"))
+    return min(r[0] for r in runs), min(r[1] for r in runs), runs[0][2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per module (best is kept)")
+    parser.add_argument("modules", nargs="*", help="modules to time (default: all entry points)")
+    args = parser.parse_args()
+
+    rows = []
+    for module in args.modules or ENTRY_POINTS:
+        import_seconds, use_seconds, loaded = measure(module, args.repeat)
+        rows.append((module, f"{import_seconds * 1000:.1f}", f"{use_seconds * 1000:.1f}", "yes" if loaded else "no"))
+
+    headers = ("Module", "Import (ms)", "First arcpy use (ms)", "arcpy at import")
+    widths = [max(len(row[i]) for row in rows + [headers]) for i in range(len(headers))]
+
+    def render(row):
+        return "  ".join(str(cell).ljust(width) for cell, width in zip(row, widths)).rstrip()
+
+    print(render(headers))
+    print(render(["-" * width for width in widths]))
+    for row in rows:
+        print(render(row))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
-import arcpy
+from arcpy_backend import arcpy
 
 # Crear un mensaje "Hello World" usando la herramienta AddMessage
 arcpy.AddMessage("Hello, World!")
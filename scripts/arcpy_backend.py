@@ -0,0 +1,87 @@
+"""
+The arcpy module to use: ArcGIS's own when it can be imported, otherwise the
+pure-Python stand-in in arcpy_local.
+
+    from arcpy_backend import arcpy
+
+`arcpy` here is a lazy proxy: nothing is imported until one of its
+attributes is first used, so modules that only need it to write their
+output (or not at all, for the coordinate and geometry helpers) import in
+milliseconds instead of paying for the ArcGIS runtime up front. After the
+first use the proxy forwards every attribute to the loaded module.
+
+The ARCPY_BACKEND environment variable forces the choice: "arcpy" fails
+loudly when ArcGIS is missing, "local" uses the stand-in even where ArcGIS
+is installed (e.g. to benchmark both on the same machine). The default,
+"auto", prefers arcpy. BACKEND ("arcpy" or "local") is resolved, and the
+module loaded, when it is first read.
+"""
+
+import importlib
+import os
+
+BACKENDS = ("auto", "arcpy", "local")
+
+_loaded = {}
+
+
+def load_backend(choice=None):
+    """
+    Import the requested arcpy implementation.
+
+    Returns
+    -------
+    tuple(module, str)
+        The module and "arcpy" or "local".
+    """
+    choice = (choice or os.environ.get("ARCPY_BACKEND") or "auto").lower()
+    if choice not in BACKENDS:
+        raise ValueError(f"Unknown arcpy backend '{choice}'; expected one of {', '.join(BACKENDS)}.")
+    if choice != "local":
+        try:
+            return importlib.import_module("arcpy"), "arcpy"
+        except ImportError:
+            if choice == "arcpy":
+                raise
+    return importlib.import_module("arcpy_local"), "local"
+
+
+def _backend():
+    if "module" not in _loaded:
+        _loaded["module"], _loaded["name"] = load_backend()
+    return _loaded["module"]
+
+
+def is_loaded():
+    """True once the arcpy backend has been imported."""
+    return "module" in _loaded
+
+
+class _LazyArcpy:
+    """Module proxy that imports the backend on first attribute access."""
+
+    __slots__ = ()
+
+    def __getattr__(self, name):
+        return getattr(_backend(), name)
+
+    def __setattr__(self, name, value):
+        setattr(_backend(), name, value)
+
+    def __dir__(self):
+        return dir(_backend())
+
+    def __repr__(self):
+        if not is_loaded():
+            return "<arcpy (not imported yet)>"
+        return f"<arcpy proxy for {_loaded['module'].__name__}>"
+
+
+arcpy = _LazyArcpy()
+
+
+def __getattr__(name):
+    if name == "BACKEND":
+        _backend()
+        return _loaded["name"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,1021 @@
+"""
+Pure-Python/NumPy stand-in for the part of arcpy these scripts use.
+
+It lets the coordinate, shapefile and projection workflows run (and be
+tested and benchmarked) on machines without ArcGIS, such as Linux workers.
+Import it through arcpy_backend, which only falls back to this module when
+the real arcpy cannot be imported.
+
+Covered: SpatialReference (WGS 84 and WGS 84 / UTM zones), Point, Array,
+Extent, Polygon, PointGeometry, FromWKB, da.SearchCursor and
+da.InsertCursor, CreateFeatureclass, AddField(s), Project, CopyFeatures,
+Delete, GetCount, Describe, ListFields, Exists and a few helpers. Feature classes are
+shapefiles (polygon or point); geodatabases, layers, map documents and
+rasters still need arcpy. Where clauses accept comparisons, IN, IS [NOT]
+NULL, AND, OR, NOT and parentheses.
+"""
+
+import os
+import re
+import shutil
+import struct
+import types
+from itertools import islice
+
+import numpy as np
+
+from carta_index import wkb_rings
+from polygon_set import PolygonSet
+from shapefile_reader import ShapefileReader
+from shapefile_writer import SHAPE_POINT, SHAPE_POLYGON, ShapefileWriter
+from utm_projection import WGS84_EPSG, esri_wkt, project, utm_epsg_code, utm_parameters
+
+SHAPEFILE_PARTS = (".shp", ".shx", ".dbf", ".prj", ".cpg")
+
+env = types.SimpleNamespace(workspace=None, scratchWorkspace=None, overwriteOutput=False)
+
+_messages = []
+
+
+class ExecuteError(Exception):
+    """Raised when a tool fails, like arcpy.ExecuteError."""
+
+
+def AddMessage(message):
+    _messages.append(str(message))
+    print(message)
+
+
+def GetMessages(severity=0):
+    return "\n".join(_messages)
+
+
+def _fail(message):
+    _messages.append(message)
+    raise ExecuteError(message)
+
+
+# --- Spatial references ------------------------------------------------------------------------
+
+def _epsg_from_wkt(wkt):
+    """EPSG code of an Esri or OGC WKT for WGS 84 or a WGS 84 / UTM zone."""
+    match = re.search(r'PROJCS\["[^"]*UTM[_ ]zone[_ ](\d+),?\s*([NS])', wkt, re.IGNORECASE)
+    if match:
+        return utm_epsg_code(int(match.group(1)), match.group(2).upper())
+    if "PROJCS" not in wkt.upper() and re.search(r"WGS[_ ]?(19)?84", wkt, re.IGNORECASE):
+        return WGS84_EPSG
+    raise ValueError("Only WGS 84 and WGS 84 / UTM spatial references are supported without arcpy.")
+
+
+class SpatialReference:
+    """
+    WGS 84 (4326) or WGS 84 / UTM (326xx, 327xx) spatial reference.
+
+    Parameters
+    ----------
+    item : int, str, optional
+        EPSG code, WKT string or path to a .prj file.
+    """
+
+    def __init__(self, item=None):
+        self.factoryCode = 0
+        if item is None:
+            return
+        if isinstance(item, str) and not item.strip().isdigit():
+            if os.path.isfile(item):
+                with open(item, "r", encoding="ascii", errors="replace") as prj:
+                    item = prj.read()
+            item = _epsg_from_wkt(item)
+        epsg = int(item)
+        if epsg != WGS84_EPSG:
+            utm_parameters(epsg)  # raises ValueError for anything else
+        self.factoryCode = epsg
+
+    @property
+    def name(self):
+        if self.factoryCode == 0:
+            return "Unknown"
+        if self.factoryCode == WGS84_EPSG:
+            return "GCS_WGS_1984"
+        tm = utm_parameters(self.factoryCode)
+        return f"WGS_1984_UTM_Zone_{tm.zone}{tm.hemisphere}"
+
+    @property
+    def type(self):
+        return {0: "Unknown", WGS84_EPSG: "Geographic"}.get(self.factoryCode, "Projected")
+
+    @property
+    def PCSCode(self):
+        return self.factoryCode if self.type == "Projected" else 0
+
+    @property
+    def GCSCode(self):
+        return WGS84_EPSG if self.factoryCode else 0
+
+    @property
+    def linearUnitName(self):
+        return "Meter" if self.type == "Projected" else ""
+
+    def exportToString(self):
+        return esri_wkt(self.factoryCode) if self.factoryCode else ""
+
+    def __eq__(self, other):
+        return isinstance(other, SpatialReference) and other.factoryCode == self.factoryCode
+
+    def __hash__(self):
+        return hash(self.factoryCode)
+
+    def __repr__(self):
+        return f"<SpatialReference {self.name} ({self.factoryCode})>"
+
+
+def _as_spatial_reference(value):
+    if value is None or isinstance(value, SpatialReference):
+        return value
+    return SpatialReference(value)
+
+
+def _project_xy(x, y, source, target):
+    """Coordinates projected between two spatial references (unchanged if either is unknown)."""
+    if source is None or target is None or not source.factoryCode or not target.factoryCode:
+        return x, y
+    return project(x, y, source.factoryCode, target.factoryCode)
+
+
+# --- Geometry ----------------------------------------------------------------------------------
+
+class Point:
+    __slots__ = ("X", "Y", "Z", "M", "ID")
+
+    def __init__(self, X=None, Y=None, Z=None, M=None, ID=0):
+        self.X, self.Y, self.Z, self.M, self.ID = X, Y, Z, M, ID
+
+    def equals(self, other):
+        return other is not None and (self.X, self.Y) == (other.X, other.Y)
+
+    def __repr__(self):
+        return " ".join("NaN" if v is None else repr(v) for v in (self.X, self.Y, self.Z, self.M))
+
+
+class Array:
+    """A list of Points or of Arrays, with arcpy.Array's method names."""
+
+    def __init__(self, items=None):
+        self._items = [] if items is None else list(items)
+
+    def add(self, value):
+        self._items.append(value)
+
+    append = add
+
+    def extend(self, items):
+        self._items.extend(items)
+
+    def insert(self, index, value):
+        self._items.insert(index, value)
+
+    def getObject(self, index):
+        return self._items[index]
+
+    def remove(self, index):
+        del self._items[index]
+
+    def removeAll(self):
+        self._items.clear()
+
+    @property
+    def count(self):
+        return len(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __getitem__(self, index):
+        return self._items[index]
+
+    def __repr__(self):
+        return f"<Array {self._items!r}>"
+
+
+class Extent:
+    def __init__(self, XMin=None, YMin=None, XMax=None, YMax=None, spatial_reference=None):
+        self.XMin, self.YMin, self.XMax, self.YMax = XMin, YMin, XMax, YMax
+        self.spatialReference = _as_spatial_reference(spatial_reference)
+
+    @property
+    def width(self):
+        return self.XMax - self.XMin
+
+    @property
+    def height(self):
+        return self.YMax - self.YMin
+
+    def __repr__(self):
+        return f"{self.XMin} {self.YMin} {self.XMax} {self.YMax} NaN NaN NaN NaN"
+
+
+def _ring_coordinates(points):
+    coords = [(p.X, p.Y) for p in points if p is not None]
+    return np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+
+
+class Polygon:
+    """
+    Polygon backed by a one-element PolygonSet.
+
+    Parameters
+    ----------
+    inputs : Array
+        An Array of Points (one ring) or an Array of Arrays (one per part;
+        None entries inside a part separate its rings). Rings are closed
+        implicitly.
+    spatial_reference : SpatialReference, optional
+    """
+
+    type = "polygon"
+
+    def __init__(self, inputs=None, spatial_reference=None):
+        rings = []
+        items = list(inputs) if inputs is not None else []
+        parts = items if items and not isinstance(items[0], Point) else [items]
+        for part in parts:
+            ring = []
+            for point in list(part) + [None]:
+                if point is None:
+                    if len(ring) >= 3:
+                        rings.append(_ring_coordinates(ring))
+                    ring = []
+                else:
+                    ring.append(point)
+        x = np.concatenate([ring[:, 0] for ring in rings]) if rings else np.empty(0)
+        y = np.concatenate([ring[:, 1] for ring in rings]) if rings else np.empty(0)
+        offsets = np.concatenate([[0], np.cumsum([len(ring) for ring in rings], dtype=np.intp)])
+        self._polygons = PolygonSet(x, y, offsets, [0, len(rings)])
+        self.spatialReference = _as_spatial_reference(spatial_reference)
+
+    @classmethod
+    def _from_set(cls, polygons, spatial_reference=None):
+        geometry = cls.__new__(cls)
+        geometry._polygons = polygons
+        geometry.spatialReference = spatial_reference
+        return geometry
+
+    @property
+    def area(self):
+        return float(self._polygons.area()[0])
+
+    @property
+    def length(self):
+        x, y, offsets = self._polygons.x, self._polygons.y, self._polygons.ring_offsets
+        total = 0.0
+        for start, end in zip(offsets[:-1], offsets[1:]):
+            ring_x, ring_y = np.append(x[start:end], x[start]), np.append(y[start:end], y[start])
+            total += float(np.hypot(np.diff(ring_x), np.diff(ring_y)).sum())
+        return total
+
+    @property
+    def centroid(self):
+        cx, cy = self._polygons.centroid()[0]
+        return Point(float(cx), float(cy))
+
+    trueCentroid = centroid
+
+    @property
+    def extent(self):
+        return Extent(*self._polygons.bounds()[0].tolist(), spatial_reference=self.spatialReference)
+
+    @property
+    def firstPoint(self):
+        if self._polygons.n_vertices == 0:
+            return None
+        return Point(float(self._polygons.x[0]), float(self._polygons.y[0]))
+
+    @property
+    def partCount(self):
+        return int(self._polygons.exteriors().sum())
+
+    @property
+    def isMultipart(self):
+        return self.partCount > 1
+
+    @property
+    def pointCount(self):
+        return sum(len(x) + (x[0] != x[-1] or y[0] != y[-1]) for x, y in self._polygons.rings(0))
+
+    @property
+    def WKB(self):
+        return bytearray(next(self._polygons.to_wkb()))
+
+    def getPart(self, index=None):
+        """Parts as Arrays of closed rings, holes separated by None (arcpy's layout)."""
+        parts = []
+        for (x, y), exterior in zip(self._polygons.rings(0), self._polygons.exteriors()):
+            if exterior or not parts:
+                parts.append([])
+            elif parts[-1]:
+                parts[-1].append(None)
+            points = [Point(float(px), float(py)) for px, py in zip(x, y)]
+            if points and (x[0] != x[-1] or y[0] != y[-1]):
+                points.append(Point(float(x[0]), float(y[0])))
+            parts[-1].extend(points)
+        parts = Array([Array(part) for part in parts])
+        return parts if index is None else parts[index]
+
+    def __iter__(self):
+        return iter(self.getPart())
+
+    def projectAs(self, spatial_reference, transformation_name=None):
+        target = _as_spatial_reference(spatial_reference)
+        polygons = self._polygons
+        x, y = _project_xy(polygons.x, polygons.y, self.spatialReference, target)
+        return Polygon._from_set(PolygonSet(x, y, polygons.ring_offsets, polygons.polygon_offsets), target)
+
+    def __repr__(self):
+        return f"<Polygon object, {self._polygons.n_vertices} vertices>"
+
+
+class PointGeometry:
+    type = "point"
+
+    def __init__(self, inputs, spatial_reference=None):
+        self.firstPoint = inputs if isinstance(inputs, Point) else Point(*inputs)
+        self.spatialReference = _as_spatial_reference(spatial_reference)
+
+    @property
+    def centroid(self):
+        return self.firstPoint
+
+    trueCentroid = lastPoint = centroid
+    area = length = 0.0
+    partCount = pointCount = 1
+
+    @property
+    def extent(self):
+        p = self.firstPoint
+        return Extent(p.X, p.Y, p.X, p.Y, self.spatialReference)
+
+    @property
+    def WKB(self):
+        return bytearray(struct.pack("<BIdd", 1, 1, self.firstPoint.X, self.firstPoint.Y))
+
+    def projectAs(self, spatial_reference, transformation_name=None):
+        target = _as_spatial_reference(spatial_reference)
+        x, y = _project_xy(np.array([self.firstPoint.X]), np.array([self.firstPoint.Y]), self.spatialReference, target)
+        return PointGeometry(Point(float(x[0]), float(y[0])), target)
+
+    def __repr__(self):
+        return f"<PointGeometry object at {self.firstPoint!r}>"
+
+
+def _wkb_arrays(wkb):
+    """(x, y, ring offsets) of Polygon or MultiPolygon WKB, or a Point for point WKB."""
+    buffer = bytes(wkb)
+    order = "<" if buffer[0] == 1 else ">"
+    if struct.unpack_from(order + "I", buffer, 1)[0] % 1000 == 1:
+        return Point(*struct.unpack_from(order + "2d", buffer, 5))
+    rings = [ring for ring in wkb_rings(buffer) if len(ring[0])]
+    offsets = np.concatenate([[0], np.cumsum([len(x) for x, _ in rings], dtype=np.intp)])
+    x = np.concatenate([x for x, _ in rings]) if rings else np.empty(0)
+    y = np.concatenate([y for _, y in rings]) if rings else np.empty(0)
+    return x, y, offsets
+
+
+def FromWKB(wkb, spatial_reference=None):
+    """Point, Polygon or MultiPolygon WKB to a PointGeometry or Polygon."""
+    arrays = _wkb_arrays(wkb)
+    if isinstance(arrays, Point):
+        return PointGeometry(arrays, spatial_reference)
+    x, y, offsets = arrays
+    return Polygon._from_set(PolygonSet(x, y, offsets, [0, len(offsets) - 1]),
+                             _as_spatial_reference(spatial_reference))
+
+
+def _geometry_arrays(value, shape_type):
+    """(x, y, ring offsets) of a value written to a SHAPE@ / SHAPE@WKB / SHAPE@XY field."""
+    if value is None:
+        return None
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        value = _wkb_arrays(value)
+        if not isinstance(value, Point):
+            if shape_type != SHAPE_POLYGON:
+                raise TypeError("Cannot write a polygon into a point feature class.")
+            return value if len(value[2]) > 1 else None
+    if isinstance(value, Point):
+        value = PointGeometry(value)
+    if isinstance(value, (tuple, list)) and len(value) == 2 and np.isscalar(value[0]):
+        value = PointGeometry(Point(*value))
+    if isinstance(value, PointGeometry):
+        if shape_type != SHAPE_POINT:
+            raise TypeError("Cannot write a point into a polygon feature class.")
+        return np.array([value.firstPoint.X]), np.array([value.firstPoint.Y]), np.array([0, 1])
+    if isinstance(value, Polygon):
+        if shape_type != SHAPE_POLYGON:
+            raise TypeError("Cannot write a polygon into a point feature class.")
+        polygons = value._polygons
+        return polygons.x, polygons.y, polygons.ring_offsets
+    raise TypeError(f"Unsupported geometry value {value!r}.")
+
+
+def _geometry_from_arrays(shape, shape_type, spatial_reference):
+    if shape is None:
+        return None
+    x, y, offsets = shape
+    if shape_type == SHAPE_POINT:
+        return PointGeometry(Point(float(x[0]), float(y[0])), spatial_reference)
+    return Polygon._from_set(PolygonSet(x, y, offsets, [0, len(offsets) - 1]), spatial_reference)
+
+
+# --- Where clauses -----------------------------------------------------------------------------
+
+_TOKEN = re.compile(r"""\s*(?:(?P<number>-?\d+(?:\.\d*)?(?:[eE][-+]?\d+)?)|(?P<string>'(?:[^']|'')*')|"""
+                    r"""(?P<quoted>"[^"]+"|\[[^\]]+\])|(?P<op><>|<=|>=|!=|=|<|>|\(|\)|,)|(?P<word>[A-Za-z_]\w*))""")
+
+
+def _tokenize(clause):
+    tokens, position = [], 0
+    clause = clause.strip()
+    while position < len(clause):
+        match = _TOKEN.match(clause, position)
+        if not match or match.end() == position:
+            raise ValueError(f"Cannot parse where clause near: {clause[position:]!r}")
+        position = match.end()
+        kind = match.lastgroup
+        text = match.group(kind)
+        if kind == "number":
+            tokens.append(("value", float(text) if any(c in text for c in ".eE") else int(text)))
+        elif kind == "string":
+            tokens.append(("value", text[1:-1].replace("''", "'")))
+        elif kind == "quoted":
+            tokens.append(("field", text[1:-1]))
+        elif kind == "word" and text.upper() in ("AND", "OR", "NOT", "IN", "IS", "NULL"):
+            tokens.append(("keyword", text.upper()))
+        elif kind == "word":
+            tokens.append(("field", text))
+        else:
+            tokens.append(("op", text))
+    return tokens
+
+
+def compile_where(clause, field_names):
+    """
+    Compile a simple SQL where clause into a predicate over attribute dicts.
+
+    Supports comparisons (=, <>, !=, <, <=, >, >=) between a field and a
+    literal, IN lists, IS [NOT] NULL, AND, OR, NOT and parentheses. Field
+    names are matched case-insensitively; quoting with "" or [] is accepted.
+    """
+    if not clause or not clause.strip():
+        return lambda attributes: True
+    lookup = {name.lower(): name for name in field_names}
+    tokens = _tokenize(clause)
+    position = 0
+
+    def peek():
+        return tokens[position] if position < len(tokens) else (None, None)
+
+    def take(kind=None, value=None):
+        nonlocal position
+        token = peek()
+        if (kind and token[0] != kind) or (value and token[1] != value):
+            raise ValueError(f"Unexpected {token[1]!r} in where clause {clause!r}.")
+        position += 1
+        return token
+
+    def disjunction():
+        terms = [conjunction()]
+        while peek() == ("keyword", "OR"):
+            take()
+            terms.append(conjunction())
+        return terms[0] if len(terms) == 1 else (lambda a: any(t(a) for t in terms))
+
+    def conjunction():
+        terms = [negation()]
+        while peek() == ("keyword", "AND"):
+            take()
+            terms.append(negation())
+        return terms[0] if len(terms) == 1 else (lambda a: all(t(a) for t in terms))
+
+    def negation():
+        if peek() == ("keyword", "NOT"):
+            take()
+            term = negation()
+            return lambda a: not term(a)
+        if peek() == ("op", "("):
+            take()
+            term = disjunction()
+            take("op", ")")
+            return term
+        return comparison()
+
+    def comparison():
+        name = take("field")[1]
+        if name.lower() not in lookup:
+            raise ValueError(f"Unknown field {name!r} in where clause.")
+        field = lookup[name.lower()]
+        kind, value = take()
+        if value == "IS":
+            negate = peek() == ("keyword", "NOT")
+            if negate:
+                take()
+            take("keyword", "NULL")
+            return (lambda a: a[field] is not None) if negate else (lambda a: a[field] is None)
+        negate = value == "NOT"
+        if negate:
+            kind, value = take("keyword", "IN")
+        if value == "IN":
+            take("op", "(")
+            values = [take("value")[1]]
+            while peek() == ("op", ","):
+                take()
+                values.append(take("value")[1])
+            take("op", ")")
+            members = set(values)
+            return (lambda a: a[field] is not None and a[field] not in members) if negate else \
+                (lambda a: a[field] in members)
+        if kind != "op" or value in ("(", ")", ","):
+            raise ValueError(f"Unexpected {value!r} in where clause {clause!r}.")
+        literal = take("value")[1]
+        compare = {"=": lambda v: v == literal, "<>": lambda v: v != literal, "!=": lambda v: v != literal,
+                   "<": lambda v: v < literal, "<=": lambda v: v <= literal,
+                   ">": lambda v: v > literal, ">=": lambda v: v >= literal}[value]
+        return lambda a: a[field] is not None and compare(a[field])
+
+    predicate = disjunction()
+    if position != len(tokens):
+        raise ValueError(f"Unexpected {tokens[position][1]!r} in where clause {clause!r}.")
+    return predicate
+
+
+# --- Data access -------------------------------------------------------------------------------
+
+def _resolve(path):
+    path = os.fspath(path)
+    if not os.path.isabs(path) and env.workspace:
+        path = os.path.join(env.workspace, path)
+    return path
+
+
+def _shapefile_path(path):
+    path = _resolve(path)
+    if re.search(r"\.(gdb|sde|gpkg)([\\/]|$)", path, re.IGNORECASE):
+        raise ValueError(f"'{path}' is in a geodatabase; the local backend only handles shapefiles.")
+    return path if path.lower().endswith(".shp") else path + ".shp"
+
+
+def _open(path):
+    path = _shapefile_path(path)
+    if not os.path.exists(path):
+        raise RuntimeError(f"cannot open '{path}'")
+    return ShapefileReader(path)
+
+
+class Field:
+    """What ListFields returns: name, type, length, precision and scale of a field."""
+
+    def __init__(self, name, type, length=0, precision=0, scale=0):
+        self.name = self.baseName = self.aliasName = name
+        self.type, self.length, self.precision, self.scale = type, length, precision, scale
+        self.editable = type not in ("OID", "Geometry")
+        self.isNullable = self.editable
+        self.required = not self.editable
+
+    def __repr__(self):
+        return f"<Field {self.name} ({self.type})>"
+
+
+def _dbase_field_type(ftype, length, decimals):
+    if ftype in ("N", "F"):
+        if decimals:
+            return "Double"
+        return "SmallInteger" if length <= 4 else "Integer" if length <= 9 else "Double"
+    return {"C": "String", "D": "Date", "L": "String"}.get(ftype, "String")
+
+
+def ListFields(dataset, wild_card=None, field_type=None):
+    with _open(dataset) as reader:
+        fields = [Field("FID", "OID", 4), Field("Shape", "Geometry", 0)]
+        fields += [Field(name, _dbase_field_type(ftype, length, decimals), length, length, decimals)
+                   for name, ftype, length, decimals in reader.fields]
+    if wild_card:
+        pattern = re.compile(_wildcard_pattern(wild_card), re.IGNORECASE)
+        fields = [f for f in fields if pattern.match(f.name)]
+    if field_type and field_type.lower() != "all":
+        fields = [f for f in fields if f.type.lower() == field_type.lower()]
+    return fields
+
+
+def _wildcard_pattern(wild_card):
+    return "^" + ".*".join(re.escape(part) for part in wild_card.split("*")) + "$"
+
+
+def ValidateFieldName(name, workspace=None):
+    """Replace invalid characters and truncate to the 10 characters dBase allows."""
+    name = re.sub(r"\W", "_", str(name))
+    if not name or not name[0].isalpha():
+        name = "F" + name
+    return name[:10]
+
+
+def AddFieldDelimiters(datasource, field):
+    return f'"{field}"'
+
+
+class _Description:
+    def __repr__(self):
+        return f"<Describe {self.dataType} {self.catalogPath}>"
+
+
+def Describe(value, datatype=None):
+    """Describe a shapefile (shapeType, spatialReference, extent, fields, ...) or a folder."""
+    path = _resolve(value)
+    description = _Description()
+    description.catalogPath = path
+    description.name = description.baseName = os.path.basename(path)
+    description.path = os.path.dirname(path)
+    if os.path.isdir(path):
+        description.dataType, description.workspaceType = "Folder", "FileSystem"
+        return description
+
+    with _open(path) as reader:
+        description.catalogPath = reader.path
+        description.name = os.path.basename(reader.path)
+        description.baseName = os.path.splitext(description.name)[0]
+        description.dataType = "ShapeFile"
+        description.shapeType = {SHAPE_POINT: "Point", SHAPE_POLYGON: "Polygon", 3: "Polyline",
+                                 8: "Multipoint"}.get(reader.shape_type, "Null")
+        description.featureType = "Simple"
+        description.hasOID, description.OIDFieldName, description.shapeFieldName = True, "FID", "Shape"
+        description.spatialReference = SpatialReference(reader.wkt) if reader.wkt else SpatialReference()
+        description.extent = Extent(*reader.bbox, spatial_reference=description.spatialReference) \
+            if len(reader) else Extent(*(float("nan"),) * 4)
+    description.fields = ListFields(path)
+    return description
+
+
+def _projected(records, source, target, chunk_size=4096):
+    """
+    Project the shapes of (fid, shape, attributes) records, a chunk at a time.
+
+    The vertices of a whole chunk go through one vectorized projection call
+    instead of one call per shape.
+    """
+    if source is None or target is None or not source.factoryCode or not target.factoryCode \
+            or source.factoryCode == target.factoryCode:
+        yield from records
+        return
+    records = iter(records)
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            return
+        shapes = [shape for _, shape, _ in chunk if shape is not None]
+        if shapes:
+            x, y = project(np.concatenate([shape[0] for shape in shapes]),
+                           np.concatenate([shape[1] for shape in shapes]), source.factoryCode, target.factoryCode)
+            bounds = np.cumsum([0] + [len(shape[0]) for shape in shapes])
+            projected = iter([(x[a:b], y[a:b], shape[2]) for a, b, shape in zip(bounds[:-1], bounds[1:], shapes)])
+            chunk = [(fid, None if shape is None else next(projected), attributes) for fid, shape, attributes in chunk]
+        yield from chunk
+
+
+def _token_reader(token, reader, shape_type, spatial_reference):
+    """Function of (fid, shape, attributes) returning the value of one cursor field."""
+    upper = token.upper()
+    if upper in ("OID@", "FID"):
+        return lambda fid, shape, attributes: fid
+    if upper in ("SHAPE@", "SHAPE"):
+        return lambda fid, shape, attributes: _geometry_from_arrays(shape, shape_type, spatial_reference)
+    if upper.startswith("SHAPE@"):
+        geometry_reader = _token_reader("SHAPE@", reader, shape_type, spatial_reference)
+
+        def derived(fid, shape, attributes):
+            value = geometry_reader(fid, shape, attributes)
+            if value is None:
+                return None
+            if upper == "SHAPE@WKB":
+                return value.WKB
+            if upper == "SHAPE@AREA":
+                return value.area
+            if upper == "SHAPE@LENGTH":
+                return value.length
+            return value.centroid.X, value.centroid.Y
+
+        if upper not in ("SHAPE@WKB", "SHAPE@XY", "SHAPE@TRUECENTROID", "SHAPE@AREA", "SHAPE@LENGTH"):
+            raise RuntimeError(f"Token {token} is not supported by the local backend.")
+        return derived
+    lookup = {name.lower(): name for name in reader.field_names}
+    if token.lower() not in lookup:
+        raise RuntimeError(f"A column was specified that does not exist: {token}")
+    name = lookup[token.lower()]
+    return lambda fid, shape, attributes: attributes[name]
+
+
+class SearchCursor:
+    """
+    Read rows from a shapefile, like arcpy.da.SearchCursor.
+
+    Tokens: OID@, SHAPE@, SHAPE@WKB, SHAPE@XY, SHAPE@TRUECENTROID,
+    SHAPE@AREA, SHAPE@LENGTH and attribute fields ("*" for all of them).
+    """
+
+    def __init__(self, in_table, field_names, where_clause=None, spatial_reference=None, **kwargs):
+        self._reader = _open(in_table)
+        if isinstance(field_names, str):
+            field_names = [field_names] if field_names != "*" else ["OID@", "SHAPE@"] + self._reader.field_names
+        self.fields = tuple(field_names)
+        self._source_sr = SpatialReference(self._reader.wkt) if self._reader.wkt else None
+        self._target_sr = _as_spatial_reference(spatial_reference)
+        shape_type = self._reader.shape_type
+        output_sr = self._target_sr or self._source_sr
+        self._getters = [_token_reader(token, self._reader, shape_type, output_sr) for token in self.fields]
+        self._predicate = compile_where(where_clause, self._reader.field_names)
+        self._rows = None
+
+    def _generate(self):
+        records = ((fid, shape, attributes) for fid, (shape, attributes) in enumerate(self._reader)
+                   if self._predicate(attributes))
+        for fid, shape, attributes in _projected(records, self._source_sr, self._target_sr):
+            yield tuple(getter(fid, shape, attributes) for getter in self._getters)
+
+    def __iter__(self):
+        self._rows = self._generate()
+        return self._rows
+
+    def next(self):
+        if self._rows is None:
+            self._rows = self._generate()
+        return next(self._rows)
+
+    __next__ = next
+
+    def reset(self):
+        self._rows = None
+
+    def close(self):
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __del__(self):
+        self.close()
+
+
+def _write_shape(writer, shape, attributes):
+    if writer.shape_type == SHAPE_POINT:
+        if shape is None:
+            raise ValueError("Point shapefiles cannot hold null shapes.")
+        writer.add_point(shape[0][0], shape[1][0], attributes)
+        return
+    if shape is None:
+        writer.add_polygon([], attributes)
+        return
+    x, y, offsets = shape
+    if len(offsets) == 2:
+        writer.add_polygon([np.column_stack([x, y])], attributes)
+        return
+    rings = [np.column_stack([x[a:b], y[a:b]]) for a, b in zip(offsets[:-1], offsets[1:])]
+    exteriors = PolygonSet(x, y, offsets, [0, len(offsets) - 1]).exteriors()
+    writer.add_polygon(rings, attributes, exteriors)
+
+
+class _Rewrite:
+    """
+    Stream a shapefile into a temporary copy with extra fields that replaces
+    the original when closed: dBase records are fixed-width, so a schema
+    change rewrites every record. Inserts append in place instead.
+    """
+
+    def __init__(self, path, add_fields=()):
+        self.path = _shapefile_path(path)
+        with _open(self.path) as reader:
+            fields = list(reader.fields) + list(add_fields)
+            shape_type, wkt = reader.shape_type, reader.wkt
+        self._base = os.path.splitext(self.path)[0]
+        self._temporary = self._base + "_rewrite_tmp"
+        self.writer = ShapefileWriter(self._temporary + ".shp", fields, shape_type, wkt=wkt)
+        self.shape_type = shape_type
+        self.field_names = [name for name, _, _, _ in fields]
+        with _open(self.path) as reader:
+            for shape, attributes in reader:
+                _write_shape(self.writer, shape, attributes)
+
+    def close(self):
+        self.writer.close()
+        for ext in SHAPEFILE_PARTS:
+            if os.path.exists(self._temporary + ext):
+                os.replace(self._temporary + ext, self._base + ext)
+
+
+class InsertCursor:
+    """
+    Append rows to a shapefile, like arcpy.da.InsertCursor.
+
+    Geometry fields (SHAPE@, SHAPE@WKB, SHAPE@XY) accept Polygon,
+    PointGeometry, Point, WKB bytes or (x, y) tuples. Rows are appended to
+    the end of the existing files (opening a cursor does not copy the
+    shapefile); the headers are updated when the cursor is closed or deleted.
+    """
+
+    def __init__(self, in_table, field_names, **kwargs):
+        if isinstance(field_names, str):
+            field_names = [field_names]
+        self.fields = tuple(field_names)
+        path = _shapefile_path(in_table)
+        if not os.path.exists(path):
+            raise RuntimeError(f"cannot open '{path}'")
+        self._writer = ShapefileWriter.append(path)
+        lookup = {name.lower(): name for name, _, _, _ in self._writer.fields}
+        self._targets = []
+        for token in self.fields:
+            if token.upper().startswith("SHAPE"):
+                self._targets.append(None)
+            elif token.lower() in lookup:
+                self._targets.append(lookup[token.lower()])
+            else:
+                self.close()
+                raise RuntimeError(f"A column was specified that does not exist: {token}")
+
+    def insertRow(self, row):
+        if self._writer is None:
+            raise RuntimeError("The cursor is closed.")
+        shape, attributes = None, {}
+        for target, value in zip(self._targets, row):
+            if target is None:
+                shape = _geometry_arrays(value, self._writer.shape_type)
+            else:
+                attributes[target] = value
+        _write_shape(self._writer, shape, attributes)
+        return self._writer.records_written - 1
+
+    def close(self):
+        if getattr(self, "_writer", None) is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __del__(self):
+        self.close()
+
+
+da = types.SimpleNamespace(SearchCursor=SearchCursor, InsertCursor=InsertCursor)
+
+
+# --- Tools -------------------------------------------------------------------------------------
+
+class Result:
+    """Outputs of a tool: result[0] or getOutput(0), and str(result) for the first one."""
+
+    def __init__(self, *outputs):
+        self._outputs = outputs
+
+    def getOutput(self, index):
+        return self._outputs[index]
+
+    def __getitem__(self, index):
+        return self._outputs[index]
+
+    def __str__(self):
+        return str(self._outputs[0])
+
+
+def Exists(dataset):
+    path = _resolve(dataset)
+    return os.path.exists(path) or (not path.lower().endswith(".shp") and os.path.exists(path + ".shp"))
+
+
+def _check_output(path):
+    if Exists(path):
+        if not env.overwriteOutput:
+            _fail(f"ERROR 000725: Output: Dataset {path} already exists.")
+        Delete(path)
+
+
+def Delete(in_data, data_type=None):
+    path = _resolve(in_data)
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    else:
+        base = os.path.splitext(path)[0] if path.lower().endswith(".shp") else path
+        removed = False
+        for ext in SHAPEFILE_PARTS + (".sbn", ".sbx", ".shp.xml"):
+            if os.path.exists(base + ext):
+                os.remove(base + ext)
+                removed = True
+        if not removed:
+            _fail(f"ERROR 000732: Input Data Element: Dataset {in_data} does not exist or is not supported")
+    return Result(path)
+
+
+def CreateFeatureclass(out_path, out_name, geometry_type="POLYGON", template=None, has_m="DISABLED",
+                       has_z="DISABLED", spatial_reference=None, *args, **kwargs):
+    """Create an empty polygon or point shapefile (with arcpy's default "Id" field unless a template is given)."""
+    shape_type = {"POLYGON": SHAPE_POLYGON, "POINT": SHAPE_POINT}.get(str(geometry_type).upper())
+    if shape_type is None:
+        _fail(f"Geometry type {geometry_type} is not supported by the local backend (POLYGON or POINT).")
+    out_name = out_name if out_name.lower().endswith(".shp") else out_name + ".shp"
+    path = _shapefile_path(os.path.join(_resolve(out_path), out_name))
+    _check_output(path)
+
+    fields = [("Id", "N", 6, 0)]
+    if template:
+        with _open(template) as reader:
+            fields = list(reader.fields)
+    spatial_reference = _as_spatial_reference(spatial_reference)
+    wkt = spatial_reference.exportToString() if spatial_reference is not None else None
+    ShapefileWriter(path, fields, shape_type, wkt=wkt or None).close()
+    return Result(path)
+
+
+_FIELD_TYPES = {"TEXT": "C", "SHORT": "N", "LONG": "N", "FLOAT": "N", "DOUBLE": "N", "DATE": "D"}
+
+
+def _field_spec(name, field_type, length=None, precision=None, scale=None):
+    field_type = str(field_type).upper()
+    if field_type not in _FIELD_TYPES:
+        _fail(f"Field type {field_type} is not supported by the local backend.")
+    default_length, default_scale = {"TEXT": (254, 0), "SHORT": (5, 0), "LONG": (10, 0), "FLOAT": (13, 11),
+                                     "DOUBLE": (19, 11), "DATE": (8, 0)}[field_type]
+    length = precision if field_type != "TEXT" and precision else length
+    return ValidateFieldName(name), _FIELD_TYPES[field_type], int(min(length or default_length, 254)), \
+        int(default_scale if scale is None else scale)
+
+
+def AddFields(in_table, field_description):
+    """Add fields given as [name, type, alias, length] rows (alias is ignored)."""
+    specs = []
+    for row in field_description:
+        name, field_type = row[0], row[1]
+        length = row[3] if len(row) > 3 and row[3] not in ("", "#") else None
+        specs.append(_field_spec(name, field_type, length))
+    _Rewrite(in_table, specs).close()
+    return Result(_shapefile_path(in_table))
+
+
+def AddField(in_table, field_name, field_type, field_precision=None, field_scale=None, field_length=None,
+             *args, **kwargs):
+    _Rewrite(in_table, [_field_spec(field_name, field_type, field_length, field_precision, field_scale)]).close()
+    return Result(_shapefile_path(in_table))
+
+
+def GetCount(in_rows):
+    with _open(in_rows) as reader:
+        count = len(reader) if reader.record_count is not None else sum(1 for _ in reader)
+    return Result(str(count))
+
+
+def CopyFeatures(in_features, out_feature_class, *args, **kwargs):
+    source = os.path.splitext(_shapefile_path(in_features))[0]
+    target_path = _shapefile_path(out_feature_class)
+    if not os.path.exists(source + ".shp"):
+        _fail(f"ERROR 000732: Input Features: Dataset {in_features} does not exist or is not supported")
+    _check_output(target_path)
+    target = os.path.splitext(target_path)[0]
+    os.makedirs(os.path.dirname(os.path.abspath(target)), exist_ok=True)
+    for ext in SHAPEFILE_PARTS:
+        if os.path.exists(source + ext):
+            shutil.copyfile(source + ext, target + ext)
+    return Result(target_path)
+
+
+def Project(in_dataset, out_dataset, out_coor_system, transform_method=None, in_coor_system=None, *args, **kwargs):
+    """Reproject a shapefile between WGS 84 and WGS 84 / UTM zones."""
+    target_sr = _as_spatial_reference(out_coor_system)
+    out_path = _shapefile_path(out_dataset)
+    with _open(in_dataset) as reader:
+        source_sr = _as_spatial_reference(in_coor_system) or (SpatialReference(reader.wkt) if reader.wkt else None)
+        if source_sr is None:
+            _fail(f"ERROR 000581: Invalid parameters: {in_dataset} has an unknown coordinate system.")
+        _check_output(out_path)
+        with ShapefileWriter(out_path, reader.fields, reader.shape_type, wkt=target_sr.exportToString()) as writer:
+            records = ((fid, shape, attributes) for fid, (shape, attributes) in enumerate(reader))
+            for _, shape, attributes in _projected(records, source_sr, target_sr):
+                _write_shape(writer, shape, attributes)
+    return Result(out_path)
+
+
+management = types.SimpleNamespace(
+    AddField=AddField, AddFields=AddFields, CopyFeatures=CopyFeatures, CreateFeatureclass=CreateFeatureclass,
+    Delete=Delete, GetCount=GetCount, Project=Project,
+)
+
+# Old-style tool names
+AddField_management = AddField
+CopyFeatures_management = CopyFeatures
+CreateFeatureclass_management = CreateFeatureclass
+Delete_management = Delete
+GetCount_management = GetCount
+Project_management = Project
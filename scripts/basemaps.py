@@ -1,4 +1,5 @@
-import arcpy
+from arcpy_backend import arcpy
+from tile_cache import TileCache, local_tile_url, serve_tiles
 
 # Dictionary of map sources and their URLs
 map_sources = {
@@ -37,32 +38,44 @@ map_sources = {
     "Strava Run": "https://heatmap-external-b.strava.com/tiles/run/bluered/{z}/{x}/{y}.png?v=19"
 }
 
-try:
-    # Get the current ArcGIS Pro project and active map
-    aprx = arcpy.mp.ArcGISProject("CURRENT")
-    active_map = aprx.activeMap
+if __name__ == "__main__":
+    # Set to a .sqlite path to render the basemaps from a local tile cache
+    # (filled on first use, then served from disk and offline); None connects
+    # to the remote tile servers directly.
+    tile_cache_path = None
 
-    if active_map is None:
-        print("No active map found in the ArcGIS Pro project.")
-    else:
-        for name, url in map_sources.items():
-            try:
-                # Create a Layer object for the tiled service URL
-                basemap_layer = arcpy.mapping.Layer() # Initialize an empty Layer object
-                basemap_layer.name = name # Set the name of the layer
-                basemap_layer.connectToTiledService(url) # Connect to the tiled service using the URL
-                basemap_layer.serviceConnectionType = "Tiled" # Specify the connection type as Tiled
+    if tile_cache_path:
+        tile_cache = TileCache(tile_cache_path, map_sources)
+        tile_server = serve_tiles(tile_cache)
 
-                # Add the basemap layer to the map's basemap layer collection
-                active_map.addLayer(basemap_layer, "BOTTOM") # Add to the bottom of the map layers
+    try:
+        # Get the current ArcGIS Pro project and active map
+        aprx = arcpy.mp.ArcGISProject("CURRENT")
+        active_map = aprx.activeMap
 
-                print(f"Successfully added basemap: {name}")
+        if active_map is None:
+            print("No active map found in the ArcGIS Pro project.")
+        else:
+            for name, url in map_sources.items():
+                try:
+                    # Create a Layer object for the tiled service URL
+                    basemap_layer = arcpy.mapping.Layer() # Initialize an empty Layer object
+                    basemap_layer.name = name # Set the name of the layer
+                    if tile_cache_path:
+                        url = local_tile_url(name) # Render through the local tile cache
+                    basemap_layer.connectToTiledService(url) # Connect to the tiled service using the URL
+                    basemap_layer.serviceConnectionType = "Tiled" # Specify the connection type as Tiled
 
-            except Exception as e:
-                print(f"Error adding basemap '{name}': {e}")
+                    # Add the basemap layer to the map's basemap layer collection
+                    active_map.addLayer(basemap_layer, "BOTTOM") # Add to the bottom of the map layers
 
-    # Save the ArcGIS Pro project (optional)
-    # aprx.save() # Uncomment if you want to save the project after adding basemaps
+                    print(f"Successfully added basemap: {name}")
 
-except Exception as overall_error:
-    print(f"An overall error occurred: {overall_error}")
+                except Exception as e:
+                    print(f"Error adding basemap '{name}': {e}")
+
+        # Save the ArcGIS Pro project (optional)
+        # aprx.save() # Uncomment if you want to save the project after adding basemaps
+
+    except Exception as overall_error:
+        print(f"An overall error occurred: {overall_error}")
@@ -0,0 +1,785 @@
+import os
+import struct
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+
+class STRtree:
+    """
+    Packed Sort-Tile-Recursive R-tree over axis-aligned envelopes.
+
+    The tree is bulk-loaded once and is read-only afterwards. Every level is
+    stored as flat NumPy arrays (node envelopes plus the [start, end) range of
+    their children in the level below), so a query is a handful of vectorized
+    envelope tests per level rather than a Python loop over every item.
+
+    Parameters
+    ----------
+    bounds : array_like, shape (n, 4)
+        Envelopes as (xmin, ymin, xmax, ymax) rows.
+    node_capacity : int, optional
+        Maximum number of children per node (default 32). Wide nodes suit
+        NumPy: each level costs one vectorized test, so fewer levels win.
+    """
+
+    def __init__(self, bounds, node_capacity=32):
+        if node_capacity < 2:
+            raise ValueError("node_capacity must be at least 2.")
+
+        bounds = np.asarray(bounds, dtype=np.float64).reshape(-1, 4)
+        self.node_capacity = node_capacity
+
+        order = self._str_order(bounds)
+        self._item_ids = order
+        self._bounds = [bounds[order]]
+        self._children = [None]
+
+        while len(self._bounds[-1]) > node_capacity:
+            self._add_level()
+
+    def __len__(self):
+        return len(self._item_ids)
+
+    def _str_order(self, bounds):
+        """Sort-Tile-Recursive ordering: vertical slices by x, then y within a slice."""
+        if len(bounds) == 0:
+            return np.empty(0, dtype=np.intp)
+
+        center_x = (bounds[:, 0] + bounds[:, 2]) / 2
+        center_y = (bounds[:, 1] + bounds[:, 3]) / 2
+
+        n_nodes = -(-len(bounds) // self.node_capacity)
+        n_slices = int(np.ceil(np.sqrt(n_nodes)))
+        slice_size = n_slices * self.node_capacity
+
+        by_x = np.argsort(center_x, kind="stable")
+        slice_ids = np.empty(len(bounds), dtype=np.intp)
+        slice_ids[by_x] = np.arange(len(bounds)) // slice_size
+
+        return np.lexsort((center_y, slice_ids))
+
+    def _add_level(self):
+        # Re-tile the current top level before packing it into parent nodes. Its
+        # children ranges travel with each node, so the level below is unaffected.
+        order = self._str_order(self._bounds[-1])
+        self._bounds[-1] = self._bounds[-1][order]
+        if self._children[-1] is None:
+            self._item_ids = self._item_ids[order]
+        else:
+            self._children[-1] = self._children[-1][order]
+
+        level = self._bounds[-1]
+        starts = np.arange(0, len(level), self.node_capacity)
+        ends = np.minimum(starts + self.node_capacity, len(level))
+
+        parent_bounds = np.column_stack([
+            np.minimum.reduceat(level[:, 0], starts),
+            np.minimum.reduceat(level[:, 1], starts),
+            np.maximum.reduceat(level[:, 2], starts),
+            np.maximum.reduceat(level[:, 3], starts),
+        ])
+        self._bounds.append(parent_bounds)
+        self._children.append(np.column_stack([starts, ends]))
+
+    def query(self, xmin, ymin, xmax, ymax):
+        """
+        Return the ids of all items whose envelope intersects the query box.
+
+        Parameters
+        ----------
+        xmin, ymin, xmax, ymax : float
+            The query envelope.
+
+        Returns
+        -------
+        numpy.ndarray
+            Sorted item ids (positions in the bounds array given at construction).
+        """
+        if len(self._item_ids) == 0:
+            return np.empty(0, dtype=np.intp)
+
+        frontier = np.arange(len(self._bounds[-1]))
+        for level in range(len(self._bounds) - 1, -1, -1):
+            env = self._bounds[level][frontier]
+            hit = (env[:, 0] <= xmax) & (env[:, 2] >= xmin) & (env[:, 1] <= ymax) & (env[:, 3] >= ymin)
+            frontier = frontier[hit]
+            if level == 0 or len(frontier) == 0:
+                break
+            frontier = _expand_ranges(self._children[level][frontier], self.node_capacity)
+
+        return np.sort(self._item_ids[frontier])
+
+    def query_bulk(self, boxes):
+        """
+        Run many envelope queries in one vectorized traversal.
+
+        The frontier holds (query, node) pairs for all queries at once, so each
+        tree level costs one envelope test over the whole batch instead of one
+        Python-level query per box.
+
+        Parameters
+        ----------
+        boxes : array_like, shape (m, 4)
+            Query envelopes as (xmin, ymin, xmax, ymax) rows. Rows with NaN
+            match nothing.
+
+        Returns
+        -------
+        tuple(numpy.ndarray, numpy.ndarray)
+            Matching (query position, item id) pairs, sorted by query then item.
+        """
+        boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+        if len(self._item_ids) == 0 or len(boxes) == 0:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+
+        n_top = len(self._bounds[-1])
+        queries = np.repeat(np.arange(len(boxes)), n_top)
+        nodes = np.tile(np.arange(n_top), len(boxes))
+        for level in range(len(self._bounds) - 1, -1, -1):
+            env = self._bounds[level][nodes]
+            box = boxes[queries]
+            hit = (env[:, 0] <= box[:, 2]) & (env[:, 2] >= box[:, 0]) & (env[:, 1] <= box[:, 3]) & (env[:, 3] >= box[:, 1])
+            queries, nodes = queries[hit], nodes[hit]
+            if level == 0 or len(nodes) == 0:
+                break
+            ranges = self._children[level][nodes]
+            counts = ranges[:, 1] - ranges[:, 0]
+            queries = np.repeat(queries, counts)
+            nodes = np.repeat(ranges[:, 0] - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+
+        items = self._item_ids[nodes]
+        order = np.lexsort((items, queries))
+        return queries[order], items[order]
+
+
+def _expand_ranges(ranges, width):
+    """Concatenate np.arange(start, end) for every [start, end) row (each at most `width` long)."""
+    expanded = ranges[:, :1] + np.arange(width)
+    return expanded[expanded < ranges[:, 1:]]
+
+
+def clip_ring_to_rect(x, y, xmin, ymin, xmax, ymax):
+    """
+    Clip one polygon ring against an axis-aligned rectangle (Sutherland–Hodgman).
+
+    Each of the four clip edges is applied to all ring edges at once with
+    NumPy, so the cost is four vectorized passes regardless of vertex count.
+
+    Parameters
+    ----------
+    x, y : array_like
+        Ring vertex coordinates. The ring may be open or explicitly closed.
+    xmin, ymin, xmax, ymax : float
+        The clipping rectangle.
+
+    Returns
+    -------
+    tuple(numpy.ndarray, numpy.ndarray)
+        The clipped ring's vertices (open, original orientation). Empty arrays
+        if the ring lies entirely outside the rectangle.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    for axis, value, keep_above in ((0, xmin, True), (0, xmax, False), (1, ymin, True), (1, ymax, False)):
+        if len(x) == 0:
+            break
+        coord, other = (x, y) if axis == 0 else (y, x)
+        inside = coord >= value if keep_above else coord <= value
+
+        # Edge i runs from vertex i (p) to vertex i + 1 (q), wrapping around.
+        q_coord, q_other, q_in = np.roll(coord, -1), np.roll(other, -1), np.roll(inside, -1)
+        crossing = inside != q_in
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = np.where(crossing, (value - coord) / (q_coord - coord), 0.0)
+        cross_other = other + t * (q_other - other)
+
+        # Up to two output vertices per edge: the crossing point (or q when the
+        # whole edge is inside), then q again when the edge re-enters.
+        first_coord = np.where(crossing, value, q_coord)
+        first_other = np.where(crossing, cross_other, q_other)
+        keep = np.column_stack([q_in | crossing, crossing & q_in])
+
+        out_coord = np.column_stack([first_coord, q_coord])[keep]
+        out_other = np.column_stack([first_other, q_other])[keep]
+        x, y = (out_coord, out_other) if axis == 0 else (out_other, out_coord)
+
+    return x, y
+
+
+def ring_signed_area(x, y):
+    """Shoelace signed area of a ring (negative for clockwise rings, as used by Esri exteriors)."""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    if len(x) < 3:
+        return 0.0
+    # Shift to a local origin first; UTM-sized coordinates lose precision otherwise.
+    x = x - x[0]
+    y = y - y[0]
+    return 0.5 * float(np.dot(x, np.roll(y, -1)) - np.dot(np.roll(x, -1), y))
+
+
+def _next_vertex(offsets, n):
+    """Index of each vertex's successor, wrapping around within its ring."""
+    offsets = np.asarray(offsets, dtype=np.intp)
+    nxt = np.arange(1, n + 1)
+    filled = offsets[1:] > offsets[:-1]
+    nxt[offsets[1:][filled] - 1] = offsets[:-1][filled]
+    return nxt
+
+
+def clip_rings_to_rects(x, y, offsets, xmin, ymin, xmax, ymax):
+    """
+    Clip many rings, each against its own rectangle, in one vectorized Sutherland–Hodgman pass.
+
+    This is clip_ring_to_rect applied to a whole batch: the four clip edges
+    are applied to every edge of every ring at once, so the cost does not
+    depend on the number of rings.
+
+    Parameters
+    ----------
+    x, y : array_like
+        Flat vertex coordinates of all rings (open or explicitly closed).
+    offsets : array_like
+        Ring start positions (len(rings) + 1 entries).
+    xmin, ymin, xmax, ymax : array_like
+        One clipping rectangle per ring.
+
+    Returns
+    -------
+    tuple(numpy.ndarray, numpy.ndarray, numpy.ndarray)
+        Clipped vertices (open rings, original orientation) and their offsets.
+        Rings entirely outside their rectangle come back empty.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    offsets = np.asarray(offsets, dtype=np.intp)
+    n_rings = len(offsets) - 1
+
+    for axis, bounds, keep_above in ((0, xmin, True), (0, xmax, False), (1, ymin, True), (1, ymax, False)):
+        if len(x) == 0:
+            break
+        ring_ids = np.repeat(np.arange(n_rings), np.diff(offsets))
+        coord, other = (x, y) if axis == 0 else (y, x)
+        value = np.asarray(bounds, dtype=np.float64)[ring_ids]
+        inside = coord >= value if keep_above else coord <= value
+
+        # Edge i runs from vertex i (p) to its successor q in the same ring.
+        nxt = _next_vertex(offsets, len(x))
+        q_coord, q_other, q_in = coord[nxt], other[nxt], inside[nxt]
+        crossing = inside != q_in
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = np.where(crossing, (value - coord) / (q_coord - coord), 0.0)
+        cross_other = other + t * (q_other - other)
+
+        first_coord = np.where(crossing, value, q_coord)
+        first_other = np.where(crossing, cross_other, q_other)
+        keep = np.column_stack([q_in | crossing, crossing & q_in])
+
+        out_coord = np.column_stack([first_coord, q_coord])[keep]
+        out_other = np.column_stack([first_other, q_other])[keep]
+        x, y = (out_coord, out_other) if axis == 0 else (out_other, out_coord)
+        counts = np.bincount(ring_ids, weights=keep.sum(axis=1), minlength=n_rings).astype(np.intp)
+        offsets = np.concatenate([[0], np.cumsum(counts)])
+
+    return x, y, offsets
+
+
+def ring_signed_areas(x, y, offsets):
+    """Shoelace signed areas of many rings at once (see ring_signed_area)."""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    offsets = np.asarray(offsets, dtype=np.intp)
+    n_rings = len(offsets) - 1
+    if len(x) == 0:
+        return np.zeros(n_rings)
+    counts = np.diff(offsets)
+    ring_ids = np.repeat(np.arange(n_rings), counts)
+    # Local origin per ring (its first vertex) keeps UTM-sized products precise.
+    origin = np.minimum(offsets[:-1], len(x) - 1)[ring_ids]
+    dx, dy = x - x[origin], y - y[origin]
+    nxt = _next_vertex(offsets, len(x))
+    terms = dx * dy[nxt] - dx[nxt] * dy
+    return 0.5 * np.bincount(ring_ids, weights=terms, minlength=n_rings)
+
+
+def geometry_rings(geometry):
+    """
+    Yield the rings of an arcpy Polygon as (x, y) NumPy arrays.
+
+    Parts are iterated as arcpy Arrays; interior rings inside a part are
+    separated by None points, following arcpy's geometry iteration protocol.
+    """
+    for part in geometry:
+        ring = []
+        for point in part:
+            if point is None:
+                if ring:
+                    yield _ring_arrays(ring)
+                ring = []
+            else:
+                ring.append((point.X, point.Y))
+        if ring:
+            yield _ring_arrays(ring)
+
+
+def wkb_rings(wkb):
+    """
+    Yield the rings of a WKB Polygon or MultiPolygon as (x, y) NumPy arrays.
+
+    Reading ``SHAPE@WKB`` and slicing the coordinates straight out of the
+    buffer is much faster than iterating arcpy Point objects. Z and M values
+    are dropped.
+    """
+    buffer = memoryview(wkb)
+
+    def read_geometry(position):
+        order = "<" if buffer[position] == 1 else ">"
+        geometry_type = struct.unpack_from(order + "I", buffer, position + 1)[0]
+        base, dims = geometry_type % 1000, 2 + {1: 1, 2: 1, 3: 2}.get(geometry_type // 1000, 0)
+        position += 5
+        if base == 6:  # MultiPolygon: a count, then complete Polygon geometries
+            count = struct.unpack_from(order + "I", buffer, position)[0]
+            position += 4
+            for _ in range(count):
+                position = yield from read_geometry(position)
+            return position
+        if base != 3:
+            raise ValueError(f"Unsupported WKB geometry type {geometry_type}.")
+        count = struct.unpack_from(order + "I", buffer, position)[0]
+        position += 4
+        for _ in range(count):
+            n_points = struct.unpack_from(order + "I", buffer, position)[0]
+            position += 4
+            coords = np.frombuffer(buffer, dtype=order + "f8", count=n_points * dims, offset=position)
+            coords = coords.reshape(-1, dims)
+            position += 8 * n_points * dims
+            yield coords[:, 0].astype(np.float64), coords[:, 1].astype(np.float64)
+        return position
+
+    yield from read_geometry(0)
+
+
+def _ring_arrays(ring):
+    coords = np.asarray(ring, dtype=np.float64)
+    return coords[:, 0], coords[:, 1]
+
+
+def rect_overlap_area(rings, xmin, ymin, xmax, ymax):
+    """
+    Area of the intersection between a polygon (given as rings) and a rectangle.
+
+    Exterior and interior rings carry opposite orientations, so summing the
+    signed areas of every clipped ring subtracts holes automatically.
+    Rings whose envelope falls fully inside the rectangle skip the clip and
+    rings whose envelope misses it are skipped altogether.
+    """
+    total = 0.0
+    for x, y in rings:
+        if len(x) == 0:
+            continue
+        rxmin, rxmax, rymin, rymax = x.min(), x.max(), y.min(), y.max()
+        if rxmin >= xmax or rxmax <= xmin or rymin >= ymax or rymax <= ymin:
+            continue
+        if rxmin >= xmin and rxmax <= xmax and rymin >= ymin and rymax <= ymax:
+            total += ring_signed_area(x, y)
+        else:
+            total += ring_signed_area(*clip_ring_to_rect(x, y, xmin, ymin, xmax, ymax))
+    return abs(total)
+
+
+class CartaIndex:
+    """
+    Spatial index over carta (topographic sheet) polygons.
+
+    Candidate cartas are found through an STRtree over their envelopes; only
+    envelope hits are passed to the exact predicate. Cartas built from the
+    XMin_utm/YMin_utm/XMax_utm/YMax_utm records are known to be rectangles, so
+    their exact test is a rectangle clip of the feature's rings and never calls
+    the geometry engine. Cartas supplied as arbitrary arcpy polygons fall back
+    to the original `overlaps`/`intersect` predicate.
+
+    Parameters
+    ----------
+    names : list of str
+        Carta names, in the order used to break ties (first match wins).
+    bounds : array_like, shape (n, 4)
+        Carta envelopes as (xmin, ymin, xmax, ymax).
+    geometries : list, optional
+        arcpy polygons for non-rectangular cartas. Entries that are None (or a
+        missing list) mark rectangles equal to their envelope.
+    area_tolerance : float, optional
+        Minimum shared area (in squared map units) for a rectangle match;
+        guards against floating-point slivers along shared edges.
+    """
+
+    def __init__(self, names, bounds, geometries=None, area_tolerance=1e-6, node_capacity=32):
+        self.names = list(names)
+        self.bounds = np.asarray(bounds, dtype=np.float64).reshape(-1, 4)
+        self.geometries = list(geometries) if geometries is not None else [None] * len(self.names)
+        self.area_tolerance = area_tolerance
+
+        if not (len(self.names) == len(self.bounds) == len(self.geometries)):
+            raise ValueError("names, bounds and geometries must have the same length.")
+
+        self.tree = STRtree(self.bounds, node_capacity=node_capacity)
+
+    def __len__(self):
+        return len(self.names)
+
+    @classmethod
+    def from_records(cls, cartas, **kwargs):
+        """Build the index from the cartas JSON records (name plus UTM extent keys)."""
+        bounds = [(c["XMin_utm"], c["YMin_utm"], c["XMax_utm"], c["YMax_utm"]) for c in cartas]
+        return cls([c["name"] for c in cartas], bounds, **kwargs)
+
+    @classmethod
+    def from_polygons(cls, cartas_polygons, **kwargs):
+        """Build the index from the notebook's (index, arcpy.Polygon, name) triples."""
+        names, bounds, geometries = [], [], []
+        for _, polygon, name in cartas_polygons:
+            extent = polygon.extent
+            names.append(name)
+            bounds.append((extent.XMin, extent.YMin, extent.XMax, extent.YMax))
+            geometries.append(polygon)
+        return cls(names, bounds, geometries, **kwargs)
+
+    def candidates(self, xmin, ymin, xmax, ymax):
+        """Indices of cartas whose envelope intersects the given box, in carta order."""
+        return self.tree.query(xmin, ymin, xmax, ymax)
+
+    def matches(self, geometry, first_only=False):
+        """
+        Return the indices of all cartas a feature geometry belongs to.
+
+        Parameters
+        ----------
+        geometry : arcpy.Polygon
+            The feature's polygon, in the cartas' spatial reference.
+        first_only : bool, optional
+            Stop at the first matching carta (in carta order), as the original
+            assignment loop did.
+
+        Returns
+        -------
+        list of int
+        """
+        extent = geometry.extent
+        hits = self.candidates(extent.XMin, extent.YMin, extent.XMax, extent.YMax)
+        if len(hits) == 0:
+            return []
+
+        rings = None
+        found = []
+        for i in hits.tolist():
+            carta = self.geometries[i]
+            if carta is None:
+                if rings is None:
+                    rings = list(geometry_rings(geometry))
+                matched = rect_overlap_area(rings, *self.bounds[i]) > self.area_tolerance
+            else:
+                matched = carta.overlaps(geometry) or carta.intersect(geometry, 2)
+
+            if matched:
+                found.append(i)
+                if first_only:
+                    break
+        return found
+
+    def first_match(self, geometry):
+        """Name of the first carta the geometry belongs to, or None."""
+        found = self.matches(geometry, first_only=True)
+        return self.names[found[0]] if found else None
+
+
+def assign_feature_classes_to_cartas(feature_classes, carta_index, spatial_reference=None, workspace="./"):
+    """
+    Determine which carta each feature class belongs to.
+
+    Reproduces the notebook's assignment loop (one carta name per feature
+    class; later rows overwrite earlier ones) but looks cartas up through a
+    CartaIndex instead of testing every row against every carta.
+
+    Parameters
+    ----------
+    feature_classes : list of str
+        Feature class paths, relative to `workspace`.
+    carta_index : CartaIndex
+        Index built from the cartas records or polygons.
+    spatial_reference : arcpy.SpatialReference, optional
+        Spatial reference the rows are read in; must match the cartas.
+    workspace : str, optional
+        Folder the feature class paths are relative to (default "./").
+
+    Returns
+    -------
+    dict
+        Mapping of feature class → carta name.
+    """
+    from arcpy_backend import arcpy  # Only the cursor needs arcpy; the index itself is pure NumPy.
+
+    shapefile_to_cartas_mapping = {}
+
+    for fc in feature_classes:
+        fc_path = os.path.join(workspace, fc)
+        print(f"Processing: {fc_path}")
+
+        if not arcpy.Exists(fc_path):
+            print(f"WARNING: Feature class {fc} not found in geodatabase!")
+            continue
+
+        with arcpy.da.SearchCursor(fc_path, ["SHAPE@", "OID@"], spatial_reference=spatial_reference) as cursor:
+            for shape, _ in cursor:
+                if shape is None:
+                    continue
+                cartas_name = carta_index.first_match(shape)
+                if cartas_name is not None:
+                    shapefile_to_cartas_mapping[fc] = cartas_name
+                    print(f"Shapefile '{fc}' belongs to '{cartas_name}'")
+        print()
+
+    return shapefile_to_cartas_mapping
+
+
+def read_polygon_arrays(feature_class, spatial_reference=None, where_clause=None):
+    """
+    Read every polygon of a feature class into flat vertex arrays.
+
+    Parameters
+    ----------
+    feature_class : str
+        Polygon feature class or layer.
+    spatial_reference : arcpy.SpatialReference, optional
+        Spatial reference the shapes are projected to on read.
+    where_clause : str, optional
+        SQL filter applied to the rows.
+
+    Returns
+    -------
+    tuple
+        (oids, x, y, ring_offsets, feature_offsets): the ObjectIDs, the
+        vertices of all rings, the start of each ring and the first ring of
+        each feature (both with a trailing total). Null shapes have no rings.
+    """
+    from arcpy_backend import arcpy
+
+    oids, xs, ys, ring_counts, feature_counts = [], [], [], [], []
+    with arcpy.da.SearchCursor(feature_class, ["OID@", "SHAPE@WKB"], where_clause,
+                               spatial_reference=spatial_reference) as cursor:
+        for oid, wkb in cursor:
+            n_rings = 0
+            for x, y in wkb_rings(wkb) if wkb else ():
+                if len(x):
+                    xs.append(x)
+                    ys.append(y)
+                    ring_counts.append(len(x))
+                    n_rings += 1
+            oids.append(oid)
+            feature_counts.append(n_rings)
+
+    empty = np.empty(0, dtype=np.float64)
+    return (
+        np.asarray(oids, dtype=np.int64),
+        np.concatenate(xs) if xs else empty,
+        np.concatenate(ys) if ys else empty,
+        np.concatenate([[0], np.cumsum(ring_counts, dtype=np.intp)]),
+        np.concatenate([[0], np.cumsum(feature_counts, dtype=np.intp)]),
+    )
+
+
+def _gather_rings(offsets, rings):
+    """Vertex positions of the selected rings, concatenated, and their new offsets."""
+    starts = offsets[rings]
+    counts = offsets[rings + 1] - starts
+    new_offsets = np.concatenate([[0], np.cumsum(counts)])
+    return np.repeat(starts - new_offsets[:-1], counts) + np.arange(new_offsets[-1]), new_offsets
+
+
+def _coverage_chunk(x, y, ring_offsets, feature_offsets, carta_index, first_feature, max_vertices):
+    """Coverage rows for one contiguous range of features (see carta_coverage)."""
+    n_features = len(feature_offsets) - 1
+    rings_per_feature = np.diff(feature_offsets)
+    ring_area = ring_signed_areas(x, y, ring_offsets)
+    feature_area = np.abs(np.bincount(np.repeat(np.arange(n_features), rings_per_feature), weights=ring_area,
+                                      minlength=n_features))
+
+    has_rings = rings_per_feature > 0
+    ring_env = np.empty((len(ring_offsets) - 1, 4))
+    if len(ring_env):
+        starts = ring_offsets[:-1]
+        ring_env[:, 0] = np.minimum.reduceat(x, starts)
+        ring_env[:, 1] = np.minimum.reduceat(y, starts)
+        ring_env[:, 2] = np.maximum.reduceat(x, starts)
+        ring_env[:, 3] = np.maximum.reduceat(y, starts)
+    feature_env = np.full((n_features, 4), np.nan)
+    if has_rings.any():
+        first_rings = feature_offsets[:-1][has_rings]
+        feature_env[has_rings] = np.column_stack([
+            np.minimum.reduceat(ring_env[:, 0], first_rings), np.minimum.reduceat(ring_env[:, 1], first_rings),
+            np.maximum.reduceat(ring_env[:, 2], first_rings), np.maximum.reduceat(ring_env[:, 3], first_rings),
+        ])
+
+    # Candidate (feature, carta) pairs from the STRtree, then one row per (ring, carta)
+    pair_feature, pair_carta = carta_index.tree.query_bulk(feature_env)
+
+    pair_of_row = np.repeat(np.arange(len(pair_feature)), rings_per_feature[pair_feature])
+    local = np.arange(len(pair_of_row)) - np.repeat(np.cumsum(rings_per_feature[pair_feature])
+                                                    - rings_per_feature[pair_feature], rings_per_feature[pair_feature])
+    row_ring = feature_offsets[pair_feature][pair_of_row] + local
+    rect = carta_index.bounds[pair_carta[pair_of_row]]
+    env = ring_env[row_ring]
+
+    outside = (env[:, 0] >= rect[:, 2]) | (env[:, 2] <= rect[:, 0]) | (env[:, 1] >= rect[:, 3]) | (env[:, 3] <= rect[:, 1])
+    inside = (env[:, 0] >= rect[:, 0]) & (env[:, 2] <= rect[:, 2]) & (env[:, 1] >= rect[:, 1]) & (env[:, 3] <= rect[:, 3])
+    row_area = np.where(inside, ring_area[row_ring], 0.0)
+
+    # Only rings straddling a sheet edge are clipped, in batches of bounded vertex count
+    partial = np.flatnonzero(~outside & ~inside)
+    vertex_counts = np.cumsum(np.diff(ring_offsets)[row_ring[partial]])
+    batch_starts = np.searchsorted(vertex_counts, np.arange(0, vertex_counts[-1] if len(partial) else 0, max_vertices),
+                                   side="right")
+    for start, end in zip(batch_starts, np.append(batch_starts[1:], len(partial))):
+        rows = partial[start:end]
+        if len(rows) == 0:
+            continue
+        gather, offsets = _gather_rings(ring_offsets, row_ring[rows])
+        clipped = clip_rings_to_rects(x[gather], y[gather], offsets, *rect[rows].T)
+        row_area[rows] = ring_signed_areas(*clipped)
+
+    pair_area = np.abs(np.bincount(pair_of_row, weights=row_area, minlength=len(pair_feature)))
+    keep = pair_area > carta_index.area_tolerance
+    feature = pair_feature[keep]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        share = pair_area[keep] / feature_area[feature]
+    return feature + first_feature, pair_carta[keep], pair_area[keep], share
+
+
+def carta_coverage(x, y, ring_offsets, feature_offsets, carta_index, feature_ids=None, chunk_size=20000,
+                   max_workers=1, max_vertices=1 << 20):
+    """
+    Overlay polygons on the carta sheets: every sheet each feature touches, with the shared area.
+
+    Unlike the first-match assignment, the result does not depend on the
+    order of the cartas or rows. Sheets are treated as rectangles (their
+    envelopes, exact for cartas built from the XMin_utm/... records); rings
+    straddling a sheet edge are clipped with clip_rings_to_rects, and rings
+    fully inside a sheet just contribute their own area.
+
+    Parameters
+    ----------
+    x, y, ring_offsets, feature_offsets : array_like
+        Polygons as flat arrays, as returned by read_polygon_arrays. Holes
+        must be oriented opposite to their exterior (as Esri stores them).
+    carta_index : CartaIndex
+        Index over the rectangular cartas.
+    feature_ids : array_like, optional
+        Labels for the "feature" column (e.g. ObjectIDs); defaults to the
+        feature positions.
+    chunk_size : int, optional
+        Features per chunk (default 20000); bounds the memory per chunk.
+    max_workers : int, optional
+        Processes working on chunks in parallel (default 1, this process).
+    max_vertices : int, optional
+        Vertices clipped per vectorized batch (default about one million).
+
+    Returns
+    -------
+    dict
+        Columns of equal length, ordered by feature then carta: "feature",
+        "carta" (index into "names"), "area" (shared area in map units²) and
+        "share" (fraction of the feature's area), plus "names".
+    """
+    if any(geometry is not None for geometry in carta_index.geometries):
+        raise ValueError("The overlay needs rectangular cartas; build the index with CartaIndex.from_records.")
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    ring_offsets = np.asarray(ring_offsets, dtype=np.intp)
+    feature_offsets = np.asarray(feature_offsets, dtype=np.intp)
+    if np.any(np.diff(ring_offsets) == 0):
+        raise ValueError("Every ring needs at least one vertex.")
+
+    n_features = len(feature_offsets) - 1
+    chunks = []
+    for start in range(0, n_features, chunk_size):
+        stop = min(start + chunk_size, n_features)
+        first_ring, last_ring = feature_offsets[start], feature_offsets[stop]
+        first_vertex, last_vertex = ring_offsets[first_ring], ring_offsets[last_ring]
+        chunks.append((x[first_vertex:last_vertex], y[first_vertex:last_vertex],
+                       ring_offsets[first_ring:last_ring + 1] - first_vertex,
+                       feature_offsets[start:stop + 1] - first_ring, carta_index, start, max_vertices))
+
+    if max_workers <= 1 or len(chunks) <= 1:
+        results = [_coverage_chunk(*chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(chunks))) as executor:
+            results = list(executor.map(_coverage_chunk, *zip(*chunks)))
+
+    if results:
+        feature, carta, area, share = (np.concatenate(column) for column in zip(*results))
+    else:
+        feature, carta, area, share = np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp), np.empty(0), np.empty(0)
+    if feature_ids is not None:
+        feature = np.asarray(feature_ids)[feature]
+    return {"feature": feature, "carta": carta, "area": area, "share": share, "names": list(carta_index.names)}
+
+
+def coverage_by_feature(table):
+    """
+    Group a carta_coverage table per feature.
+
+    Returns
+    -------
+    dict
+        Feature → list of (carta name, area, share), largest area first.
+    """
+    grouped = {}
+    names = table["names"]
+    for feature, carta, area, share in zip(table["feature"].tolist(), table["carta"].tolist(),
+                                           table["area"].tolist(), table["share"].tolist()):
+        grouped.setdefault(feature, []).append((names[carta], area, share))
+    for cartas in grouped.values():
+        cartas.sort(key=lambda item: -item[1])
+    return grouped
+
+
+def feature_class_coverage(feature_classes, carta_index, spatial_reference=None, workspace="./", catalog=None,
+                           **kwargs):
+    """
+    Carta coverage of every feature of several feature classes.
+
+    Parameters
+    ----------
+    feature_classes : list of str
+        Feature class paths, relative to `workspace`.
+    carta_index : CartaIndex
+        Index built from the cartas records.
+    spatial_reference : arcpy.SpatialReference, optional
+        Spatial reference the rows are read in; must match the cartas.
+    workspace : str, optional
+        Folder the feature class paths are relative to (default "./").
+    catalog : gdb_catalog.GeodatabaseCatalog, optional
+        Answer the existence checks from the cached catalog instead of
+        calling arcpy.Exists for every feature class.
+    **kwargs
+        Passed on to carta_coverage (chunk_size, max_workers, ...).
+
+    Returns
+    -------
+    dict
+        Feature class → carta_coverage table, with ObjectIDs in "feature".
+    """
+    from arcpy_backend import arcpy
+
+    tables = {}
+    for fc in feature_classes:
+        fc_path = os.path.join(workspace, fc)
+        exists = catalog.describe(fc_path) is not None if catalog is not None else arcpy.Exists(fc_path)
+        if not exists:
+            print(f"WARNING: Feature class {fc} not found in geodatabase!")
+            continue
+        oids, x, y, ring_offsets, feature_offsets = read_polygon_arrays(fc_path, spatial_reference)
+        tables[fc] = carta_coverage(x, y, ring_offsets, feature_offsets, carta_index, feature_ids=oids, **kwargs)
+    return tables
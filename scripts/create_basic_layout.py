@@ -4,7 +4,7 @@ Script de Python para crear un layout básico de mapa en ArcGIS Pro,
 incluyendo un Map Frame, Scale Bar y North Arrow.
 """
 
-import arcpy
+from arcpy_backend import arcpy
 
 try:
     # 1. Obtener el proyecto actual de ArcGIS Pro
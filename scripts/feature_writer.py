@@ -0,0 +1,275 @@
+"""
+Buffered, batched writes of (geometry, attributes) rows through arcpy.da.InsertCursor.
+
+Inserting features one `insertRow` at a time, each outside any transaction,
+makes a geodatabase commit (and, for enterprise and versioned data, flush
+its edit state) per row. FeatureWriter buffers rows and writes them a batch
+at a time: in a geodatabase every batch is one edit operation of a single
+edit session, so hundreds of thousands of features are committed in a few
+hundred steps. With background=True the batches are inserted by a writer
+thread while the caller keeps producing geometries, so building shapes and
+writing them to disk overlap. Rows written, batches and rows per second are
+kept on the writer.
+
+    with FeatureWriter(path, ["Name"], shape_field="SHAPE@WKB") as writer:
+        writer.write_many((wkb, [name]) for name, wkb in features)
+    print(writer.stats())
+"""
+
+import os
+import queue
+import threading
+import time
+
+from arcpy_backend import arcpy
+
+GEODATABASE_SUFFIXES = (".gdb", ".sde")
+
+_DONE = object()
+
+
+def geodatabase_workspace(path):
+    """Enclosing file/enterprise geodatabase of a feature class path (through feature datasets), or None."""
+    path = os.path.normpath(path)
+    while True:
+        if path.lower().endswith(GEODATABASE_SUFFIXES):
+            return path
+        parent = os.path.dirname(path)
+        if not parent or parent == path:
+            return None
+        path = parent
+
+
+class FeatureWriter:
+    """
+    Append rows to a feature class in batches, optionally from a background thread.
+
+    Parameters
+    ----------
+    path : str
+        Existing feature class or shapefile to append to.
+    fields : list of str, optional
+        Attribute fields, in the order the attribute values are given.
+    shape_field : str, optional
+        Geometry token of the insert cursor (default "SHAPE@"; "SHAPE@WKB" and
+        "SHAPE@XY" avoid building arcpy geometries).
+    batch_size : int, optional
+        Rows buffered and written together (default 10000).
+    edit_session : bool, optional
+        Wrap the writes in an arcpy.da.Editor session with one edit operation
+        per batch. Defaults to True for geodatabase feature classes and False
+        elsewhere (shapefiles and memory workspaces have no edit sessions).
+    multiuser : bool, optional
+        Multiuser mode of the edit session, for versioned enterprise data (default False).
+    background : bool, optional
+        Insert the batches from a writer thread (default False). The cursor
+        and edit session then live on that thread, as arcpy requires.
+    max_pending : int, optional
+        Full batches allowed to wait for the writer thread before write()
+        blocks (default 4), which bounds memory when producing is faster
+        than writing.
+
+    Notes
+    -----
+    - A failed batch rolls back its edit operation and ends the edit session
+      without saving, as does an exception leaving a `with` block (rows
+      still buffered are dropped). Errors raised on the writer thread are
+      raised by the next write(), flush() or close().
+    - Attribute values may be a sequence in `fields` order or a dict keyed
+      by field name (missing keys are written as NULL).
+    """
+
+    def __init__(self, path, fields=(), shape_field="SHAPE@", batch_size=10000, edit_session=None,
+                 multiuser=False, background=False, max_pending=4):
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1.")
+        if max_pending < 1:
+            raise ValueError("max_pending must be at least 1.")
+        self.path = path
+        self.fields = list(fields)
+        self.shape_field = shape_field
+        self.batch_size = batch_size
+        self.workspace = geodatabase_workspace(path)
+        if edit_session is None:
+            edit_session = self.workspace is not None
+        elif edit_session and self.workspace is None:
+            raise ValueError(f"Edit sessions need a geodatabase feature class: {path}")
+        self.edit_session = edit_session
+        self.multiuser = multiuser
+        self.background = background
+
+        self.rows_written = 0
+        self.batches_written = 0
+        self.write_seconds = 0.0
+        self._buffer = []
+        self._cursor = None
+        self._editor = None
+        self._error = None
+        self._closed = False
+        self._started = time.perf_counter()
+        self._finished = None
+
+        if background:
+            self._queue = queue.Queue(max_pending)
+            self._thread = threading.Thread(target=self._drain, name=f"FeatureWriter({os.path.basename(path)})",
+                                            daemon=True)
+            self._thread.start()
+        else:
+            self._open()
+
+    # --- writing (caller side) ------------------------------------------------------------------
+
+    def write(self, geometry, attributes=()):
+        """Buffer one row; a full buffer is written (or handed to the writer thread)."""
+        if self._closed:
+            raise RuntimeError("The writer is closed.")
+        if isinstance(attributes, dict):
+            attributes = [attributes.get(name) for name in self.fields]
+        self._buffer.append((geometry, *attributes))
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def write_many(self, rows):
+        """Write every (geometry, attributes) pair of an iterable or generator; returns the rows written so far."""
+        for geometry, attributes in rows:
+            self.write(geometry, attributes)
+        return self.rows_written
+
+    def flush(self):
+        """Write the buffered rows as one batch."""
+        self._check()
+        if not self._buffer:
+            return
+        batch, self._buffer = self._buffer, []
+        if self.background:
+            self._put(batch)
+            self._check()
+        else:
+            self._write_batch(batch)
+
+    def close(self):
+        """Write what is left, commit the edit session and release the cursor."""
+        if self._closed:
+            return
+        try:
+            self.flush()
+        finally:
+            self._shutdown()
+        self._check()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        elif not self._closed:
+            # The caller failed: drop the partial buffer and end the edit session without saving
+            self._buffer = []
+            self._error = self._error or exc_value
+            self._shutdown()
+
+    # --- metrics --------------------------------------------------------------------------------
+
+    @property
+    def elapsed(self):
+        """Seconds since the writer was opened (until it was closed)."""
+        return (self._finished or time.perf_counter()) - self._started
+
+    @property
+    def rows_per_second(self):
+        """Sustained throughput: rows written over the elapsed time, producing included."""
+        elapsed = self.elapsed
+        return self.rows_written / elapsed if elapsed > 0 else 0.0
+
+    def stats(self):
+        """Rows, batches, elapsed and insert seconds, and rows per second, as a dict."""
+        return {"rows": self.rows_written, "batches": self.batches_written, "elapsed": self.elapsed,
+                "write_seconds": self.write_seconds, "rows_per_second": self.rows_per_second}
+
+    # --- cursor and edit session (writer side) --------------------------------------------------
+
+    def _open(self):
+        if self.edit_session:
+            self._editor = arcpy.da.Editor(self.workspace)
+            self._editor.startEditing(False, self.multiuser)
+        self._cursor = arcpy.da.InsertCursor(self.path, [self.shape_field] + self.fields)
+
+    def _write_batch(self, batch):
+        start = time.perf_counter()
+        if self._editor is not None:
+            self._editor.startOperation()
+        try:
+            for row in batch:
+                self._cursor.insertRow(row)
+        except BaseException as error:
+            if self._editor is not None:
+                self._editor.abortOperation()
+            self._error = error
+            self._release(save=False)
+            raise
+        if self._editor is not None:
+            self._editor.stopOperation()
+        self.write_seconds += time.perf_counter() - start
+        self.rows_written += len(batch)
+        self.batches_written += 1
+
+    def _release(self, save):
+        # The cursor must be released before the edit session is stopped. da cursors have no close();
+        # leaving their context releases them even while a traceback still references the cursor
+        cursor, self._cursor = self._cursor, None
+        if cursor is not None:
+            cursor.__exit__(None, None, None)
+        editor, self._editor = self._editor, None
+        if editor is not None and editor.isEditing:
+            editor.stopEditing(save)
+
+    def _drain(self):
+        try:
+            self._open()
+            while True:
+                batch = self._queue.get()
+                if batch is _DONE:
+                    break
+                self._write_batch(batch)
+        except BaseException as error:
+            self._error = self._error or error
+            # Keep consuming so a producer blocked on a full queue is released
+            while self._queue.get() is not _DONE:
+                pass
+        finally:
+            self._release(save=self._error is None)
+
+    def _put(self, item):
+        # A writer thread that died has nothing left to consume; its error is raised by _check()
+        while self._thread.is_alive():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _shutdown(self):
+        self._closed = True
+        if self.background:
+            self._put(_DONE)
+            self._thread.join()
+        else:
+            self._release(save=self._error is None)
+        self._finished = time.perf_counter()
+
+    def _check(self):
+        if self._error is not None:
+            raise self._error
+
+
+def write_features(path, rows, fields=(), shape_field="SHAPE@", **kwargs):
+    """
+    Append an iterable of (geometry, attributes) rows to a feature class with a FeatureWriter.
+
+    Keyword arguments are passed to FeatureWriter (batch_size, edit_session,
+    background, ...). Returns the writer's stats().
+    """
+    with FeatureWriter(path, fields, shape_field, **kwargs) as writer:
+        writer.write_many(rows)
+    return writer.stats()
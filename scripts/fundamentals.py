@@ -1,6 +1,204 @@
-import arcpy
+import time
 
-def remove_existing_layer(aprx, map_name, layer_name):
+import numpy as np
+
+from arcpy_backend import arcpy
+from feature_writer import FeatureWriter
+from polygon_set import PolygonSet
+from projection_cache import spatial_reference
+
+class MapSession:
+    """
+    A map resolved once, with a name -> layers index kept in sync as layers are added and removed.
+
+    Looking a layer up by name is a dictionary access instead of a scan over
+    ``Map.listLayers()``, so scripts that add or replace hundreds of layers in
+    one map no longer do quadratic work.
+
+    Parameters
+    ----------
+    aprx : arcpy.mp.ArcGISProject
+        The ArcGIS Pro project instance.
+    map_name : str
+        The name of the map within the project.
+
+    Raises
+    ------
+    ValueError
+        If the project has no map with that name.
+
+    Notes
+    -----
+    - The index follows changes made through the session. A name that is not in the index is
+      looked up again in the map (one `refresh()`), so layers added by geoprocessing tools or in
+      the GUI are still found; call `refresh()` yourself after removing or renaming layers by
+      other means.
+    """
+
+    def __init__(self, aprx, map_name):
+        maps = aprx.listMaps(map_name)
+        if not maps:
+            raise ValueError(f"Map '{map_name}' not found in the project.")
+        self.aprx = aprx
+        self.map_name = map_name
+        self.map = maps[0]
+        self.refresh()
+
+    def refresh(self):
+        """Rebuild the name index from the map (one listLayers() call)."""
+        self._layers = {}
+        for lyr in self.map.listLayers():
+            self._layers.setdefault(lyr.name, []).append(lyr)
+
+    def _lookup(self, layer_name, refresh=True):
+        # A miss may be a layer added behind the session's back: rescan once before giving up
+        layers = self._layers.get(layer_name)
+        if not layers and refresh:
+            self.refresh()
+            layers = self._layers.get(layer_name)
+        return layers
+
+    def __contains__(self, layer_name):
+        return bool(self._lookup(layer_name))
+
+    def layers(self, layer_name):
+        """All layers with the given name, in map order."""
+        return list(self._lookup(layer_name) or ())
+
+    def layer(self, layer_name):
+        """The first layer with the given name, or None."""
+        layers = self._lookup(layer_name)
+        return layers[0] if layers else None
+
+    def _index(self, layers):
+        for lyr in layers:
+            self._layers.setdefault(lyr.name, []).append(lyr)
+
+    def add_layer(self, layer, position="AUTO_ARRANGE"):
+        """Add a layer (or layer file) to the map and index it; returns the added layers."""
+        added = self.map.addLayer(layer, position)
+        added = list(added) if isinstance(added, (list, tuple)) else [layer]
+        self._index(added)
+        return added
+
+    def add_data_from_path(self, data_path):
+        """Add a dataset or service URL with Map.addDataFromPath and index the new layer."""
+        lyr = self.map.addDataFromPath(data_path)
+        self._index([lyr])
+        return lyr
+
+    def remove_layer(self, layer):
+        """Remove one layer object from the map and from the index."""
+        self.map.removeLayer(layer)
+        for name in (layer.name, *self._layers):
+            layers = self._layers.get(name, [])
+            if any(lyr is layer for lyr in layers):
+                layers[:] = [lyr for lyr in layers if lyr is not layer]
+                if not layers:
+                    del self._layers[name]
+                break
+
+    def remove(self, layer_name, remove_all=False, refresh=True):
+        """
+        Remove the first layer (or every layer) with the given name.
+
+        Returns
+        -------
+        int
+            Number of layers removed.
+        """
+        layers = self._lookup(layer_name, refresh)
+        if not layers:
+            return 0
+        victims = layers[:] if remove_all else layers[:1]
+        for lyr in victims:
+            self.map.removeLayer(lyr)
+        del layers[:len(victims)]
+        if not layers:
+            del self._layers[layer_name]
+        return len(victims)
+
+    def remove_many(self, layer_names, remove_all=True):
+        """
+        Remove the layers with any of the given names in one pass.
+
+        Returns
+        -------
+        dict
+            Number of layers removed per name.
+        """
+        # One rescan up front instead of one per name that is not in the map
+        self.refresh()
+        return {name: self.remove(name, remove_all, refresh=False) for name in dict.fromkeys(layer_names)}
+
+    def replace(self, layer_name, layer, position="AUTO_ARRANGE"):
+        """Remove every layer called `layer_name`, then add `layer`; returns the added layers."""
+        self.remove(layer_name, remove_all=True)
+        return self.add_layer(layer, position)
+
+    def replace_many(self, layers_by_name, position="AUTO_ARRANGE"):
+        """
+        Replace many layers at once.
+
+        Parameters
+        ----------
+        layers_by_name : dict
+            Layer name to remove -> new layer (or layer file) to add.
+
+        Returns
+        -------
+        dict
+            The added layers per name.
+        """
+        self.remove_many(layers_by_name)
+        return {name: self.add_layer(layer, position) for name, layer in layers_by_name.items()}
+
+    def rename(self, layer, new_name):
+        """Rename a layer and move it in the index."""
+        layers = self._layers.get(layer.name, [])
+        layers[:] = [lyr for lyr in layers if lyr is not layer]
+        if not layers:
+            self._layers.pop(layer.name, None)
+        layer.name = new_name
+        self._index([layer])
+
+
+def map_session(aprx, map_name):
+    """
+    Resolve a MapSession for a project and map.
+
+    Every call scans the map again, so the module's layer functions always
+    see the current layers (including those added by tools or in the GUI)
+    and no project is kept alive after the call. Keep the returned session
+    to batch many operations on one map.
+
+    Parameters
+    ----------
+    aprx : arcpy.mp.ArcGISProject
+        The ArcGIS Pro project instance.
+    map_name : str
+        The name of the map within the project.
+
+    Returns
+    -------
+    MapSession
+
+    Raises
+    ------
+    ValueError
+        If the project has no map with that name.
+    """
+    return MapSession(aprx, map_name)
+
+def _new_session(aprx, map_name):
+    """map_session(), or None (with a message) if the project has no such map."""
+    try:
+        return map_session(aprx, map_name)
+    except ValueError:
+        print(f"Error: Map '{map_name}' not found in the project.")
+        return None
+
+def remove_existing_layer(aprx, map_name, layer_name, session=None, refresh=True):
     """
     Remove an existing layer from an ArcGIS Pro map within a project by its name.
 
@@ -12,6 +210,13 @@ def remove_existing_layer(aprx, map_name, layer_name):
         The name of the map within the project.
     layer_name : str
         The name of the layer to remove if it exists in the specified map.
+    session : MapSession, optional
+        Session of the map to remove from. Pass one to run many layer
+        operations against a single scan of the map; a new session is
+        resolved when omitted.
+    refresh : bool, optional
+        Rescan a given session's map when the name is not in its index
+        (default True). Ignored when no session is given.
 
     Returns
     -------
@@ -22,20 +227,19 @@ def remove_existing_layer(aprx, map_name, layer_name):
     -----
     - If multiple layers share the same name, only the first encountered will be removed.
     - This function is useful for ensuring a fresh state before adding a new layer.
+    - Layers are found through a MapSession name index built from one scan of the map.
     """
-    try:
-        m = aprx.listMaps(map_name)[0]  # Get the map object by name
-        for lyr in m.listLayers():
-            if lyr.name == layer_name:
-                m.removeLayer(lyr)
-                print(f"Removed existing layer: {layer_name} from map: {map_name}")
-                return True
-        return False
-    except IndexError:
-        print(f"Error: Map '{map_name}' not found in the project.")
-        return False
-
-def replace_layer_with_raster(aprx, map_name, layer_name, service_url):
+    if session is None:
+        session = _new_session(aprx, map_name)
+        if session is None:
+            return False
+        refresh = False  # the index was just built from the map
+    if session.remove(layer_name, refresh=refresh):
+        print(f"Removed existing layer: {layer_name} from map: {map_name}")
+        return True
+    return False
+
+def replace_layer_with_raster(aprx, map_name, layer_name, service_url, session=None):
     """
     Replace (or add) a raster layer in an ArcGIS Pro map using a service URL.
 
@@ -49,6 +253,9 @@ def replace_layer_with_raster(aprx, map_name, layer_name, service_url):
         Name to assign to the new raster layer (and to remove any old layer with this name).
     service_url : str
         The URL for the raster service (e.g., ArcGIS Online imagery service).
+    session : MapSession, optional
+        Session of the map, reused for the removal and the addition; a new
+        session (one scan of the map) is resolved when omitted.
 
     Returns
     -------
@@ -60,16 +267,21 @@ def replace_layer_with_raster(aprx, map_name, layer_name, service_url):
     - This function adds a raster layer from a service URL.
     - If a layer with the same name already exists, it will be removed before adding the new one.
     """
+    refresh = session is not None
+    if session is None:
+        session = _new_session(aprx, map_name)
+        if session is None:
+            return None
+
     # Remove old layer if present
-    remove_existing_layer(aprx, map_name, layer_name)
+    remove_existing_layer(aprx, map_name, layer_name, session, refresh)
 
     try:
-        m = aprx.listMaps(map_name)[0]  # Get the map object
         raster_layer = arcpy.mp.Layer(layer_name)  # Create a layer object (in-memory for now)
         raster_layer.dataSource = service_url
         raster_layer.name = layer_name
 
-        m.addLayer(raster_layer) # Add the layer to the map
+        session.add_layer(raster_layer) # Add the layer to the map
         print(f"Successfully loaded raster layer: {layer_name} from URL: {service_url} to map: {map_name}")
         return raster_layer
     except Exception as e:
@@ -97,7 +309,7 @@ def transform_layer_crs(layer, target_epsg):
     - It's important to ensure that the data is actually in or can be correctly interpreted in the target CRS.
     """
     try:
-        target_sr = arcpy.SpatialReference(target_epsg)
+        target_sr = spatial_reference(target_epsg)
         if layer.isFeatureLayer or layer.isRasterLayer: # Check if it's a layer type that supports spatial reference
             layer.spatialReference = target_sr
             print(f"Set spatial reference of layer '{layer.name}' to EPSG:{target_epsg}.")
@@ -134,6 +346,135 @@ def set_layer_opacity(layer, opacity=0.5):
     layer.transparency = int((1 - opacity) * 100)  # Convert 0-1 to 100-0 percentage
     print(f"Set opacity of layer '{layer.name}' to {opacity} (ArcGIS Transparency: {layer.transparency}%).")
 
+def _color_values(values):
+    """RGB or RGBA (alpha 0-100) as the float list stored in a CIMRGBColor."""
+    values = [float(v) for v in values]
+    return values + [100.0] if len(values) == 3 else values
+
+def _set_color(symbol_layer, values):
+    """Set a symbol layer's color; returns True if it changed."""
+    values = _color_values(values)
+    color = symbol_layer.color
+    if type(color).__name__ == "CIMRGBColor" and [float(v) for v in color.values] == values:
+        return False
+    if type(color).__name__ != "CIMRGBColor":
+        color = arcpy.cim.CreateCIMObjectFromClassName("CIMRGBColor", "V3")
+    color.values = values
+    symbol_layer.color = color
+    return True
+
+def _apply_style(definition, spec):
+    """
+    Apply a style spec to a layer's CIM definition in memory.
+
+    Returns True if anything changed. Raises ValueError if the spec sets fill or
+    outline on a layer without a single-symbol renderer.
+    """
+    changed = False
+    if spec.get("transparency") is not None:
+        if getattr(definition, "transparency", None) != spec["transparency"]:
+            definition.transparency = spec["transparency"]
+            changed = True
+
+    if not any(spec.get(key) is not None for key in ("fill", "outline", "width")):
+        return changed
+    symbol = getattr(getattr(getattr(definition, "renderer", None), "symbol", None), "symbol", None)
+    if symbol is None:
+        raise ValueError("fill/outline/width need a layer drawn with a single symbol.")
+    for symbol_layer in symbol.symbolLayers:
+        kind = type(symbol_layer).__name__
+        if kind == "CIMSolidFill" and spec.get("fill") is not None:
+            changed |= _set_color(symbol_layer, spec["fill"])
+        elif kind == "CIMSolidStroke":
+            if spec.get("outline") is not None:
+                changed |= _set_color(symbol_layer, spec["outline"])
+            if spec.get("width") is not None and symbol_layer.width != spec["width"]:
+                symbol_layer.width = spec["width"]
+                changed = True
+    return changed
+
+def apply_layer_styles(aprx, map_name, styles, verbose=True):
+    """
+    Style many layers in one pass through their CIM definitions.
+
+    All layers are resolved from the map once, every definition is read and
+    modified in memory, and only the layers whose style actually changes are
+    written back, each with a single setDefinition call (no getSymbology /
+    setSymbology round-trip and no per-layer message). Re-running with the same
+    styles therefore writes nothing.
+
+    Parameters
+    ----------
+    aprx : arcpy.mp.ArcGISProject
+        The ArcGIS Pro project instance.
+    map_name : str
+        The name of the map holding the layers.
+    styles : dict
+        Layer name -> style spec. A spec may set any of:
+        "fill" and "outline" ([R, G, B] or [R, G, B, alpha 0-100]),
+        "width" (outline width in points) and "transparency" (0-100 %).
+        Every layer with the given name is styled.
+    verbose : bool, optional
+        Print one summary line with the timings (default True).
+
+    Returns
+    -------
+    dict
+        "updated", "unchanged", "missing" (layer names), "errors"
+        ((name, message) pairs) and "seconds" (resolve, read, write and total).
+    """
+    report = {"updated": [], "unchanged": [], "missing": [], "errors": []}
+    start = time.perf_counter()
+    session = map_session(aprx, map_name)
+    resolved = {name: session.layers(name) for name in styles}
+    resolved_at = time.perf_counter()
+
+    pending = []
+    for name, spec in styles.items():
+        if not resolved[name]:
+            report["missing"].append(name)
+            continue
+        for lyr in resolved[name]:
+            try:
+                definition = lyr.getDefinition("V3")
+                if _apply_style(definition, spec):
+                    pending.append((name, lyr, definition))
+                else:
+                    report["unchanged"].append(name)
+            except (ValueError, AttributeError) as e:
+                report["errors"].append((name, str(e)))
+    read_at = time.perf_counter()
+
+    for name, lyr, definition in pending:
+        try:
+            lyr.setDefinition(definition)
+            report["updated"].append(name)
+        except Exception as e:
+            report["errors"].append((name, str(e)))
+    end = time.perf_counter()
+
+    report["seconds"] = {"resolve": resolved_at - start, "read": read_at - resolved_at,
+                         "write": end - read_at, "total": end - start}
+    if verbose:
+        print(f"Styled {len(report['updated'])} layer(s), {len(report['unchanged'])} unchanged, "
+              f"{len(report['missing'])} missing, {len(report['errors'])} error(s) in {end - start:.2f} s "
+              f"(resolve {resolved_at - start:.2f} s, read {read_at - resolved_at:.2f} s, write {end - read_at:.2f} s).")
+    return report
+
+def _marker_field_type(values):
+    """ArcGIS field type (and text length) for a column of marker attributes."""
+    values = np.asarray(values)
+    if values.dtype.kind == "b":
+        return "SHORT", None
+    if values.dtype.kind in "iu":
+        fits_long = values.size == 0 or (values.min() >= -2**31 and values.max() < 2**31)
+        return ("LONG" if fits_long else "DOUBLE"), None
+    if values.dtype.kind == "f":
+        return "DOUBLE", None
+    if values.dtype.kind == "M":
+        return "DATE", None
+    return "TEXT", max(1, max((len(str(v)) for v in values.tolist()), default=1))
+
 def create_basic_marker_layer(
     aprx,
     map_name,
@@ -141,10 +482,13 @@ def create_basic_marker_layer(
     point_geometry_xy,
     layer_crs=4326, # EPSG:4326 as default
     marker_color="Red", # Basic color name
-    marker_size=8 # Points
+    marker_size=8, # Points
+    attributes=None,
+    chunk_size=50000,
+    session=None
 ):
     """
-    Create and add an in-memory point feature class layer with a single marker feature in ArcGIS Pro.
+    Create and add an in-memory point feature class layer with one or many marker features in ArcGIS Pro.
 
     Parameters
     ----------
@@ -154,14 +498,23 @@ def create_basic_marker_layer(
         The name of the map within the project.
     layer_name : str
         A name for the in-memory feature class layer.
-    point_geometry_xy : tuple(float, float)
-        A tuple representing the X and Y coordinates (longitude, latitude) of the marker.
+    point_geometry_xy : tuple(float, float), iterable of tuples or numpy.ndarray
+        The X and Y coordinates (longitude, latitude) of one marker, or of many markers as an
+        iterable of (x, y) pairs or an (n, 2) array.
     layer_crs : int or str, optional
         The EPSG code for the in-memory feature class layer (default 4326 - EPSG:4326).
     marker_color : str, optional
         Color of the marker (using ArcGIS color names, e.g., "Red", "Blue", "Green"). Default is "Red".
     marker_size : float, optional
         Marker size in points (default 8).
+    attributes : dict, optional
+        Attribute columns keyed by field name, one value per point (lists or NumPy arrays).
+        Field types are derived from the values (integer, float, boolean, date or text).
+    chunk_size : int, optional
+        Number of rows converted and inserted at a time, which bounds memory use (default 50000).
+    session : MapSession, optional
+        Session of the map, so that many marker layers can be added against a single scan of the
+        map; a new session is resolved when omitted.
 
     Returns
     -------
@@ -172,23 +525,50 @@ def create_basic_marker_layer(
     -----
     - Removes any existing layer with the same name before creating this one.
     - Uses an in-memory feature class to avoid creating files.
+    - All points go into one feature class through a single buffered FeatureWriter (with "SHAPE@XY",
+      so no geometry objects are built), and symbology is applied once to the one resulting layer.
     - Basic marker symbol is applied using layer properties. For advanced symbology, CIM should be used.
     """
-    remove_existing_layer(aprx, map_name, layer_name)
+    refresh = session is not None
+    if session is None:
+        session = _new_session(aprx, map_name)
+        if session is None:
+            return None
+    remove_existing_layer(aprx, map_name, layer_name, session, refresh)
 
     try:
-        m = aprx.listMaps(map_name)[0]
-        sr = arcpy.SpatialReference(layer_crs)
-        point = arcpy.Point(point_geometry_xy[0], point_geometry_xy[1])
-        point_geometry = arcpy.PointGeometry(point, sr)
-
-        # Create an in-memory feature class
+        sr = spatial_reference(layer_crs)
+        points = np.asarray(point_geometry_xy if isinstance(point_geometry_xy, np.ndarray)
+                            else list(point_geometry_xy), dtype=np.float64)
+        points = points.reshape(-1, 2)  # a single (x, y) pair becomes one row
+        attributes = {name: np.asarray(values) for name, values in (attributes or {}).items()}
+        for name, values in attributes.items():
+            if len(values) != len(points):
+                raise ValueError(f"Attribute '{name}' has {len(values)} values for {len(points)} points.")
+
+        # Create an in-memory feature class (replacing one left over by a previous call)
         temp_fc = "in_memory/" + layer_name
+        if arcpy.Exists(temp_fc):
+            arcpy.Delete_management(temp_fc)
         arcpy.CreateFeatureclass_management("in_memory", layer_name, "POINT", spatial_reference=sr)
 
-        # Insert the point feature
-        with arcpy.da.InsertCursor(temp_fc, ["SHAPE@"]) as cursor:
-            cursor.insertRow([point_geometry])
+        field_names = []
+        if attributes:
+            field_definitions = []
+            for name, values in attributes.items():
+                field_type, length = _marker_field_type(values)
+                field_name = arcpy.ValidateFieldName(name, "in_memory")
+                field_definitions.append([field_name, field_type, "", length] if length else [field_name, field_type])
+                field_names.append(field_name)
+            arcpy.management.AddFields(temp_fc, field_definitions)
+
+        # Insert all point features through one buffered writer, chunk by chunk
+        columns = list(attributes.values())
+        with FeatureWriter(temp_fc, field_names, "SHAPE@XY", batch_size=chunk_size) as writer:
+            for start in range(0, len(points), chunk_size):
+                chunk_xy = map(tuple, points[start:start + chunk_size].tolist())
+                chunk_columns = [column[start:start + chunk_size].tolist() for column in columns]
+                writer.write_many((xy, values) for xy, *values in zip(chunk_xy, *chunk_columns))
 
         # Create a layer object from the in-memory feature class
         memory_layer = arcpy.mp.Layer(temp_fc)
@@ -198,8 +578,11 @@ def create_basic_marker_layer(
         memory_layer.symbology.renderer.symbol.color = marker_color
         memory_layer.symbology.renderer.symbol.size = marker_size
 
-        m.addLayer(memory_layer)
-        print(f"Marker layer '{layer_name}' created at ({point_geometry_xy[0]}, {point_geometry_xy[1]}) in map '{map_name}'.")
+        session.add_layer(memory_layer)
+        if len(points) == 1:
+            print(f"Marker layer '{layer_name}' created at ({points[0, 0]}, {points[0, 1]}) in map '{map_name}'.")
+        else:
+            print(f"Marker layer '{layer_name}' created with {len(points)} points in map '{map_name}'.")
         return memory_layer
 
     except Exception as e:
@@ -240,12 +623,9 @@ def add_frame_to_layout(layout, margin_mm=1.0, outline_width_mm=0.65):
         frame_height_points = page_height_points - (2 * margin_points)
 
         frame_element = layout.graphics.appendRectangle(
-            polygon=arcpy.Polygon(arcpy.Array([
-                arcpy.Point(margin_points, margin_points),
-                arcpy.Point(page_width_points - margin_points, margin_points),
-                arcpy.Point(page_width_points - margin_points, page_height_points - margin_points),
-                arcpy.Point(margin_points, page_height_points - margin_points)
-            ])),
+            polygon=next(PolygonSet.from_rectangles([(
+                margin_points, margin_points, page_width_points - margin_points, page_height_points - margin_points
+            )]).to_arcpy()),
             symbol_outline_width=outline_width_points,
             symbol_outline_color="Black",
             symbol_fill_color="No Color" # Transparent fill
@@ -352,17 +732,20 @@ if __name__ == '__main__':
     map_name = "Map" # Assuming your map is named "Map"
     layout_name = "Layout" # Assuming your layout is named "Layout"
 
+    session = map_session(aprx, map_name) # One scan of the map, shared by the calls below
+
     # 1) Replace an existing layer with a new raster
     replace_layer_with_raster(
         aprx,
         map_name=map_name,
         layer_name="World Imagery", # Desired layer name in ArcGIS Pro
-        service_url="https://services.arcgisonline.com/arcgis/rest/services/World_Imagery/MapServer" # Esri World Imagery service URL
+        service_url="https://services.arcgisonline.com/arcgis/rest/services/World_Imagery/MapServer", # Esri World Imagery service URL
+        session=session
     )
 
     # 2) Set spatial reference of a layer to EPSG:3857 (Web Mercator)
     districts_layer_name = "Districts" # Replace with the actual name of your districts layer in ArcGIS Pro
-    districts_layer = aprx.listMaps(map_name)[0].listLayers(districts_layer_name)[0]
+    districts_layer = session.layer(districts_layer_name)
     if districts_layer:
         transform_layer_crs(districts_layer, 3857) # EPSG code for Web Mercator
     else:
@@ -380,7 +763,8 @@ if __name__ == '__main__':
         point_geometry_xy=(-77.0369, 38.9072), # Washington D.C. coordinates
         layer_crs=4326, # EPSG:4326 (Latitude/Longitude)
         marker_color="Blue",
-        marker_size=10
+        marker_size=10,
+        session=session
     )
 
     # 5) Add a frame to a layout
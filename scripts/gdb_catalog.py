@@ -0,0 +1,276 @@
+"""
+Persistent inventory of the feature classes in geodatabases and folders.
+
+A workspace is walked and every feature class described once; the path,
+geometry type, spatial reference, feature count, extent and fields are then
+kept in a SQLite file. Later runs only compare a cheap file-system signature
+of the workspace (number of files and newest mtime, ignoring .lock files)
+with the cached one, so listing or filtering feature classes needs no
+geoprocessing call until the workspace actually changes. Workspaces that are
+not folders (enterprise .sde connections, ...) have no such signature and are
+rescanned on every lookup, unless the catalog is given a `max_age`. arcpy is
+only imported when a workspace has to be (re)scanned.
+"""
+
+import json
+import os
+import sqlite3
+import time
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS workspaces (
+    path TEXT PRIMARY KEY,
+    signature TEXT,
+    scanned_at REAL,
+    scan_seconds REAL
+);
+CREATE TABLE IF NOT EXISTS feature_classes (
+    path TEXT PRIMARY KEY,
+    workspace TEXT,
+    name TEXT,
+    dataset TEXT,
+    geometry_type TEXT,
+    wkid INTEGER,
+    spatial_reference TEXT,
+    feature_count INTEGER,
+    xmin REAL, ymin REAL, xmax REAL, ymax REAL,
+    fields TEXT
+);
+CREATE INDEX IF NOT EXISTS feature_classes_workspace ON feature_classes (workspace);
+"""
+
+_COLUMNS = ("path", "workspace", "name", "dataset", "geometry_type", "wkid", "spatial_reference", "feature_count",
+            "xmin", "ymin", "xmax", "ymax", "fields")
+
+
+def workspace_signature(workspace):
+    """
+    File-system signature of a workspace: "<file count>:<newest mtime in ns>", or None.
+
+    File geodatabases are flat folders whose table files are rewritten on every
+    edit (including the system catalog when classes are added or deleted), so
+    the newest mtime changes with any edit. .lock files are ignored: merely
+    reading a geodatabase creates them. Folders of shapefiles are walked
+    recursively.
+
+    Workspaces that are not folders return None: an .sde connection file does
+    not change when the database behind it does, so there is nothing on disk
+    to compare, and such workspaces are never considered current.
+    """
+    if not os.path.isdir(workspace):
+        return None
+
+    count, newest = 0, 0
+    if workspace.lower().rstrip("\\/").endswith(".gdb"):
+        walk = [(workspace, [], os.listdir(workspace))]
+    else:
+        walk = os.walk(workspace)
+    for folder, _, files in walk:
+        for name in files:
+            if name.lower().endswith(".lock"):
+                continue
+            path = os.path.join(folder, name)
+            if not os.path.isfile(path):
+                continue
+            count += 1
+            newest = max(newest, os.stat(path).st_mtime_ns)
+    return f"{count}:{newest}"
+
+
+def describe_feature_class(path, workspace):
+    """Catalog record for one feature class (one Describe and one GetCount call)."""
+    from arcpy_backend import arcpy
+
+    desc = arcpy.Describe(path)
+    spatial_reference = desc.spatialReference
+    extent = desc.extent
+    folder = os.path.dirname(path)
+    bounds = (extent.XMin, extent.YMin, extent.XMax, extent.YMax) if extent is not None else (None,) * 4
+    if any(value is None or value != value for value in bounds):  # empty feature classes have a NaN extent
+        bounds = (None,) * 4
+    return {
+        "path": path,
+        "workspace": workspace,
+        "name": os.path.basename(path),
+        "dataset": os.path.basename(folder) if os.path.normcase(folder) != os.path.normcase(workspace) else None,
+        "geometry_type": desc.shapeType,
+        "wkid": spatial_reference.factoryCode or None,
+        "spatial_reference": spatial_reference.name,
+        "feature_count": int(arcpy.management.GetCount(path)[0]),
+        "xmin": bounds[0], "ymin": bounds[1], "xmax": bounds[2], "ymax": bounds[3],
+        "fields": [{"name": f.name, "type": f.type, "length": f.length} for f in desc.fields],
+    }
+
+
+def _record(row):
+    record = dict(zip(_COLUMNS, row))
+    record["fields"] = json.loads(record["fields"])
+    return record
+
+
+class GeodatabaseCatalog:
+    """
+    SQLite cache of feature class metadata, invalidated by workspace signature.
+
+    Parameters
+    ----------
+    path : str, optional
+        SQLite file holding the catalog (created if missing).
+    max_age : float, optional
+        Seconds the records of a workspace without a file-system signature
+        (see `workspace_signature`) are reused before it is scanned again.
+        Default 0: such workspaces are rescanned on every lookup.
+
+    Examples
+    --------
+    >>> with GeodatabaseCatalog("gdb_catalog.sqlite") as catalog:
+    ...     polygons = catalog.find("coverage.gdb", geometry_type="Polygon",
+    ...                             extent=(600000, 9700000, 650000, 9750000), wkid=32717)
+    """
+
+    def __init__(self, path="gdb_catalog.sqlite", max_age=0):
+        self.path = path
+        self.max_age = max_age
+        self.stats = {"hits": 0, "scans": 0}
+        self._db = sqlite3.connect(path, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+
+    def _is_current(self, workspace, signature):
+        row = self._db.execute("SELECT signature, scanned_at FROM workspaces WHERE path=?", (workspace,)).fetchone()
+        if row is None:
+            return False
+        if signature is None:
+            return time.time() - row[1] < self.max_age
+        return row[0] == signature
+
+    def is_current(self, workspace):
+        """
+        True if the workspace was scanned and its files have not changed since.
+
+        Workspaces without a file-system signature are current for `max_age`
+        seconds after their last scan.
+        """
+        workspace = os.path.abspath(workspace)
+        return self._is_current(workspace, workspace_signature(workspace))
+
+    def scan(self, workspace, force=False):
+        """
+        Make sure the cached records of a workspace are current, rescanning it if needed.
+
+        Parameters
+        ----------
+        workspace : str
+            Geodatabase (file or enterprise connection) or folder.
+        force : bool, optional
+            Rescan even if the signature is unchanged. Workspaces that are
+            not folders are always rescanned once `max_age` has passed.
+
+        Returns
+        -------
+        bool
+            True if the workspace was rescanned.
+        """
+        workspace = os.path.abspath(workspace)
+        signature = workspace_signature(workspace)
+        if not force and self._is_current(workspace, signature):
+            self.stats["hits"] += 1
+            return False
+
+        from arcpy_backend import arcpy
+
+        start = time.perf_counter()
+        records = []
+        for dirpath, _, names in arcpy.da.Walk(workspace, datatype="FeatureClass"):
+            for name in names:
+                records.append(describe_feature_class(os.path.join(dirpath, name), workspace))
+        seconds = time.perf_counter() - start
+
+        self._db.execute("BEGIN")
+        try:
+            self._db.execute("DELETE FROM feature_classes WHERE workspace=?", (workspace,))
+            self._db.executemany(
+                f"INSERT OR REPLACE INTO feature_classes VALUES ({', '.join('?' * len(_COLUMNS))})",
+                [tuple(json.dumps(r[c]) if c == "fields" else r[c] for c in _COLUMNS) for r in records])
+            # The signature taken before the walk: edits made during the scan trigger a rescan next time
+            self._db.execute("INSERT OR REPLACE INTO workspaces VALUES (?, ?, ?, ?)",
+                             (workspace, signature, time.time(), seconds))
+            self._db.execute("COMMIT")
+        except Exception:
+            self._db.execute("ROLLBACK")
+            raise
+        self.stats["scans"] += 1
+        return True
+
+    def find(self, workspace=None, geometry_type=None, extent=None, wkid=None, name_like=None, refresh=True):
+        """
+        Query the cached feature classes; no geoprocessing calls unless a rescan is due.
+
+        Parameters
+        ----------
+        workspace : str, optional
+            Restrict to one workspace (scanned first if new or changed and
+            `refresh` is True). All cached workspaces otherwise.
+        geometry_type : str, optional
+            "Polygon", "Polyline", "Point", "Multipoint", ...
+        extent : tuple, optional
+            (xmin, ymin, xmax, ymax); keeps classes whose extent intersects it.
+            Extents are compared in each class's own coordinates, so combine
+            with `wkid`.
+        wkid : int, optional
+            Spatial reference factory code (e.g. 32717).
+        name_like : str, optional
+            SQL LIKE pattern on the feature class name.
+        refresh : bool, optional
+            Check the workspace signature (and rescan if needed) first.
+
+        Returns
+        -------
+        list of dict
+            Catalog records, ordered by path.
+        """
+        clauses, params = [], []
+        if workspace is not None:
+            workspace = os.path.abspath(workspace)
+            if refresh:
+                self.scan(workspace)
+            clauses.append("workspace = ?")
+            params.append(workspace)
+        if geometry_type is not None:
+            clauses.append("geometry_type = ?")
+            params.append(geometry_type)
+        if wkid is not None:
+            clauses.append("wkid = ?")
+            params.append(wkid)
+        if name_like is not None:
+            clauses.append("name LIKE ?")
+            params.append(name_like)
+        if extent is not None:
+            clauses.append("xmin <= ? AND xmax >= ? AND ymin <= ? AND ymax >= ?")
+            params.extend((extent[2], extent[0], extent[3], extent[1]))
+
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._db.execute(f"SELECT {', '.join(_COLUMNS)} FROM feature_classes{where} ORDER BY path", params)
+        return [_record(row) for row in rows]
+
+    def paths(self, workspace=None, **kwargs):
+        """Paths of the feature classes matching `find`'s filters."""
+        return [record["path"] for record in self.find(workspace, **kwargs)]
+
+    def describe(self, path):
+        """The cached record of one feature class, or None."""
+        row = self._db.execute(f"SELECT {', '.join(_COLUMNS)} FROM feature_classes WHERE path=?",
+                               (os.path.abspath(path),)).fetchone()
+        return _record(row) if row is not None else None
+
+    def close(self):
+        """Close the SQLite connection."""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,342 @@
+"""
+Streaming KML/KMZ reader for bulk ingest of polygon (or point) Placemarks.
+
+Files are parsed with xml.etree.ElementTree.iterparse: each Placemark is
+turned into flat coordinate arrays plus its ExtendedData attributes as soon as
+its closing tag is read, then dropped from the tree, so memory stays constant
+however many Placemarks a file holds. KMZ archives are decompressed in memory
+while parsing (no temporary files). ingest_kml parses whole folders of files
+in a process pool and writes everything into one shapefile or geodatabase
+feature class, instead of one KMLToLayer geodatabase and layer per file.
+"""
+
+import contextlib
+import os
+import struct
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from xml.etree import ElementTree
+
+import numpy as np
+
+from polygon_set import PolygonSet
+from shapefile_writer import SHAPE_POINT, SHAPE_POLYGON, ShapefileWriter
+
+KML_EXTENSIONS = (".kml", ".kmz")
+WGS84_EPSG = 4326
+
+_CONTAINERS = ("kml", "Document", "Folder")
+_EMPTY = np.empty(0, dtype=np.float64)
+
+
+def _local(tag):
+    """Tag name without its XML namespace (KML 2.0, 2.1, 2.2 and gx all differ)."""
+    return tag.rsplit("}", 1)[-1]
+
+
+@contextlib.contextmanager
+def open_kml(path):
+    """Open a .kml file, or the main .kml document inside a .kmz, as a binary stream."""
+    if not zipfile.is_zipfile(path):
+        with open(path, "rb") as stream:
+            yield stream
+        return
+    with zipfile.ZipFile(path) as archive:
+        documents = [name for name in archive.namelist() if name.lower().endswith(".kml")]
+        if not documents:
+            raise ValueError(f"No .kml document inside {path}.")
+        # doc.kml by convention; otherwise the first .kml in the archive
+        main = next((name for name in documents if os.path.basename(name).lower() == "doc.kml"), documents[0])
+        with archive.open(main) as stream:
+            yield stream
+
+
+def parse_coordinates(text):
+    """
+    Parse a KML <coordinates> string ("lon,lat[,alt] lon,lat[,alt] ...").
+
+    Returns
+    -------
+    tuple of numpy.ndarray
+        Longitudes and latitudes; altitudes are dropped.
+    """
+    tuples = (text or "").split()
+    if not tuples:
+        return _EMPTY, _EMPTY
+    values = np.array(",".join(tuples).split(","), dtype=np.float64)
+    dims = len(values) // len(tuples)
+    if dims < 2 or dims * len(tuples) != len(values):
+        # Mixed 2D/3D tuples: fall back to parsing them one by one
+        values = np.array([t.split(",")[:2] for t in tuples], dtype=np.float64)
+        dims = 2
+    values = values.reshape(-1, dims)
+    return values[:, 0], values[:, 1]
+
+
+def _child_coordinates(element):
+    for child in element.iter():
+        if _local(child.tag) == "coordinates":
+            return parse_coordinates(child.text)
+    return _EMPTY, _EMPTY
+
+
+def _placemark_record(placemark):
+    """Flatten one Placemark element into a record dict (see iter_placemarks)."""
+    name = None
+    attributes = {}
+    parts = {"Polygon": [], "Polyline": [], "Point": []}  # (x, y, is_exterior) per ring / line / point
+
+    for element in placemark.iter():
+        tag = _local(element.tag)
+        if tag == "name" and name is None:
+            name = (element.text or "").strip()
+        elif tag == "Data":
+            value = next((child.text for child in element if _local(child.tag) == "value"), None)
+            attributes[element.get("name")] = value
+        elif tag == "SimpleData":
+            attributes[element.get("name")] = element.text
+        elif tag == "Polygon":
+            outer, inner = [], []
+            for boundary in element:
+                boundary_tag = _local(boundary.tag)
+                if boundary_tag == "outerBoundaryIs":
+                    outer.append(_child_coordinates(boundary))
+                elif boundary_tag == "innerBoundaryIs":
+                    inner.extend(parse_coordinates(c.text) for c in boundary.iter() if _local(c.tag) == "coordinates")
+            parts["Polygon"] += [(x, y, True) for x, y in outer] + [(x, y, False) for x, y in inner]
+        elif tag == "LineString":
+            parts["Polyline"].append((*_child_coordinates(element), True))
+        elif tag == "Point":
+            parts["Point"].append((*_child_coordinates(element), True))
+
+    # Mixed MultiGeometry keeps the highest dimension only
+    geometry = next((kind for kind in ("Polygon", "Polyline", "Point") if parts[kind]), None)
+    rings = [part for part in parts[geometry] if len(part[0])] if geometry else []
+    counts = [len(x) for x, _, _ in rings]
+    return {
+        "name": name,
+        "geometry": geometry if rings else None,
+        "x": np.concatenate([x for x, _, _ in rings]) if rings else _EMPTY,
+        "y": np.concatenate([y for _, y, _ in rings]) if rings else _EMPTY,
+        "offsets": np.concatenate([[0], np.cumsum(counts)]).astype(np.intp),
+        "exteriors": np.array([exterior for _, _, exterior in rings], dtype=bool),
+        "attributes": attributes,
+    }
+
+
+def iter_placemarks(path):
+    """
+    Yield the Placemarks of a KML or KMZ file one at a time.
+
+    Parameters
+    ----------
+    path : str
+        .kml or .kmz file.
+
+    Yields
+    ------
+    dict
+        "name", "geometry" ("Polygon", "Polyline", "Point" or None when the
+        Placemark has no coordinates), flat "x"/"y" longitude/latitude arrays,
+        "offsets" (start of each ring/line/point, plus the total), "exteriors"
+        (per ring: outer boundary or hole) and "attributes" (ExtendedData
+        Data/SimpleData values, as text).
+    """
+    with open_kml(path) as stream:
+        stack = []
+        for event, element in ElementTree.iterparse(stream, events=("start", "end")):
+            if event == "start":
+                stack.append(element)
+                continue
+            stack.pop()
+            if _local(element.tag) == "Placemark":
+                yield _placemark_record(element)
+            # Drop finished elements from their container so the tree never grows
+            if stack and _local(stack[-1].tag) in _CONTAINERS and _local(element.tag) not in _CONTAINERS:
+                stack[-1].remove(element)
+                element.clear()
+
+
+def find_kml_files(root, extensions=KML_EXTENSIONS):
+    """Yield every KML/KMZ file under a folder tree, in sorted order."""
+    for folder, subfolders, files in os.walk(root):
+        subfolders.sort()
+        for name in sorted(files):
+            if name.lower().endswith(extensions):
+                yield os.path.join(folder, name)
+
+
+def read_kml_batch(path, geometry="Polygon"):
+    """
+    Parse one file into a compact batch for ingest_kml.
+
+    Placemarks of other geometry types are counted in "skipped". Parse errors
+    are returned in "error" rather than raised, so one bad file does not stop
+    a bulk ingest.
+    """
+    batch = {"path": path, "records": [], "skipped": 0, "error": None}
+    try:
+        for record in iter_placemarks(path):
+            if record["geometry"] != geometry:
+                batch["skipped"] += 1
+                continue
+            if geometry == "Point":
+                record.update(x=record["x"][:1], y=record["y"][:1], offsets=record["offsets"][:2],
+                              exteriors=record["exteriors"][:1])
+            batch["records"].append(record)
+    except (ElementTree.ParseError, zipfile.BadZipFile, ValueError, OSError) as e:
+        batch["error"] = str(e) or type(e).__name__
+    return batch
+
+
+def _polygon_set(records):
+    """One PolygonSet holding the rings of a batch of polygon records, in record order."""
+    ring_counts = np.concatenate([np.diff(record["offsets"]) for record in records])
+    polygon_counts = [len(record["offsets"]) - 1 for record in records]
+    return PolygonSet(np.concatenate([record["x"] for record in records]),
+                      np.concatenate([record["y"] for record in records]),
+                      np.concatenate([[0], np.cumsum(ring_counts)]), np.concatenate([[0], np.cumsum(polygon_counts)]))
+
+
+class _ShapefileOutput:
+    def __init__(self, path, geometry, columns):
+        fields = [(column, "C", 254, 0) for column in columns]
+        shape_type = SHAPE_POLYGON if geometry == "Polygon" else SHAPE_POINT
+        self.geometry = geometry
+        self.columns = columns
+        self.writer = ShapefileWriter(path, fields, shape_type, epsg=WGS84_EPSG)
+
+    def write(self, records):
+        if self.geometry == "Point":
+            for record in records:
+                self.writer.add_point(record["x"][0], record["y"][0], record["attributes"])
+        elif all(len(record["offsets"]) == 2 for record in records):
+            # Single-ring parcels (the usual case) go through the vectorized writer
+            counts = [len(record["x"]) for record in records]
+            offsets = np.concatenate([[0], np.cumsum(counts)])
+            columns = {key: [record["attributes"].get(key) for record in records] for key in self.columns}
+            self.writer.add_polygons(np.concatenate([record["x"] for record in records]),
+                                     np.concatenate([record["y"] for record in records]), offsets, columns)
+        else:
+            for record in records:
+                x, y, offsets = record["x"], record["y"], record["offsets"]
+                rings = [np.column_stack([x[a:b], y[a:b]]) for a, b in zip(offsets[:-1], offsets[1:])]
+                self.writer.add_polygon(rings, record["attributes"], record["exteriors"])
+
+    def close(self):
+        self.writer.close()
+
+
+class _FeatureClassOutput:
+    def __init__(self, path, geometry, columns):
+        from arcpy_backend import arcpy
+        from projection_cache import spatial_reference
+
+        workspace, name = os.path.split(path)
+        if arcpy.Exists(path):
+            arcpy.management.Delete(path)
+        arcpy.management.CreateFeatureclass(workspace, name, geometry.upper(),
+                                            spatial_reference=spatial_reference(WGS84_EPSG))
+        self.keys, field_names = [], []
+        for column in columns:
+            field_name = arcpy.ValidateFieldName(column, workspace)
+            unique, suffix = field_name, 0
+            while unique.lower() in {name.lower() for name in field_names}:
+                suffix += 1
+                unique = f"{field_name}_{suffix}"
+            self.keys.append(column)
+            field_names.append(unique)
+        if field_names:
+            arcpy.management.AddFields(path, [[field_name, "TEXT", column, 255]
+                                              for field_name, column in zip(field_names, columns)])
+        self.geometry = geometry
+        self.cursor = arcpy.da.InsertCursor(path, ["SHAPE@WKB"] + field_names)
+
+    def write(self, records):
+        if self.geometry == "Point":
+            shapes = (struct.pack("<BIdd", 1, 1, record["x"][0], record["y"][0]) for record in records)
+        else:
+            shapes = _polygon_set(records).to_wkb(np.concatenate([record["exteriors"] for record in records]))
+        for shape, record in zip(shapes, records):
+            attributes = record["attributes"]
+            self.cursor.insertRow([shape] + [None if attributes.get(key) is None else str(attributes[key])[:255]
+                                             for key in self.keys])
+
+    def close(self):
+        del self.cursor
+
+
+def ingest_kml(inputs, output, geometry="Polygon", columns=None, source_field="source", max_workers=4):
+    """
+    Parse many KML/KMZ files into one consolidated shapefile or feature class.
+
+    Parameters
+    ----------
+    inputs : str or list of str
+        A folder (searched recursively for .kml/.kmz) or a list of files.
+    output : str
+        Output .shp path, or a feature class path inside a geodatabase
+        (requires arcpy).
+    geometry : str, optional
+        "Polygon" (default) or "Point"; Placemarks of other types are skipped.
+    columns : list of str, optional
+        Attribute columns to write (all text). Defaults to "Name" plus the
+        ExtendedData names found in the first file that has features.
+    source_field : str, optional
+        Extra column receiving each feature's file name; None to omit.
+    max_workers : int, optional
+        Processes parsing files concurrently (default 4). Only a few parsed
+        files are held at a time and they are written in input order.
+
+    Returns
+    -------
+    dict
+        "files", "features", "skipped" and "errors" (list of (path, message)).
+    """
+    if geometry not in ("Polygon", "Point"):
+        raise ValueError("Only Polygon and Point geometries can be ingested.")
+    paths = list(find_kml_files(inputs)) if isinstance(inputs, str) else list(inputs)
+    summary = {"files": len(paths), "features": 0, "skipped": 0, "errors": []}
+    sink = None
+
+    def consume(batch):
+        nonlocal sink
+        summary["skipped"] += batch["skipped"]
+        if batch["error"]:
+            summary["errors"].append((batch["path"], batch["error"]))
+        records = batch["records"]
+        if not records:
+            return
+        for record in records:
+            record["attributes"]["Name"] = record["name"]
+            if source_field:
+                record["attributes"][source_field] = os.path.basename(batch["path"])
+        if sink is None:
+            names = columns
+            if names is None:
+                names = ["Name"] + [key for key in dict.fromkeys(k for r in records for k in r["attributes"])
+                                    if key not in ("Name", source_field)]
+                names += [source_field] if source_field else []
+            output_class = _ShapefileOutput if output.lower().endswith(".shp") else _FeatureClassOutput
+            sink = output_class(output, geometry, names)
+        sink.write(records)
+        summary["features"] += len(records)
+
+    try:
+        if max_workers <= 1:
+            for path in paths:
+                consume(read_kml_batch(path, geometry))
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                pending = deque()
+                for path in paths:
+                    pending.append(executor.submit(read_kml_batch, path, geometry))
+                    if len(pending) >= 2 * max_workers:  # bounded look-ahead keeps memory flat
+                        consume(pending.popleft().result())
+                while pending:
+                    consume(pending.popleft().result())
+    finally:
+        if sink is not None:
+            sink.close()
+    return summary
@@ -0,0 +1,147 @@
+import io
+import os
+import zipfile
+
+import numpy as np
+
+KML_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<kml xmlns="http://www.opengis.net/kml/2.2">\n'
+    "<Document>\n"
+)
+KML_FOOTER = "</Document>\n</kml>\n"
+
+# str.translate is several times faster than xml.sax.saxutils.escape per call.
+_XML_ESCAPES = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;"})
+
+
+def escape(text):
+    """Escape text for use in XML character data or a double-quoted attribute."""
+    return str(text).translate(_XML_ESCAPES)
+
+
+def format_coordinates(lon, lat, precision=8):
+    """
+    Format one ring as a KML <coordinates> string ("lon,lat lon,lat ...").
+
+    The ring is closed if needed, since KML requires the first and last
+    positions of a LinearRing to be equal.
+    """
+    lon = np.asarray(lon, dtype=np.float64).tolist()
+    lat = np.asarray(lat, dtype=np.float64).tolist()
+    if lon and (lon[0] != lon[-1] or lat[0] != lat[-1]):
+        lon.append(lon[0])
+        lat.append(lat[0])
+    pair = f"{{:.{precision}f}},{{:.{precision}f}}".format
+    return " ".join(map(pair, lon, lat))
+
+
+class KMLWriter:
+    """
+    Incremental KML/KMZ writer for polygon Placemarks.
+
+    Placemarks are streamed straight to disk as they are added, so memory use
+    does not grow with the number of polygons. A path ending in ".kmz" writes
+    a zipped KMZ (a single doc.kml entry, compressed on the fly).
+
+    Parameters
+    ----------
+    path : str
+        Output .kml or .kmz file path.
+    document_name : str, optional
+        <name> of the KML Document (defaults to the file name without extension).
+    line_color, fill_color : str, optional
+        Style colors in KML's aabbggrr hex notation.
+    line_width : float, optional
+        Outline width in pixels.
+    precision : int, optional
+        Decimal places written for longitude/latitude (8 ≈ 1 mm).
+
+    Examples
+    --------
+    >>> with KMLWriter("parcels.kmz") as kml:
+    ...     kml.add_polygon("Parcel 1", [(lon, lat)], {"owner": "Cedeño"})
+    """
+
+    def __init__(self, path, document_name=None, line_color="ff0000ff", fill_color="4d0000ff",
+                 line_width=2, precision=8):
+        self.path = path
+        self.precision = precision
+        self.features_written = 0
+
+        folder = os.path.dirname(os.path.abspath(path))
+        if not os.path.exists(folder):
+            os.makedirs(folder)
+
+        self._zip = None
+        if path.lower().endswith(".kmz"):
+            self._zip = zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED)
+            raw = self._zip.open("doc.kml", "w", force_zip64=True)
+        else:
+            raw = open(path, "wb")
+        self._out = io.TextIOWrapper(io.BufferedWriter(raw, buffer_size=1 << 20), encoding="utf-8")
+
+        if document_name is None:
+            document_name = os.path.splitext(os.path.basename(path))[0]
+        self._out.write(KML_HEADER)
+        self._out.write(f"<name>{escape(document_name)}</name>\n")
+        self._out.write(
+            '<Style id="polygonStyle">'
+            f"<LineStyle><color>{line_color}</color><width>{line_width}</width></LineStyle>"
+            f"<PolyStyle><color>{fill_color}</color></PolyStyle>"
+            "</Style>\n"
+        )
+
+    def add_polygon(self, name, rings, attributes=None, description=None):
+        """
+        Write one polygon Placemark.
+
+        Parameters
+        ----------
+        name : str
+            Placemark name.
+        rings : list of (lon, lat)
+            WGS 84 rings as coordinate arrays. The first ring is the outer
+            boundary; any further rings are holes.
+        attributes : dict, optional
+            Written as <ExtendedData> name/value pairs.
+        description : str, optional
+            Placemark description.
+        """
+        parts = [f"<Placemark><name>{escape(name)}</name>"]
+        if description:
+            parts.append(f"<description>{escape(description)}</description>")
+        parts.append("<styleUrl>#polygonStyle</styleUrl>")
+        if attributes:
+            parts.append("<ExtendedData>")
+            for key, value in attributes.items():
+                value = "" if value is None else escape(value)
+                parts.append(f'<Data name="{escape(key)}"><value>{value}</value></Data>')
+            parts.append("</ExtendedData>")
+
+        parts.append("<Polygon>")
+        for i, (lon, lat) in enumerate(rings):
+            boundary = "outerBoundaryIs" if i == 0 else "innerBoundaryIs"
+            coordinates = format_coordinates(lon, lat, self.precision)
+            parts.append(f"<{boundary}><LinearRing><coordinates>{coordinates}</coordinates></LinearRing></{boundary}>")
+        parts.append("</Polygon></Placemark>\n")
+
+        self._out.write("".join(parts))
+        self.features_written += 1
+
+    def close(self):
+        """Write the closing tags and release the file (and zip archive, for KMZ)."""
+        if self._out is None:
+            return
+        self._out.write(KML_FOOTER)
+        self._out.close()
+        self._out = None
+        if self._zip is not None:
+            self._zip.close()
+            self._zip = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
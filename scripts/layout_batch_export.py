@@ -0,0 +1,287 @@
+"""
+Batch layout export: render one layout page per area of interest (carta, parcel, ...).
+
+The project is opened once per process and the layout, map frame and text
+elements are looked up once and cached by name, so each page only pays for
+moving the camera, updating the text and exporting. Pages can be spread over
+several worker processes, each rendering from its own copy of the project, and
+the resulting PDFs merged into a single atlas.
+"""
+
+import csv
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from arcpy_backend import arcpy
+
+
+def pages_from_feature_class(feature_class, title_field, name_field=None, margin=0.05, where_clause=None):
+    """
+    Build the page list for export_layout_batch from the features of a layer or feature class.
+
+    Parameters
+    ----------
+    feature_class : str
+        Polygon feature class or layer; one page per feature.
+    title_field : str
+        Field holding the page title.
+    name_field : str, optional
+        Field used for the output file names (defaults to the title field).
+    margin : float, optional
+        Fraction of the feature's width/height added around it (default 5 %).
+    where_clause : str, optional
+        SQL filter applied to the features.
+
+    Returns
+    -------
+    list of dict
+        Pages with "name", "title", "extent" (xmin, ymin, xmax, ymax) and
+        "spatial_reference" (the feature class spatial reference).
+    """
+    spatial_reference = arcpy.Describe(feature_class).spatialReference
+    fields = ["SHAPE@", title_field] + ([name_field] if name_field else [])
+    pages = []
+    with arcpy.da.SearchCursor(feature_class, fields, where_clause) as cursor:
+        for row in cursor:
+            extent = row[0].extent
+            dx = (extent.XMax - extent.XMin) * margin
+            dy = (extent.YMax - extent.YMin) * margin
+            pages.append({
+                "name": str(row[2] if name_field else row[1]),
+                "title": str(row[1]),
+                "extent": (extent.XMin - dx, extent.YMin - dy, extent.XMax + dx, extent.YMax + dy),
+                "spatial_reference": spatial_reference,
+            })
+    return pages
+
+
+def safe_file_name(name):
+    """Replace characters that are not valid in Windows file names."""
+    return "".join("_" if c in '<>:"/\\|?*' else c for c in str(name)).strip() or "page"
+
+
+class LayoutExporter:
+    """
+    An open project with its layout, map frame and text elements resolved once.
+
+    Parameters
+    ----------
+    aprx_path : str
+        Path to the ArcGIS Pro project (.aprx).
+    layout_name : str
+        Name of the layout to export.
+    map_frame_name : str
+        Name of the map frame whose camera is moved for each page.
+    title_element : str, optional
+        Name of the text element that receives each page's title.
+    """
+
+    def __init__(self, aprx_path, layout_name, map_frame_name, title_element=None):
+        self.project = arcpy.mp.ArcGISProject(aprx_path)
+
+        layouts = self.project.listLayouts(layout_name)
+        if not layouts:
+            raise ValueError(f"Layout '{layout_name}' not found in {aprx_path}.")
+        self.layout = layouts[0]
+
+        # One listElements call; every later lookup is a dict access
+        self.elements = {}
+        for element in self.layout.listElements():
+            self.elements.setdefault(element.name, element)
+
+        self.map_frame = self.elements.get(map_frame_name)
+        if self.map_frame is None or self.map_frame.type != "MAPFRAME_ELEMENT":
+            raise ValueError(f"Map frame '{map_frame_name}' not found in layout '{layout_name}'.")
+        if title_element is not None and title_element not in self.elements:
+            raise ValueError(f"Text element '{title_element}' not found in layout '{layout_name}'.")
+        self.title_element = title_element
+        self._spatial_references = {}
+
+    def _spatial_reference(self, value):
+        """Accept a SpatialReference or its exportToString() form (parsed once per string)."""
+        if not isinstance(value, str):
+            return value
+        if value not in self._spatial_references:
+            spatial_reference = arcpy.SpatialReference()
+            spatial_reference.loadFromString(value)
+            self._spatial_references[value] = spatial_reference
+        return self._spatial_references[value]
+
+    def export_page(self, page, output_path, resolution=300):
+        """
+        Move the camera to a page's extent, update its text and export it to PDF.
+
+        Parameters
+        ----------
+        page : dict
+            "extent" (xmin, ymin, xmax, ymax), optionally "spatial_reference"
+            (object or exportToString() form), "title" and "text" (a dict of element name -> text).
+        output_path : str
+            PDF file to write.
+        resolution : int, optional
+            Export resolution in dpi.
+
+        Returns
+        -------
+        float
+            Seconds spent on the page.
+        """
+        start = time.perf_counter()
+        xmin, ymin, xmax, ymax = page["extent"]
+        extent = arcpy.Extent(xmin, ymin, xmax, ymax)
+        if page.get("spatial_reference") is not None:
+            extent.spatialReference = self._spatial_reference(page["spatial_reference"])
+        self.map_frame.camera.setExtent(extent)
+
+        text = dict(page.get("text") or {})
+        if self.title_element is not None and "title" in page:
+            text[self.title_element] = page["title"]
+        for element_name, value in text.items():
+            self.elements[element_name].text = value
+
+        self.layout.exportToPDF(output_path, resolution=resolution)
+        return time.perf_counter() - start
+
+    def close(self):
+        """Release the project."""
+        del self.project
+
+
+def _page_result(index, page, output, seconds, error=""):
+    return {"index": index, "name": page.get("name"), "output": output, "seconds": seconds,
+            "success": not error, "error": error, "worker": os.getpid()}
+
+
+def _export_pages(aprx_path, layout_name, map_frame_name, title_element, shard, output_folder, resolution):
+    """Export a list of (index, page) pairs from the project at aprx_path; failures are recorded per page."""
+    try:
+        exporter = LayoutExporter(aprx_path, layout_name, map_frame_name, title_element)
+    except Exception as e:
+        return [_page_result(index, page, None, 0.0, f"Could not open the layout: {e}") for index, page in shard]
+
+    results = []
+    try:
+        for index, page in shard:
+            output_path = os.path.join(output_folder, f"{index + 1:04d}_{safe_file_name(page.get('name') or index + 1)}.pdf")
+            try:
+                results.append(_page_result(index, page, output_path, exporter.export_page(page, output_path, resolution)))
+            except Exception as e:
+                results.append(_page_result(index, page, None, 0.0, str(e)))
+    finally:
+        exporter.close()
+    return results
+
+
+def _export_shard(aprx_path, layout_name, map_frame_name, title_element, shard, output_folder, resolution):
+    """Export a list of (index, page) pairs from a private copy of the project (worker processes)."""
+    worker_dir = tempfile.mkdtemp(prefix="layout_export_")
+    try:
+        copy_path = os.path.join(worker_dir, os.path.basename(aprx_path))
+        try:
+            arcpy.mp.ArcGISProject(aprx_path).saveACopy(copy_path)  # saveACopy keeps data sources resolvable
+        except Exception as e:
+            return [_page_result(index, page, None, 0.0, f"Could not copy the project: {e}") for index, page in shard]
+        return _export_pages(copy_path, layout_name, map_frame_name, title_element, shard, output_folder, resolution)
+    finally:
+        shutil.rmtree(worker_dir, ignore_errors=True)
+
+
+def export_layout_batch(aprx_path, pages, output_folder, layout_name="MiLayout", map_frame_name="MarcoMapaPrincipal",
+                        title_element="TituloDinamico", resolution=300, max_workers=1, merged_pdf=None,
+                        log_path=None):
+    """
+    Export one layout page per entry of `pages`, optionally in parallel and merged into one PDF.
+
+    Parameters
+    ----------
+    aprx_path : str
+        ArcGIS Pro project (.aprx). "CURRENT" only works with max_workers=1,
+        since worker processes have to open the project themselves.
+    pages : list of dict
+        Pages as returned by pages_from_feature_class: "extent" is required;
+        "name", "title", "text" and "spatial_reference" are optional.
+    output_folder : str
+        Folder for the per-page PDFs ("0001_<name>.pdf", ...).
+    layout_name, map_frame_name, title_element : str, optional
+        Names of the layout, its map frame and the title text element.
+    resolution : int, optional
+        Export resolution in dpi (default 300).
+    max_workers : int, optional
+        Worker processes; pages are dealt round-robin, one project copy per
+        worker. 1 (default) exports in this process from the project itself,
+        without copying it.
+    merged_pdf : str, optional
+        If given, all pages are appended, in page order, into this PDF.
+    log_path : str, optional
+        CSV file receiving one timing row per page.
+
+    Returns
+    -------
+    list of dict
+        One entry per page, in page order, with "index", "name", "output",
+        "seconds", "success", "error" and "worker". Errors (including a worker
+        that could not open the project or died) are reported per page rather
+        than raised, and the log is written either way.
+    """
+    if not os.path.exists(output_folder):
+        os.makedirs(output_folder)
+    if max_workers > 1:
+        # arcpy.SpatialReference objects cannot be pickled; workers receive their string form
+        pages = [dict(page, spatial_reference=page["spatial_reference"].exportToString())
+                 if hasattr(page.get("spatial_reference"), "exportToString") else page for page in pages]
+
+    indexed = list(enumerate(pages))
+    args = (aprx_path, layout_name, map_frame_name, title_element)
+    start = time.perf_counter()
+
+    if max_workers <= 1:
+        results = _export_pages(*args, indexed, output_folder, resolution)
+    else:
+        shards = [indexed[i::max_workers] for i in range(max_workers) if indexed[i::max_workers]]
+        results = []
+        with ProcessPoolExecutor(max_workers=len(shards)) as executor:
+            futures = [executor.submit(_export_shard, *args, shard, output_folder, resolution) for shard in shards]
+            for future, shard in zip(futures, shards):
+                try:
+                    results.extend(future.result())
+                except Exception as e:  # the worker itself failed (e.g. it crashed): every page of its shard did
+                    results.extend(dict(_page_result(index, page, None, 0.0, f"Worker failed: {e!r}"), worker=None)
+                                   for index, page in shard)
+    results.sort(key=lambda result: result["index"])
+    elapsed = time.perf_counter() - start
+
+    if log_path:
+        with open(log_path, "w", newline="", encoding="utf-8") as log:
+            writer = csv.DictWriter(log, fieldnames=["index", "name", "worker", "seconds", "success", "output", "error"])
+            writer.writeheader()
+            for result in results:
+                writer.writerow(dict({key: result[key] for key in writer.fieldnames}, seconds=f"{result['seconds']:.3f}"))
+
+    if merged_pdf:
+        if os.path.exists(merged_pdf):
+            os.remove(merged_pdf)
+        atlas = arcpy.mp.PDFDocumentCreate(merged_pdf)
+        for result in results:
+            if result["success"]:
+                atlas.appendPages(result["output"])
+        atlas.saveAndClose()
+
+    succeeded = sum(result["success"] for result in results)
+    print(f"Exported {succeeded}/{len(results)} pages in {elapsed:.1f} s"
+          + (f"; merged into {merged_pdf}" if merged_pdf else ""))
+    return results
+
+
+if __name__ == "__main__":
+    cartas_pages = pages_from_feature_class(r"cartas.gdb\Cartas", title_field="name")
+    export_layout_batch(
+        r"project.aprx",
+        cartas_pages,
+        output_folder=r"atlas",
+        max_workers=4,
+        merged_pdf=r"atlas\atlas.pdf",
+        log_path=r"atlas\export_log.csv",
+    )
@@ -1,5 +1,16 @@
-import arcpy
+import contextlib
+import io
 import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from arcpy_backend import arcpy
+from shapefile_writer import ShapefileWriter, infer_fields
+from sort_utm_clockwise import clockwise_ring_order
 
 '''
 arcpy.conversion.FeatureClassToShapefile(
@@ -64,8 +75,19 @@ arcpy.conversion.FeaturesToJSON(
 )
 '''
 
-def process_points_to_polygon(input_point_feature, output_gdb, output_folder):
+def output_base_name(input_point_feature):
     """
+    Base name used for the outputs derived from a point feature ("Hoja1$Event" → "Hoja1Event").
+
+    Only the last path component is used, so dataset paths do not leak
+    directories into the output names.
+    """
+    name = os.path.basename(os.path.normpath(input_point_feature))
+    return name.replace('$', '').replace(' ', '_')
+
+
+def process_points_to_polygon(input_point_feature, output_gdb, output_folder):
+    r"""
     Converts point features to lines and then to polygons, finally exporting the polygon to a shapefile.
 
     This function takes a point feature layer, converts it to a line feature class,
@@ -102,7 +124,7 @@ def process_points_to_polygon(input_point_feature, output_gdb, output_folder):
     """
     try:
         # --- Points to Line ---
-        line_feature_class_name = f"{input_point_feature.replace('$','').replace(' ', '_')}_PointsToLine" # Generate output line feature class name
+        line_feature_class_name = f"{output_base_name(input_point_feature)}_PointsToLine" # Generate output line feature class name
         output_line_feature_class = os.path.join(output_gdb, line_feature_class_name)
 
         print(f"Starting Points To Line conversion for: {input_point_feature}")
@@ -119,7 +141,7 @@ def process_points_to_polygon(input_point_feature, output_gdb, output_folder):
         print(f"Points to Line conversion completed. Output: {output_line_feature_class}")
 
         # --- Feature to Polygon ---
-        polygon_feature_class_name = f"{input_point_feature.replace('$','').replace(' ', '_')}_Polygon" # Generate output polygon feature class name
+        polygon_feature_class_name = f"{output_base_name(input_point_feature)}_Polygon" # Generate output polygon feature class name
         output_polygon_feature_class = os.path.join(output_gdb, polygon_feature_class_name)
 
         print(f"Starting Feature To Polygon conversion for: {line_feature_class_name}")
@@ -155,24 +177,284 @@ def process_points_to_polygon(input_point_feature, output_gdb, output_folder):
         print(e)
         return False
 
+
+def group_points_into_rings(x, y, line_ids=None, sort_values=None):
+    """
+    Groups ordered vertex rows into rings, the way PointsToLine groups them into lines.
+
+    Points are grouped by their line ID (all points form one ring when no IDs
+    are given) and ordered by the sort values, falling back to the row order,
+    with a single stable sort over all rows.
+
+    Parameters:
+        x, y (array_like): Point coordinates, in row order.
+        line_ids (sequence, optional): Line/ring ID of every point.
+        sort_values (array_like, optional): Vertex order within each ring.
+
+    Returns:
+        tuple: (x, y, offsets, ids). Ring i occupies x[offsets[i]:offsets[i + 1]];
+               ids holds the line ID of every ring, in order of first appearance.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    if line_ids is None:
+        ids = [None] if len(x) else []
+        codes = np.zeros(len(x), dtype=np.intp)
+    else:
+        lookup = {}
+        codes = np.fromiter((lookup.setdefault(value, len(lookup)) for value in line_ids), dtype=np.intp, count=len(x))
+        ids = list(lookup)
+
+    if sort_values is None:
+        order = np.argsort(codes, kind="stable")
+    else:
+        order = np.lexsort((np.asarray(sort_values), codes))
+
+    offsets = np.concatenate([[0], np.cumsum(np.bincount(codes, minlength=len(ids)))]).astype(np.intp)
+    return x[order], y[order], offsets, ids
+
+
+def points_to_polygon_direct(input_point_feature, output_folder, line_field=None, sort_field=None, clockwise_sort=False):
+    r"""
+    Converts ordered point rows straight to a polygon shapefile, without intermediate feature classes.
+
+    Equivalent to the PointsToLine (CLOSE) → FeatureToPolygon → FeatureClassToShapefile
+    chain of process_points_to_polygon for ordered vertex tables such as the "Hoja1$Event"
+    Excel sheets: the points are read once, grouped into rings in memory, closed and
+    oriented, and written by the streaming shapefile writer. Nothing is written to a
+    geodatabase, which saves two disk round-trips per input.
+
+    Unlike FeatureToPolygon, rings are not planarized: each group of points must
+    describe a simple (non self-intersecting) ring.
+
+    Parameters:
+        input_point_feature (str): The input point feature layer, table view or feature class.
+                                     Example: "Hoja1$Event" or r"C:\path\to\your.gdb\PointFeatureClass"
+        output_folder (str): The folder where the shapefile is written.
+        line_field (str, optional): Field whose values identify the ring of each point, like
+                                    PointsToLine's Line_Field. All points form one ring if omitted.
+        sort_field (str, optional): Field that orders the vertices of each ring, like PointsToLine's
+                                    Sort_Field. Rows are used in table order if omitted.
+        clockwise_sort (bool, optional): Reorder every ring's vertices clockwise around its centroid,
+                                         for tables whose points are not stored in boundary order.
+
+    Returns:
+        bool: True if the process completes successfully, False otherwise.
+              Prints informative messages to the console, like process_points_to_polygon.
+
+    Example:
+        >>> points_to_polygon_direct("Hoja1$Event", r"C:\Users\user\Desktop\OutputShapefiles")
+        True
+    """
+    try:
+        fields = ["SHAPE@X", "SHAPE@Y"] + [f for f in (line_field, sort_field) if f]
+        output_shapefile_path = os.path.join(output_folder, f"{output_base_name(input_point_feature)}_Polygon.shp")
+
+        print(f"Reading points from: {input_point_feature}")
+        rows = arcpy.da.FeatureClassToNumPyArray(input_point_feature, fields)
+        spatial_reference = arcpy.Describe(input_point_feature).spatialReference
+
+        x, y, offsets, ids = group_points_into_rings(
+            rows["SHAPE@X"], rows["SHAPE@Y"],
+            line_ids=rows[line_field].tolist() if line_field else None,
+            sort_values=rows[sort_field] if sort_field else None,
+        )
+        if clockwise_sort:
+            order = clockwise_ring_order(x, y, offsets)
+            x, y = x[order], y[order]
+
+        # Rings with fewer than 3 points cannot form a polygon (FeatureToPolygon drops them too)
+        counts = np.diff(offsets)
+        keep = counts >= 3
+        if not keep.all():
+            print(f"Skipping {int((~keep).sum())} ring(s) with fewer than 3 points.")
+            x = x[np.repeat(keep, counts)]
+            y = y[np.repeat(keep, counts)]
+            offsets = np.concatenate([[0], np.cumsum(counts[keep])])
+            ids = [ring_id for ring_id, kept in zip(ids, keep) if kept]
+
+        # exportToString appends the XY/Z/M domains after the WKT, separated by ";"
+        wkt = None
+        if spatial_reference is not None and spatial_reference.name != "Unknown":
+            wkt = spatial_reference.exportToString().split(";")[0]
+
+        shapefile_fields = infer_fields({line_field: ids[0]}) if line_field and ids else []
+        attributes = {line_field: ids} if line_field else None
+
+        print(f"Writing {len(offsets) - 1} polygon(s) to: {output_shapefile_path}")
+        with ShapefileWriter(output_shapefile_path, shapefile_fields, wkt=wkt) as writer:
+            writer.add_polygons(x, y, offsets, attributes)
+        print(f"Direct points to polygon conversion completed. Output: {output_shapefile_path}")
+
+        return True
+
+    except arcpy.ExecuteError:
+        msgs = arcpy.GetMessages(2)
+        print(f"ArcGIS tool execution failed for input: {input_point_feature}")
+        print(msgs)
+        return False
+    except Exception as e:
+        print(f"An unexpected error occurred for input: {input_point_feature}")
+        print(e)
+        return False
+
+
+_worker_workspace = {}
+
+
+def _init_worker(scratch_root):
+    """Give each worker process its own scratch file geodatabase and staging folder."""
+    worker_dir = tempfile.mkdtemp(prefix=f"points_to_polygon_{os.getpid()}_", dir=scratch_root)
+    arcpy.management.CreateFileGDB(worker_dir, "scratch.gdb")
+
+    _worker_workspace["gdb"] = os.path.join(worker_dir, "scratch.gdb")
+    _worker_workspace["staging"] = os.path.join(worker_dir, "shapefiles")
+    os.makedirs(_worker_workspace["staging"])
+
+    arcpy.env.scratchWorkspace = worker_dir
+    arcpy.env.overwriteOutput = True
+
+
+def _process_in_worker(input_point_feature, direct=False):
+    """Run one conversion inside a worker; console output is captured instead of interleaved."""
+    staging = _worker_workspace["staging"]
+    log = io.StringIO()
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(log):
+            if direct:
+                success = points_to_polygon_direct(input_point_feature, staging)
+            else:
+                success = process_points_to_polygon(input_point_feature, _worker_workspace["gdb"], staging)
+    except Exception as e:  # process_points_to_polygon reports its own errors; this is a last resort
+        print(e, file=log)
+        success = False
+
+    return {
+        "input": input_point_feature,
+        "success": success,
+        "seconds": time.perf_counter() - start,
+        "staged": os.path.join(staging, f"{output_base_name(input_point_feature)}_Polygon.shp"),
+        "log": log.getvalue(),
+        "worker": os.getpid(),
+    }
+
+
+def _merge_shapefile(staged_shp, output_folder):
+    """Move a staged shapefile and its sidecar files (.dbf, .shx, .prj, ...) into the output folder."""
+    os.makedirs(output_folder, exist_ok=True)
+    stem = os.path.splitext(os.path.basename(staged_shp))[0]
+    staging = os.path.dirname(staged_shp)
+    for filename in os.listdir(staging):
+        if os.path.splitext(filename)[0] == stem or filename.startswith(stem + ".shp."):
+            target = os.path.join(output_folder, filename)
+            if os.path.exists(target):
+                os.remove(target)
+            shutil.move(os.path.join(staging, filename), target)
+    return os.path.join(output_folder, stem + ".shp")
+
+
+def run_points_to_polygon_batch(input_features, output_folders, max_workers=None, scratch_root=None, direct=False):
+    r"""
+    Converts many independent point inputs to polygon shapefiles in parallel.
+
+    Inputs are distributed over a pool of worker processes. Every worker owns a
+    private scratch geodatabase and staging folder, so concurrent PointsToLine /
+    FeatureToPolygon runs never contend for the same geodatabase lock; finished
+    shapefiles are then moved into their target folders by the parent process.
+
+    Parameters:
+        input_features (list of str): Point datasets to convert. Each worker is a separate
+                                      Python process, so these must be dataset paths
+                                      (e.g. r"C:\data\survey.gdb\Hoja1_Event"), not layer names
+                                      from an open map.
+        output_folders (list of str): Destination folder for each input's shapefile.
+        max_workers (int, optional): Number of worker processes (default: number of CPUs).
+        scratch_root (str, optional): Folder for the per-worker scratch workspaces
+                                      (default: the system temporary folder).
+        direct (bool, optional): Use points_to_polygon_direct instead of the three-tool chain.
+
+    Returns:
+        list of dict: One entry per input, in input order, with keys "input", "success",
+                      "seconds", "output", "worker" and "log" (the captured console output).
+    """
+    if len(input_features) != len(output_folders):
+        raise ValueError("input_features and output_folders must have the same length.")
+
+    scratch_root = tempfile.mkdtemp(prefix="points_to_polygon_", dir=scratch_root)
+    results = [None] * len(input_features)
+
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(scratch_root,)) as executor:
+            futures = {executor.submit(_process_in_worker, feature, direct): i for i, feature in enumerate(input_features)}
+            for future in as_completed(futures):
+                i = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:  # e.g. a worker that could not start
+                    result = {"input": input_features[i], "success": False, "seconds": 0.0, "staged": None,
+                              "log": str(e), "worker": None}
+
+                result["output"] = None
+                if result["success"]:
+                    result["output"] = _merge_shapefile(result.pop("staged"), output_folders[i])
+                else:
+                    result.pop("staged")
+                results[i] = result
+    finally:
+        shutil.rmtree(scratch_root, ignore_errors=True)
+
+    return results
+
+
+def format_batch_report(results):
+    """Render run_points_to_polygon_batch results as a plain-text success/failure table."""
+    headers = ("Input", "Status", "Seconds", "Output")
+    rows = [
+        (r["input"], "OK" if r["success"] else "FAILED", f"{r['seconds']:.1f}", r["output"] or "-")
+        for r in results
+    ]
+    widths = [max(len(str(row[i])) for row in rows + [headers]) for i in range(len(headers))]
+
+    def render(row):
+        return "  ".join(str(cell).ljust(width) for cell, width in zip(row, widths)).rstrip()
+
+    lines = [render(headers), render(["-" * width for width in widths])]
+    lines += [render(row) for row in rows]
+
+    succeeded = sum(r["success"] for r in results)
+    total_seconds = sum(r["seconds"] for r in results)
+    lines.append(f"\n{succeeded}/{len(results)} inputs converted; {total_seconds:.1f} s of worker time.")
+
+    for r in results:
+        if not r["success"] and r["log"]:
+            lines.append(f"\n--- {r['input']} ---\n{r['log'].rstrip()}")
+    return "\n".join(lines)
+
+
 # Example of how to use the function with your provided inputs:
 if __name__ == '__main__':
     output_geodatabase = r"Default.gdb"
     base_output_folder = r"output_folder"
 
-    input_features_list = [
-        "Hoja1$Event",
-        "Hoja1$HonorioAbsalonGarcia"
-    ]
+    # Worker processes cannot see map layers (or XY event layers), so first turn
+    # each Excel sheet into a point feature class and pass its path
+    excel_sheets = {
+        "Hoja1_Event": r"survey.xlsx\Hoja1$",
+        "HonorioAbsalonGarcia": r"survey.xlsx\HonorioAbsalonGarcia$"
+    }
+    input_features_list = []
+    for name, sheet in excel_sheets.items():
+        point_feature_class = os.path.join(output_geodatabase, name)
+        arcpy.management.XYTableToPoint(sheet, point_feature_class, "X", "Y",  # Easting / northing columns
+                                        coordinate_system=arcpy.SpatialReference(32717))
+        input_features_list.append(point_feature_class)
 
     output_folders_list = [
         os.path.join(base_output_folder, "EVENT"), # Example folder name for Event
         os.path.join(base_output_folder, "folder")
     ]
 
-    for input_feature, output_folder_shp in zip(input_features_list, output_folders_list):
-        success = process_points_to_polygon(input_feature, output_geodatabase, output_folder_shp)
-        if success:
-            print(f"\nSuccessfully processed: {input_feature}")
-        else:
-            print(f"\nFailed to process: {input_feature}")
+    batch_results = run_points_to_polygon_batch(input_features_list, output_folders_list)
+    print(format_batch_report(batch_results))
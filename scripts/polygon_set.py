@@ -0,0 +1,341 @@
+"""
+Array-backed storage for many polygons.
+
+A PolygonSet keeps every vertex of every polygon in two contiguous float64
+buffers (x and y) plus two offset arrays: where each ring starts in the
+vertex buffers, and where each polygon starts in the ring list. A million
+vertices cost 16 MB instead of a million arcpy.Point objects, slicing a
+range of polygons shares the vertex buffers, and area, centroid and
+bounding-box computations are single NumPy passes over all polygons.
+arcpy geometries are only built at the write boundary (to_arcpy), from WKB,
+so no per-vertex Point objects are ever created.
+
+The layout is the one used by carta_index.read_polygon_arrays and
+sort_utm_clockwise.pack_rings: rings may be open or explicitly closed, and
+exteriors and holes are told apart by orientation (holes run opposite to
+the polygon's largest ring).
+"""
+
+import struct
+
+import numpy as np
+
+from carta_index import _next_vertex, read_polygon_arrays
+from sort_utm_clockwise import pack_rings
+from utm_projection import project
+
+
+class PolygonSet:
+    """
+    Many polygons stored as flat coordinate buffers and offset arrays.
+
+    Parameters
+    ----------
+    x, y : array_like
+        Vertex coordinates of all rings, concatenated.
+    ring_offsets : array_like
+        Start of each ring in x/y, with a trailing total (len(rings) + 1).
+    polygon_offsets : array_like, optional
+        First ring of each polygon, with a trailing total
+        (len(polygons) + 1). Defaults to one ring per polygon.
+
+    Examples
+    --------
+    >>> polygons = PolygonSet.from_coordinates([[(0, 0), (0, 10), (10, 10), (10, 0)]])
+    >>> polygons.area()
+    array([100.])
+    """
+
+    __slots__ = ("x", "y", "ring_offsets", "polygon_offsets")
+
+    def __init__(self, x, y, ring_offsets, polygon_offsets=None):
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        ring_offsets = np.asarray(ring_offsets, dtype=np.intp)
+        if polygon_offsets is None:
+            polygon_offsets = np.arange(len(ring_offsets), dtype=np.intp)
+        polygon_offsets = np.asarray(polygon_offsets, dtype=np.intp)
+
+        if x.shape != y.shape or x.ndim != 1:
+            raise ValueError("x and y must be one-dimensional arrays of the same length.")
+        for name, offsets, total in (("ring_offsets", ring_offsets, len(x)),
+                                     ("polygon_offsets", polygon_offsets, len(ring_offsets) - 1)):
+            if offsets.ndim != 1 or len(offsets) == 0 or offsets[0] != 0 or offsets[-1] != total:
+                raise ValueError(f"{name} must start at 0 and end at {total}.")
+            if np.any(np.diff(offsets) < 0):
+                raise ValueError(f"{name} must be non-decreasing.")
+
+        self.x = x
+        self.y = y
+        self.ring_offsets = ring_offsets
+        self.polygon_offsets = polygon_offsets
+
+    @classmethod
+    def from_coordinates(cls, polygons):
+        """
+        Build a set of single-ring polygons from coordinate lists.
+
+        Parameters
+        ----------
+        polygons : iterable
+            One sequence of (X, Y) pairs per polygon.
+        """
+        x, y, offsets = pack_rings(polygons)
+        return cls(x, y, offsets)
+
+    @classmethod
+    def from_rectangles(cls, bounds):
+        """
+        Build clockwise rectangles from (xmin, ymin, xmax, ymax) rows.
+
+        Vertices run xmin/ymin, xmin/ymax, xmax/ymax, xmax/ymin, the order
+        used for the carta sheets.
+        """
+        bounds = np.asarray(bounds, dtype=np.float64).reshape(-1, 4)
+        x = bounds[:, [0, 0, 2, 2]].ravel()
+        y = bounds[:, [1, 3, 3, 1]].ravel()
+        return cls(x, y, np.arange(len(bounds) + 1) * 4)
+
+    @classmethod
+    def from_feature_class(cls, feature_class, spatial_reference=None, where_clause=None):
+        """
+        Read a polygon feature class through SHAPE@WKB (see read_polygon_arrays).
+
+        Returns
+        -------
+        tuple(numpy.ndarray, PolygonSet)
+            The ObjectIDs and the polygons, in cursor order.
+        """
+        oids, x, y, ring_offsets, polygon_offsets = read_polygon_arrays(feature_class, spatial_reference, where_clause)
+        return oids, cls(x, y, ring_offsets, polygon_offsets)
+
+    def __len__(self):
+        return len(self.polygon_offsets) - 1
+
+    def __repr__(self):
+        return f"PolygonSet({len(self)} polygons, {self.n_rings} rings, {self.n_vertices} vertices)"
+
+    def __getitem__(self, index):
+        """
+        An int or a step-1 slice gives a view sharing the vertex buffers
+        (only the offsets are rebased); integer arrays and boolean masks copy.
+        """
+        if isinstance(index, (int, np.integer)):
+            position = int(index) + len(self) if index < 0 else int(index)
+            if not 0 <= position < len(self):
+                raise IndexError("PolygonSet index out of range.")
+            index = slice(position, position + 1)
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step == 1:
+                stop = max(start, stop)
+                first_ring, last_ring = self.polygon_offsets[start], self.polygon_offsets[stop]
+                first_vertex, last_vertex = self.ring_offsets[first_ring], self.ring_offsets[last_ring]
+                return PolygonSet(self.x[first_vertex:last_vertex], self.y[first_vertex:last_vertex],
+                                  self.ring_offsets[first_ring:last_ring + 1] - first_vertex,
+                                  self.polygon_offsets[start:stop + 1] - first_ring)
+            index = np.arange(start, stop, step)
+        return self.take(index)
+
+    def take(self, indices):
+        """Copy the selected polygons (integer positions or a boolean mask) into a new set."""
+        indices = np.asarray(indices)
+        if indices.dtype == bool:
+            indices = np.flatnonzero(indices)
+        indices = np.asarray(indices, dtype=np.intp)
+        indices = np.where(indices < 0, indices + len(self), indices)
+
+        rings = _expand(self.polygon_offsets, indices)
+        vertices = _expand(self.ring_offsets, rings)
+        ring_counts = self.ring_offsets[rings + 1] - self.ring_offsets[rings]
+        polygon_counts = self.polygon_offsets[indices + 1] - self.polygon_offsets[indices]
+        return PolygonSet(self.x[vertices], self.y[vertices],
+                          np.concatenate([[0], np.cumsum(ring_counts)]),
+                          np.concatenate([[0], np.cumsum(polygon_counts)]))
+
+    @property
+    def n_rings(self):
+        return len(self.ring_offsets) - 1
+
+    @property
+    def n_vertices(self):
+        return len(self.x)
+
+    @property
+    def nbytes(self):
+        """Memory held by the coordinate and offset arrays."""
+        return self.x.nbytes + self.y.nbytes + self.ring_offsets.nbytes + self.polygon_offsets.nbytes
+
+    def rings(self, index):
+        """The rings of one polygon as (x, y) views."""
+        rings = range(self.polygon_offsets[index], self.polygon_offsets[index + 1])
+        return [(self.x[self.ring_offsets[r]:self.ring_offsets[r + 1]],
+                 self.y[self.ring_offsets[r]:self.ring_offsets[r + 1]]) for r in rings]
+
+    def _ring_polygon_ids(self):
+        return np.repeat(np.arange(len(self)), np.diff(self.polygon_offsets))
+
+    def _ring_moments(self):
+        """
+        Signed area and first moments of every ring.
+
+        Coordinates are taken relative to the first vertex of each ring's
+        polygon, which keeps the products of UTM-sized values precise and
+        lets the rings of one polygon be summed directly.
+
+        Returns
+        -------
+        tuple(numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray)
+            Area, x moment and y moment per ring, and the origin vertex per polygon.
+        """
+        n_rings = self.n_rings
+        ring_ids = np.repeat(np.arange(n_rings), np.diff(self.ring_offsets))
+        polygon_ids = self._ring_polygon_ids()
+        origin = np.minimum(self.ring_offsets[self.polygon_offsets[:-1]], max(len(self.x) - 1, 0))
+        if len(self.x) == 0:
+            zeros = np.zeros(n_rings)
+            return zeros, zeros, zeros, origin
+
+        vertex_origin = origin[polygon_ids][ring_ids]
+        dx, dy = self.x - self.x[vertex_origin], self.y - self.y[vertex_origin]
+        nxt = _next_vertex(self.ring_offsets, len(self.x))
+        cross = dx * dy[nxt] - dx[nxt] * dy
+        area = 0.5 * np.bincount(ring_ids, weights=cross, minlength=n_rings)
+        moment_x = np.bincount(ring_ids, weights=(dx + dx[nxt]) * cross, minlength=n_rings) / 6
+        moment_y = np.bincount(ring_ids, weights=(dy + dy[nxt]) * cross, minlength=n_rings) / 6
+        return area, moment_x, moment_y, origin
+
+    def ring_areas(self):
+        """Signed area of every ring (negative for clockwise rings)."""
+        return self._ring_moments()[0]
+
+    def area(self):
+        """
+        Area of every polygon.
+
+        Holes run opposite to exteriors, so summing the signed ring areas
+        subtracts them.
+        """
+        polygon_ids = self._ring_polygon_ids()
+        return np.abs(np.bincount(polygon_ids, weights=self.ring_areas(), minlength=len(self)))
+
+    def centroid(self):
+        """
+        Area-weighted centroid of every polygon, as an (n, 2) array.
+
+        Degenerate polygons (zero area) fall back to the mean of their
+        vertices; polygons without vertices give NaN.
+        """
+        n = len(self)
+        if len(self.x) == 0:
+            return np.full((n, 2), np.nan)
+        area, moment_x, moment_y, origin = self._ring_moments()
+        polygon_ids = self._ring_polygon_ids()
+        area = np.bincount(polygon_ids, weights=area, minlength=n)
+        moment_x = np.bincount(polygon_ids, weights=moment_x, minlength=n)
+        moment_y = np.bincount(polygon_ids, weights=moment_y, minlength=n)
+
+        counts = np.diff(self.ring_offsets[self.polygon_offsets])
+        vertex_polygon = np.repeat(np.arange(n), counts)
+        degenerate = area == 0
+        safe_area = np.where(degenerate, 1.0, area)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean_x = np.bincount(vertex_polygon, weights=self.x, minlength=n) / counts
+            mean_y = np.bincount(vertex_polygon, weights=self.y, minlength=n) / counts
+        center_x = np.where(degenerate, mean_x, self.x[origin] + moment_x / safe_area)
+        center_y = np.where(degenerate, mean_y, self.y[origin] + moment_y / safe_area)
+        return np.column_stack([center_x, center_y])
+
+    def bounds(self):
+        """Envelope of every polygon as (xmin, ymin, xmax, ymax) rows; NaN for empty polygons."""
+        vertex_offsets = self.ring_offsets[self.polygon_offsets]
+        filled = vertex_offsets[1:] > vertex_offsets[:-1]
+        result = np.full((len(self), 4), np.nan)
+        if filled.any():
+            starts = vertex_offsets[:-1][filled]
+            result[filled] = np.column_stack([
+                np.minimum.reduceat(self.x, starts),
+                np.minimum.reduceat(self.y, starts),
+                np.maximum.reduceat(self.x, starts),
+                np.maximum.reduceat(self.y, starts),
+            ])
+        return result
+
+    def extent(self):
+        """Envelope of the whole set as (xmin, ymin, xmax, ymax); NaN if there are no vertices."""
+        if len(self.x) == 0:
+            return (np.nan,) * 4
+        return float(self.x.min()), float(self.y.min()), float(self.x.max()), float(self.y.max())
+
+    def project(self, source_epsg, target_epsg, cache=None):
+        """
+        The polygons reprojected between WGS 84 (4326) and WGS 84 / UTM zones.
+
+        Only the vertex buffers are new; the offsets are shared with this set.
+        With a projection_cache.ProjectionCache, vertices projected by an
+        earlier run are loaded from disk instead of projected again.
+        """
+        x, y = (project if cache is None else cache.project)(self.x, self.y, source_epsg, target_epsg)
+        return PolygonSet(x, y, self.ring_offsets, self.polygon_offsets)
+
+    def exteriors(self):
+        """
+        Which rings are exteriors: those oriented like their polygon's largest ring.
+
+        Under the shapefile convention (clockwise exteriors) this flags the
+        clockwise rings, but counter-clockwise input is recognised as well.
+        """
+        areas = self.ring_areas()
+        polygon_ids = self._ring_polygon_ids()
+        # Rings sorted by polygon, largest first: the first ring of each polygon is its largest
+        order = np.lexsort((-np.abs(areas), polygon_ids))
+        sign = np.zeros(len(self))
+        filled = np.diff(self.polygon_offsets) > 0
+        sign[filled] = np.sign(areas[order[self.polygon_offsets[:-1][filled]]])
+        return np.sign(areas) == sign[polygon_ids]
+
+    def to_wkb(self, exteriors=None):
+        """
+        Yield every polygon as little-endian WKB (a MultiPolygon per polygon).
+
+        Rings are closed as needed and grouped so that each exterior starts
+        a new member polygon, followed by its holes. `exteriors` (one bool
+        per ring) overrides the orientation-based exteriors(), for sources
+        such as KML that say which rings are outer boundaries.
+        """
+        exteriors = self.exteriors() if exteriors is None else np.asarray(exteriors, dtype=bool)
+        x, y, ring_offsets = self.x, self.y, self.ring_offsets
+        for p in range(len(self)):
+            members = []
+            for r in range(self.polygon_offsets[p], self.polygon_offsets[p + 1]):
+                start, end = ring_offsets[r], ring_offsets[r + 1]
+                if end == start:
+                    continue
+                ring = np.column_stack([x[start:end], y[start:end]])
+                if x[start] != x[end - 1] or y[start] != y[end - 1]:
+                    ring = np.vstack([ring, ring[:1]])
+                if exteriors[r] or not members:
+                    members.append([])
+                members[-1].append(struct.pack("<I", len(ring)) + ring.astype("<f8").tobytes())
+            yield struct.pack("<BII", 1, 6, len(members)) + b"".join(
+                struct.pack("<BII", 1, 3, len(rings)) + b"".join(rings) for rings in members)
+
+    def to_arcpy(self, spatial_reference=None):
+        """
+        Yield every polygon as an arcpy.Polygon, built from WKB.
+
+        This is the write boundary: nothing else in the class touches arcpy.
+        Cursors that accept ``SHAPE@WKB`` can take to_wkb() output directly
+        and skip the geometry objects altogether.
+        """
+        from arcpy_backend import arcpy
+
+        for wkb in self.to_wkb():
+            yield arcpy.FromWKB(bytearray(wkb), spatial_reference)
+
+
+def _expand(offsets, selected):
+    """Concatenate np.arange(offsets[i], offsets[i + 1]) for every selected i."""
+    starts = offsets[selected]
+    counts = offsets[selected + 1] - starts
+    return np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum(), dtype=np.intp)
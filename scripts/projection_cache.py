@@ -0,0 +1,174 @@
+"""
+Memoized spatial references and a persistent cache of projected coordinates.
+
+`spatial_reference(code)` returns one arcpy.SpatialReference per code from an
+in-process LRU, instead of building a new object (and parsing the
+projection engine's definition) in every call.
+
+ProjectionCache is an on-disk, content-addressed store of reprojected
+coordinate arrays. The key is the SHA-1 of the input coordinates plus the
+source and target EPSG codes and CACHE_VERSION, so re-running a notebook or
+script over unchanged inputs loads the projected arrays instead of
+projecting again, while any edited coordinate (or a new cache version)
+changes the key. Entries are .npy files, one per key, written atomically so
+concurrent runs can share a folder.
+
+    cache = ProjectionCache("projection_cache")
+    lon, lat = cache.project(x, y, 32717, 4326)
+    print(cache.stats())
+"""
+
+import hashlib
+import os
+import tempfile
+from functools import lru_cache
+
+import numpy as np
+
+from arcpy_backend import arcpy
+from utm_projection import project
+
+# Part of every ProjectionCache key: bump it whenever the entry format or the
+# projection math in utm_projection changes, so stale entries are never served
+CACHE_VERSION = 1
+
+
+@lru_cache(maxsize=64)
+def _spatial_reference(code):
+    return arcpy.SpatialReference(code)
+
+
+def spatial_reference(code):
+    """
+    Shared arcpy.SpatialReference for an EPSG code (or any value SpatialReference accepts).
+
+    Objects are kept in a 64-entry LRU, so repeated calls return the same
+    instance; treat it as read-only. Hits and misses are reported by
+    spatial_reference_cache_info().
+    """
+    if isinstance(code, str) and code.strip().isdigit():
+        code = int(code)
+    return _spatial_reference(code)
+
+
+def spatial_reference_cache_info():
+    """functools cache statistics (hits, misses, maxsize, currsize) of spatial_reference()."""
+    return _spatial_reference.cache_info()
+
+
+def coordinates_hash(x, y):
+    """SHA-1 hex digest of two coordinate arrays, as float64."""
+    x = np.ascontiguousarray(x, dtype=np.float64).ravel()
+    y = np.ascontiguousarray(y, dtype=np.float64).ravel()
+    if len(x) != len(y):
+        raise ValueError("x and y must have the same length.")
+    digest = hashlib.sha1(len(x).to_bytes(8, "little"))
+    digest.update(x.data)
+    digest.update(y.data)
+    return digest.hexdigest()
+
+
+class ProjectionCache:
+    """
+    Content-addressed on-disk cache of projected coordinate arrays.
+
+    Parameters
+    ----------
+    folder : str
+        Cache folder (created if needed). Entries are spread over 256
+        sub-folders named after the first two hex digits of their key.
+    min_points : int, optional
+        Inputs with fewer points are projected without touching the cache
+        (default 256): below that, hashing and file I/O cost more than the
+        projection itself.
+
+    Attributes
+    ----------
+    hits, misses : int
+        Lookups served from disk, and lookups that had to project.
+    """
+
+    def __init__(self, folder, min_points=256):
+        self.folder = os.path.abspath(folder)
+        self.min_points = min_points
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.folder, exist_ok=True)
+
+    def __repr__(self):
+        return f"ProjectionCache({self.folder!r}, hits={self.hits}, misses={self.misses})"
+
+    def key(self, x, y, source_epsg, target_epsg):
+        """Cache key of projecting (x, y) from source_epsg to target_epsg (with this CACHE_VERSION)."""
+        return f"{coordinates_hash(x, y)}-{int(source_epsg)}-{int(target_epsg)}-v{CACHE_VERSION}"
+
+    def _path(self, key):
+        return os.path.join(self.folder, key[:2], key + ".npy")
+
+    def project(self, x, y, source_epsg, target_epsg):
+        """
+        utm_projection.project through the cache.
+
+        Parameters
+        ----------
+        x, y : array_like
+            Input coordinates.
+        source_epsg, target_epsg : int
+            EPSG codes; 4326 or any WGS 84 / UTM zone.
+
+        Returns
+        -------
+        tuple(numpy.ndarray, numpy.ndarray)
+            The projected coordinates.
+        """
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        if x.size < self.min_points or int(source_epsg) == int(target_epsg):
+            return project(x, y, source_epsg, target_epsg)
+
+        path = self._path(self.key(x, y, source_epsg, target_epsg))
+        try:
+            projected = np.load(path)
+        except (OSError, ValueError):
+            projected = None
+        if projected is not None and projected.shape == (2, x.size):
+            self.hits += 1
+            return projected[0].reshape(x.shape), projected[1].reshape(y.shape)
+
+        self.misses += 1
+        px, py = project(x, y, source_epsg, target_epsg)
+        self._store(path, np.stack([np.ravel(px), np.ravel(py)]))
+        return px, py
+
+    def _store(self, path, array):
+        # Write to a temporary file in the same folder, then rename: readers never see a partial entry
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        handle, temporary = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(handle, "wb") as f:
+                np.save(f, array)
+            os.replace(temporary, path)
+        except BaseException:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+
+    def stats(self):
+        """Hits, misses, hit rate, and the number and total bytes of entries on disk."""
+        entries = size = 0
+        for root, _, files in os.walk(self.folder):
+            for name in files:
+                if name.endswith(".npy"):
+                    entries += 1
+                    size += os.path.getsize(os.path.join(root, name))
+        lookups = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": entries, "bytes": size}
+
+    def clear(self):
+        """Delete every cached entry and reset the counters."""
+        for root, _, files in os.walk(self.folder):
+            for name in files:
+                if name.endswith((".npy", ".tmp")):
+                    os.remove(os.path.join(root, name))
+        self.hits = self.misses = 0
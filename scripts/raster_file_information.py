@@ -1,4 +1,7 @@
-import arcpy
+from arcpy_backend import arcpy
+from raster_header import read_raster_header
+from raster_stats import format_statistics, raster_statistics
+from utm_projection import WGS84_EPSG, project_extent
 
 # ----------------------
 # Raster Setup
@@ -7,49 +10,99 @@ import arcpy
 raster_path = "raster.tif"
 # Alternative raster (commented out): raster_path = r"Guayas/Salinas_2_.img"
 
-# Create raster description and object
-desc = arcpy.Describe(raster_path)
-raster_obj = arcpy.Raster(raster_path)
+# Also compute per-band min/max/mean/std, NoData fraction and histograms
+# (streamed block by block, so multi-GB rasters never have to fit in memory)
+compute_statistics = False
+
+# GeoTIFF and ERDAS .img headers are read directly (memory-mapped, no pixel
+# decoding); other formats fall back to arcpy.Describe / arcpy.Raster
+try:
+    info = read_raster_header(raster_path)
+    desc = None
+except ValueError:
+    # Create raster description and object
+    desc = arcpy.Describe(raster_path)
+    raster_obj = arcpy.Raster(raster_path)
+    extent = desc.extent
+    info = {
+        "format": desc.format,
+        "width": raster_obj.width,
+        "height": raster_obj.height,
+        "bands": raster_obj.bandCount,
+        "compression": desc.compressionType,
+        "nodata": raster_obj.noDataValue,
+        "cell_width": raster_obj.meanCellWidth,
+        "cell_height": raster_obj.meanCellHeight,
+        "xmin": extent.XMin, "ymin": extent.YMin, "xmax": extent.XMax, "ymax": extent.YMax,
+        "epsg": desc.spatialReference.factoryCode or None,
+    }
+
+# The header's EPSG code, else nothing: a custom WKT is reported as unknown rather than guessed
+if desc is not None:
+    sr = desc.spatialReference
+elif info["epsg"]:
+    sr = arcpy.SpatialReference(info["epsg"])
+else:
+    sr = None
 
 # ----------------------
 # Spatial Properties
 # ----------------------
+has_extent = None not in (info["xmin"], info["ymin"], info["xmax"], info["ymax"])
+
 # Extent in UTM coordinates
-print(f"Extent (UTM): {desc.extent}")
+print(f"Extent (UTM): {info['xmin']} {info['ymin']} {info['xmax']} {info['ymax']}" if has_extent else "Extent (UTM): unknown")
 
 # Spatial reference name
-print(f"Spatial Reference: {desc.spatialReference.name}")
+print(f"Spatial Reference: {sr.name if sr is not None else 'unknown (no EPSG code in the header)'}")
 
 # Cell size (resolution in meters)
-print(f"Cell Size: {raster_obj.meanCellWidth}, {raster_obj.meanCellHeight}")
+print(f"Cell Size: {info['cell_width']}, {info['cell_height']}")
 
-# Convert extent to Lat/Long
-extent = desc.extent
-sr_utm = arcpy.SpatialReference("WGS 1984 UTM Zone 17S")
-sr_wgs84 = arcpy.SpatialReference(4326)  # EPSG code for WGS84 geographic
-extent_utm = arcpy.Extent(extent.XMin, extent.YMin, extent.XMax, extent.YMax, spatial_reference=sr_utm)
-extent_wgs84 = extent_utm.projectAs(sr_wgs84)
-print(f"Extent (Lat/Long): {extent_wgs84.XMin}, {extent_wgs84.YMin}, {extent_wgs84.XMax}, {extent_wgs84.YMax}")
+# Convert extent to Lat/Long: vectorized transverse Mercator for WGS 84 / UTM rasters,
+# the projection engine for any other coordinate system
+epsg = info["epsg"] or (sr.factoryCode if sr is not None else None)
+if not has_extent or sr is None:
+    print("Extent (Lat/Long): unknown")
+elif epsg == WGS84_EPSG or ((epsg or 0) // 100 in (326, 327) and 1 <= epsg % 100 <= 60):
+    lon_min, lat_min, lon_max, lat_max = project_extent(info["xmin"], info["ymin"], info["xmax"], info["ymax"], epsg, WGS84_EPSG)
+    print(f"Extent (Lat/Long): {lon_min}, {lat_min}, {lon_max}, {lat_max}")
+else:
+    extent_source = arcpy.Extent(info["xmin"], info["ymin"], info["xmax"], info["ymax"], spatial_reference=sr)
+    extent_wgs84 = extent_source.projectAs(arcpy.SpatialReference(WGS84_EPSG))
+    print(f"Extent (Lat/Long): {extent_wgs84.XMin}, {extent_wgs84.YMin}, {extent_wgs84.XMax}, {extent_wgs84.YMax}")
 
 # Full spatial reference details
-sr = desc.spatialReference
-print(f"Full Spatial Reference: {sr.exportToString()}")
+print(f"Full Spatial Reference: {sr.exportToString() if sr is not None else 'unknown'}")
 
 # ----------------------
 # Raster Attributes
 # ----------------------
 # File format
-print(f"Format: {desc.format}")
+print(f"Format: {info['format']}")
 
 # NoData value
-print(f"NoData Value: {raster_obj.noDataValue}")
+print(f"NoData Value: {info['nodata']}")
 
 # Raster dimensions
-print(f"Width (Columns): {raster_obj.width}")
-print(f"Height (Rows): {raster_obj.height}")
+print(f"Width (Columns): {info['width']}")
+print(f"Height (Rows): {info['height']}")
 
 # Number of bands
-print(f"Number of Bands: {raster_obj.bandCount}")
+print(f"Number of Bands: {info['bands']}")
 
 # Compression type
-print(f"Compression Type: {desc.compressionType}")
+print(f"Compression Type: {info['compression']}")
+
+# ----------------------
+# Band Statistics
+# ----------------------
+if compute_statistics:
+    print(format_statistics(raster_statistics(raster_path)))
+
+# ----------------------
+# Folder Catalog
+# ----------------------
+# Catalog every GeoTIFF/.img under a folder tree (headers only, read in parallel)
+# from raster_header import scan_rasters, write_catalog
+# write_catalog(scan_rasters(r"Guayas"), "raster_catalog.csv")
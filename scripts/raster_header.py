@@ -0,0 +1,489 @@
+"""
+Raster metadata straight from the file headers, without decoding any pixels.
+
+GeoTIFF (classic and BigTIFF) IFD / GeoKey tags and ERDAS Imagine (.img, HFA)
+entry trees are read through `mmap`, so only the few pages holding the header
+are ever touched, even for multi-GB orthomosaics. `scan_rasters` walks a
+folder tree with a thread pool and `write_catalog` saves the result as CSV,
+JSON or Parquet. Formats the header readers do not understand fall back to
+arcpy.Describe / arcpy.Raster.
+"""
+
+import csv
+import json
+import math
+import mmap
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
+
+CATALOG_FIELDS = [
+    "path", "format", "width", "height", "bands", "data_type", "compression", "nodata",
+    "cell_width", "cell_height", "xmin", "ymin", "xmax", "ymax", "epsg", "block_width",
+    "block_height", "overviews", "size_bytes", "reader", "error",
+]
+
+TIFF_EXTENSIONS = (".tif", ".tiff")
+IMG_EXTENSIONS = (".img",)
+
+# TIFF field type -> struct format character
+_TIFF_TYPES = {1: "B", 2: "s", 3: "H", 4: "I", 5: "II", 6: "b", 7: "B", 8: "h", 9: "i", 10: "ii",
+               11: "f", 12: "d", 16: "Q", 17: "q", 18: "Q"}
+
+_TIFF_COMPRESSION = {1: "None", 2: "CCITT RLE", 5: "LZW", 6: "JPEG (old)", 7: "JPEG", 8: "Deflate",
+                     32773: "PackBits", 32946: "Deflate", 34712: "JPEG2000", 34887: "LERC",
+                     34925: "LZMA", 50000: "ZSTD", 50001: "WEBP"}
+
+# (SampleFormat, BitsPerSample) -> NumPy-style data type name
+_TIFF_DATA_TYPES = {(1, 1): "bool", (1, 8): "uint8", (1, 16): "uint16", (1, 32): "uint32", (1, 64): "uint64",
+                    (2, 8): "int8", (2, 16): "int16", (2, 32): "int32", (2, 64): "int64",
+                    (3, 16): "float16", (3, 32): "float32", (3, 64): "float64"}
+
+# ERDAS pixel type enum -> (data type name, struct format)
+_HFA_DATA_TYPES = {0: ("uint1", "B"), 1: ("uint2", "B"), 2: ("uint4", "B"), 3: ("uint8", "B"),
+                   4: ("int8", "b"), 5: ("uint16", "H"), 6: ("int16", "h"), 7: ("uint32", "I"),
+                   8: ("int32", "i"), 9: ("float32", "f"), 10: ("float64", "d"),
+                   11: ("complex64", "ff"), 12: ("complex128", "dd")}
+
+
+def _empty_record(path):
+    record = dict.fromkeys(CATALOG_FIELDS)
+    record["path"] = path
+    record["size_bytes"] = os.path.getsize(path)
+    return record
+
+
+def _map_file(path):
+    """Read-only memory map of a file (the caller closes it)."""
+    with open(path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+# ----------------------
+# GeoTIFF
+# ----------------------
+def read_tiff_tags(buffer, ifd_index=0):
+    """
+    Decode the tags of one IFD of a classic TIFF or BigTIFF.
+
+    Parameters
+    ----------
+    buffer : bytes-like
+        The file contents (typically an mmap).
+    ifd_index : int, optional
+        Which image file directory to decode (0 is the full-resolution image).
+
+    Returns
+    -------
+    tuple(dict, int, str)
+        Tag number -> tuple of values (str for ASCII tags), the number of
+        IFDs in the file, and the struct byte-order prefix ("<" or ">").
+
+    Raises
+    ------
+    ValueError
+        If the buffer is not a TIFF file.
+    """
+    order = {b"II": "<", b"MM": ">"}.get(bytes(buffer[:2]))
+    if order is None:
+        raise ValueError("Not a TIFF file.")
+    version = struct.unpack_from(order + "H", buffer, 2)[0]
+    if version == 42:
+        offset_format, count_format, entry_size, inline_size = "I", "H", 12, 4
+        ifd_offset = struct.unpack_from(order + "I", buffer, 4)[0]
+    elif version == 43:
+        offset_format, count_format, entry_size, inline_size = "Q", "Q", 20, 8
+        ifd_offset = struct.unpack_from(order + "Q", buffer, 8)[0]
+    else:
+        raise ValueError(f"Not a TIFF file (version {version}).")
+
+    tags, ifd_count = None, 0
+    while ifd_offset and ifd_offset < len(buffer):
+        n_entries = struct.unpack_from(order + count_format, buffer, ifd_offset)[0]
+        first_entry = ifd_offset + struct.calcsize(count_format)
+        if ifd_count == ifd_index:
+            tags = {}
+            for i in range(n_entries):
+                position = first_entry + i * entry_size
+                tag, field_type = struct.unpack_from(order + "HH", buffer, position)
+                count = struct.unpack_from(order + offset_format, buffer, position + 4)[0]
+                code = _TIFF_TYPES.get(field_type)
+                if code is None:
+                    continue
+                size = struct.calcsize(code) * count if code != "s" else count
+                value_offset = position + 4 + struct.calcsize(offset_format)
+                if size > inline_size:
+                    value_offset = struct.unpack_from(order + offset_format, buffer, value_offset)[0]
+                if code == "s":
+                    tags[tag] = bytes(buffer[value_offset:value_offset + count]).split(b"\0")[0].decode("latin-1")
+                else:
+                    tags[tag] = struct.unpack_from(f"{order}{count * len(code)}{code[0]}", buffer, value_offset)
+        ifd_count += 1
+        ifd_offset = struct.unpack_from(order + offset_format, buffer, first_entry + n_entries * entry_size)[0]
+
+    if tags is None:
+        raise ValueError(f"TIFF file has no IFD {ifd_index}.")
+    return tags, ifd_count, order
+
+
+def _geokeys(tags):
+    """GeoKey id -> value from the GeoKeyDirectory (and its double/ASCII parameter tags)."""
+    directory = tags.get(34735)
+    if not directory:
+        return {}
+    doubles = tags.get(34736, ())
+    ascii_params = tags.get(34737, "")
+    keys = {}
+    for i in range(4, 4 + 4 * directory[3], 4):
+        key, location, count, value = directory[i:i + 4]
+        if location == 0:
+            keys[key] = value
+        elif location == 34736:
+            keys[key] = doubles[value:value + count]
+        elif location == 34737:
+            keys[key] = ascii_params[value:value + count].rstrip("|")
+    return keys
+
+
+def read_geotiff_header(path):
+    """
+    Catalog record (see CATALOG_FIELDS) of a GeoTIFF, read from its first IFD and GeoKeys.
+
+    Raises
+    ------
+    ValueError
+        If the file is not a TIFF.
+    """
+    record = _empty_record(path)
+    with _map_file(path) as buffer:
+        tags, ifd_count, _ = read_tiff_tags(buffer)
+
+    width, height = tags[256][0], tags[257][0]
+    bands = tags.get(277, (1,))[0]
+    bits = tags.get(258, (1,))[0]
+    sample_format = tags.get(339, (1,))[0]
+
+    record.update(
+        format="TIFF", width=width, height=height, bands=bands,
+        data_type=_TIFF_DATA_TYPES.get((sample_format, bits), f"{bits}-bit"),
+        compression=_TIFF_COMPRESSION.get(tags.get(259, (1,))[0], str(tags.get(259, ("?",))[0])),
+        block_width=tags.get(322, (width,))[0],
+        block_height=tags.get(323, tags.get(278, (height,)))[0],
+        overviews=ifd_count - 1,
+        reader="header",
+    )
+    if 42113 in tags:  # GDAL_NODATA
+        try:
+            record["nodata"] = float(tags[42113])
+        except ValueError:
+            record["nodata"] = tags[42113]
+
+    geokeys = _geokeys(tags)
+    pixel_is_point = geokeys.get(1025) == 2
+    if 33550 in tags and 33922 in tags:
+        scale_x, scale_y = tags[33550][:2]
+        i, j, _, x, y, _ = tags[33922][:6]
+        xmin = x - i * scale_x
+        ymax = y + j * scale_y
+        if pixel_is_point:
+            xmin, ymax = xmin - scale_x / 2, ymax + scale_y / 2
+        record.update(cell_width=scale_x, cell_height=scale_y, xmin=xmin, ymax=ymax,
+                      xmax=xmin + width * scale_x, ymin=ymax - height * scale_y)
+    elif 34264 in tags:
+        a, b, _, d, e, f, _, h = tags[34264][:8]
+        xs = [d + a * c + b * r for c, r in ((0, 0), (width, 0), (0, height), (width, height))]
+        ys = [h + e * c + f * r for c, r in ((0, 0), (width, 0), (0, height), (width, height))]
+        record.update(cell_width=math.hypot(a, e), cell_height=math.hypot(b, f),
+                      xmin=min(xs), ymin=min(ys), xmax=max(xs), ymax=max(ys))
+
+    epsg = geokeys.get(3072) or geokeys.get(2048)  # projected, else geographic CRS code
+    if isinstance(epsg, int) and 0 < epsg < 32767:
+        record["epsg"] = epsg
+    return record
+
+
+# ----------------------
+# ERDAS Imagine (.img / HFA)
+# ----------------------
+class _HFAEntry:
+    """One node of the HFA entry tree (Ehfa_Entry)."""
+
+    def __init__(self, buffer, position):
+        (self.next, self.prev, self.parent, self.child, self.data,
+         self.data_size) = struct.unpack_from("<IIIIIi", buffer, position)
+        self.name = bytes(buffer[position + 24:position + 88]).split(b"\0")[0].decode("latin-1")
+        self.type = bytes(buffer[position + 88:position + 120]).split(b"\0")[0].decode("latin-1")
+        self.buffer = buffer
+
+    def children(self):
+        position = self.child
+        while position:
+            child = _HFAEntry(self.buffer, position)
+            yield child
+            position = child.next
+
+    def find(self, type_name):
+        return next((child for child in self.children() if child.type == type_name), None)
+
+
+class _HFAReader:
+    """Sequential reader for the MIF-encoded data of an HFA entry."""
+
+    def __init__(self, buffer, position):
+        self.buffer = buffer
+        self.position = position
+
+    def read(self, fmt):
+        values = struct.unpack_from("<" + fmt, self.buffer, self.position)
+        self.position += struct.calcsize("<" + fmt)
+        return values if len(values) > 1 else values[0]
+
+    def pointer(self):
+        """Count and (ignored) offset of an inline pointer field ("p" / "*")."""
+        count, _ = self.read("II")
+        return count
+
+    def string(self):
+        count = self.pointer()
+        text = bytes(self.buffer[self.position:self.position + count]).split(b"\0")[0].decode("latin-1")
+        self.position += count
+        return text
+
+
+def hfa_layers(buffer):
+    """
+    Root-level Eimg_Layer entries (one per band) of an ERDAS Imagine file.
+
+    Raises
+    ------
+    ValueError
+        If the buffer is not an HFA file.
+    """
+    if bytes(buffer[:15]) != b"EHFA_HEADER_TAG":
+        raise ValueError("Not an ERDAS Imagine (HFA) file.")
+    header = struct.unpack_from("<I", buffer, 16)[0]
+    root = _HFAEntry(buffer, struct.unpack_from("<I", buffer, header + 8)[0])
+    return [entry for entry in root.children() if entry.type == "Eimg_Layer"]
+
+
+def hfa_layer_info(buffer, layer):
+    """Width, height, pixel type and block size of an Eimg_Layer entry."""
+    width, height, _, pixel_type, block_width, block_height = struct.unpack_from("<iiHHii", buffer, layer.data)
+    return width, height, pixel_type, block_width, block_height
+
+
+def _hfa_map_info(buffer, layer):
+    entry = layer.find("Eprj_MapInfo")
+    if entry is None:
+        return None
+    reader = _HFAReader(buffer, entry.data)
+    reader.string()  # projection name
+    reader.pointer()
+    upper_left = reader.read("dd")
+    reader.pointer()
+    lower_right = reader.read("dd")
+    reader.pointer()
+    pixel_size = reader.read("dd")
+    return upper_left, lower_right, pixel_size
+
+
+def _hfa_epsg(buffer, layer):
+    """EPSG code for WGS 84 geographic / UTM projections, else None."""
+    entry = layer.find("Eprj_ProParameters")
+    if entry is None:
+        return None
+    reader = _HFAReader(buffer, entry.data)
+    reader.read("H")  # proType
+    number = reader.read("i")
+    reader.string()  # proExeName
+    reader.string()  # proName
+    zone = reader.read("i")
+    n_params = reader.pointer()
+    params = reader.read(f"{n_params}d") if n_params else ()
+    params = params if isinstance(params, tuple) else (params,)
+    reader.pointer()
+    spheroid = reader.string().upper().replace(" ", "")
+    if "WGS84" not in spheroid:
+        return None
+    if number == 0:
+        return 4326
+    if number == 1 and 1 <= zone <= 60:
+        south = len(params) > 3 and params[3] < 0
+        return (32700 if south else 32600) + zone
+    return None
+
+
+def _hfa_nodata(buffer, layer):
+    entry = layer.find("Eimg_NonInitializedValue")
+    if entry is None:
+        return None
+    reader = _HFAReader(buffer, entry.data)
+    reader.pointer()
+    _, _, data_type, _ = reader.read("iiHH")
+    fmt = _HFA_DATA_TYPES.get(data_type, (None, "d"))[1]
+    value = reader.read(fmt)
+    return value[0] if isinstance(value, tuple) else value
+
+
+def _hfa_compression(buffer, layer):
+    if layer.find("ExternalRasterDMS") is not None:
+        return "External (.ige)"
+    entry = layer.find("Edms_State")
+    if entry is None:
+        return None
+    compression = struct.unpack_from("<H", buffer, entry.data + 12)[0]
+    return "RLC" if compression else "None"
+
+
+def read_img_header(path):
+    """
+    Catalog record (see CATALOG_FIELDS) of an ERDAS Imagine .img, read from its HFA entry tree.
+
+    Raises
+    ------
+    ValueError
+        If the file is not an HFA file or has no raster layers.
+    """
+    record = _empty_record(path)
+    with _map_file(path) as buffer:
+        layers = hfa_layers(buffer)
+        if not layers:
+            raise ValueError("ERDAS Imagine file has no raster layers.")
+        band = layers[0]
+        width, height, pixel_type, block_width, block_height = hfa_layer_info(buffer, band)
+        record.update(
+            format="IMAGINE Image", width=width, height=height, bands=len(layers),
+            data_type=_HFA_DATA_TYPES.get(pixel_type, (str(pixel_type),))[0],
+            compression=_hfa_compression(buffer, band), nodata=_hfa_nodata(buffer, band),
+            block_width=block_width, block_height=block_height,
+            overviews=sum(1 for child in band.children() if child.type == "Eimg_Layer_SubSample"),
+            epsg=_hfa_epsg(buffer, band), reader="header",
+        )
+        map_info = _hfa_map_info(buffer, band)
+
+    if map_info is not None:
+        (ulx, uly), (lrx, lry), (cell_width, cell_height) = map_info
+        record.update(cell_width=cell_width, cell_height=cell_height,
+                      xmin=ulx - cell_width / 2, ymax=uly + cell_height / 2,
+                      xmax=lrx + cell_width / 2, ymin=lry - cell_height / 2)
+    return record
+
+
+# ----------------------
+# arcpy fallback and catalog
+# ----------------------
+def read_header_with_arcpy(path):
+    """Catalog record from arcpy.Describe / arcpy.Raster, for formats the header readers do not support."""
+    from arcpy_backend import arcpy
+
+    record = _empty_record(path)
+    desc = arcpy.Describe(path)
+    raster = arcpy.Raster(path)
+    extent = desc.extent
+    record.update(
+        format=desc.format, width=raster.width, height=raster.height, bands=raster.bandCount,
+        data_type=raster.pixelType, compression=desc.compressionType, nodata=raster.noDataValue,
+        cell_width=raster.meanCellWidth, cell_height=raster.meanCellHeight,
+        xmin=extent.XMin, ymin=extent.YMin, xmax=extent.XMax, ymax=extent.YMax,
+        epsg=desc.spatialReference.factoryCode or None, reader="arcpy",
+    )
+    return record
+
+
+def read_raster_header(path):
+    """
+    Catalog record of one raster, dispatched on the file signature.
+
+    Raises
+    ------
+    ValueError
+        If the file is neither a TIFF nor an ERDAS Imagine file.
+    """
+    with open(path, "rb") as f:
+        signature = f.read(15)
+    if signature[:2] in (b"II", b"MM"):
+        return read_geotiff_header(path)
+    if signature == b"EHFA_HEADER_TAG":
+        return read_img_header(path)
+    raise ValueError("Unsupported raster format for the header reader.")
+
+
+def find_rasters(root, extensions=TIFF_EXTENSIONS + IMG_EXTENSIONS):
+    """Yield the paths of every file under `root` with one of the given extensions."""
+    extensions = tuple(ext.lower() for ext in extensions)
+    for folder, _, filenames in os.walk(root):
+        for filename in sorted(filenames):
+            if filename.lower().endswith(extensions):
+                yield os.path.join(folder, filename)
+
+
+def scan_rasters(root, extensions=TIFF_EXTENSIONS + IMG_EXTENSIONS, max_workers=8, arcpy_fallback=True):
+    """
+    Read the header of every raster under a folder tree.
+
+    Parameters
+    ----------
+    root : str
+        Folder to walk (recursively).
+    extensions : tuple of str, optional
+        File extensions to include. Extensions other than .tif/.tiff/.img
+        (e.g. ".jp2", ".sid") are read through the arcpy fallback.
+    max_workers : int, optional
+        Threads reading headers concurrently (default 8).
+    arcpy_fallback : bool, optional
+        Retry files the header readers reject with arcpy (default True). The
+        fallback runs in the calling thread, after the pool has finished.
+
+    Returns
+    -------
+    list of dict
+        One catalog record per raster (see CATALOG_FIELDS), in path order.
+        Unreadable rasters get their "error" field set.
+    """
+    paths = list(find_rasters(root, extensions))
+
+    def read(path):
+        try:
+            return read_raster_header(path)
+        except (ValueError, KeyError, struct.error, OSError) as e:
+            record = dict.fromkeys(CATALOG_FIELDS)
+            record.update(path=path, error=str(e) or type(e).__name__)
+            return record
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        records = list(executor.map(read, paths))
+
+    if arcpy_fallback:
+        for i, record in enumerate(records):
+            if record["error"] is not None:
+                try:
+                    records[i] = read_header_with_arcpy(record["path"])
+                except Exception as e:  # arcpy missing, or the raster is unreadable there too
+                    record["error"] = f"{record['error']}; arcpy: {e}"
+    return records
+
+
+def write_catalog(records, path):
+    """
+    Write catalog records to CSV, JSON or Parquet, chosen by the file extension.
+
+    Parquet output needs pandas with pyarrow (or fastparquet) installed.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=CATALOG_FIELDS)
+            writer.writeheader()
+            writer.writerows(records)
+    elif extension == ".json":
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(records, f, indent=2)
+    elif extension == ".parquet":
+        try:
+            import pandas as pd
+        except ImportError as e:
+            raise ImportError("Writing a Parquet catalog requires pandas and pyarrow.") from e
+        pd.DataFrame.from_records(records, columns=CATALOG_FIELDS).to_parquet(path, index=False)
+    else:
+        raise ValueError(f"Unsupported catalog format '{extension}'; use .csv, .json or .parquet.")
+    return path
@@ -0,0 +1,374 @@
+"""
+Streaming per-band raster statistics with bounded memory.
+
+The raster is read one tile or strip at a time (uncompressed blocks are
+memory-mapped views, Deflate blocks are inflated one at a time), and every
+block only updates running aggregates: count, NoData count, min/max, a
+Welford/Chan mean and variance, and a fixed-bin histogram. The full raster is
+never held in memory, so multi-GB orthomosaics are summarized in the space of
+a few blocks. Blocks are spread over a thread pool (NumPy and zlib release the
+GIL) and the partial aggregates are merged at the end.
+
+GeoTIFF (uncompressed or Deflate, predictor 1/2) and uncompressed ERDAS .img
+are decoded directly; anything else is read in windows through
+arcpy.RasterToNumPyArray.
+"""
+
+import math
+import mmap
+import os
+import struct
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from raster_header import _HFA_DATA_TYPES, _TIFF_DATA_TYPES, _hfa_nodata, hfa_layer_info, hfa_layers, read_tiff_tags
+
+
+class BandStatistics:
+    """
+    Running statistics of one band, updated block by block.
+
+    Parameters
+    ----------
+    bins : int, optional
+        Number of histogram bins (default 256).
+    hist_range : tuple(float, float), optional
+        Histogram range. Values outside it are not binned. If omitted, no
+        histogram is kept.
+    """
+
+    def __init__(self, bins=256, hist_range=None):
+        self.bins = bins
+        self.hist_range = hist_range
+        self.count = 0
+        self.nodata_count = 0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self.mean = 0.0
+        self.m2 = 0.0  # sum of squared deviations from the mean
+        self.histogram = np.zeros(bins, dtype=np.int64) if hist_range is not None else None
+
+    def update(self, values, nodata=None):
+        """Add a block of pixel values (any shape); NoData and NaN pixels are only counted."""
+        values = values.ravel()
+        valid = None
+        if nodata is not None:
+            valid = values != nodata
+        if values.dtype.kind == "f":
+            finite = ~np.isnan(values)
+            valid = finite if valid is None else valid & finite
+        if valid is not None:
+            self.nodata_count += int(values.size - np.count_nonzero(valid))
+            values = values[valid]
+        if values.size == 0:
+            return
+
+        as_float = values.astype(np.float64)
+        block_mean = float(as_float.mean())
+        deviations = as_float - block_mean
+        block_m2 = float(np.dot(deviations, deviations))
+        self._combine(values.size, block_mean, block_m2, float(values.min()), float(values.max()))
+
+        if self.histogram is not None:
+            self.histogram += self._bin_counts(values)
+
+    def _bin_counts(self, values):
+        low, high = self.hist_range
+        width = (high - low) / self.bins
+        if values.dtype.kind in "iu" and width == int(width) and low == int(low):
+            # Integer data on integer-width bins: one bincount instead of np.histogram's search
+            inside = values[(values >= low) & (values < high)] if (values.min() < low or values.max() >= high) else values
+            return np.bincount((inside.astype(np.int64) - int(low)) // int(width), minlength=self.bins)[:self.bins]
+        return np.histogram(values, bins=self.bins, range=self.hist_range)[0]
+
+    def _combine(self, n, mean, m2, minimum, maximum):
+        """Chan et al. parallel update of the running mean and M2."""
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta * delta * self.count * n / total
+        self.count = total
+        self.minimum = min(self.minimum, minimum)
+        self.maximum = max(self.maximum, maximum)
+
+    def merge(self, other):
+        """Fold the aggregates of another BandStatistics (e.g. from another thread) into this one."""
+        self.nodata_count += other.nodata_count
+        if other.count:
+            self._combine(other.count, other.mean, other.m2, other.minimum, other.maximum)
+        if self.histogram is not None and other.histogram is not None:
+            self.histogram += other.histogram
+        return self
+
+    def result(self):
+        """Summary dict: count, nodata_fraction, min, max, mean, std, histogram and bin_edges."""
+        total = self.count + self.nodata_count
+        summary = {
+            "count": self.count,
+            "nodata_count": self.nodata_count,
+            "nodata_fraction": self.nodata_count / total if total else 0.0,
+            "min": self.minimum if self.count else None,
+            "max": self.maximum if self.count else None,
+            "mean": self.mean if self.count else None,
+            "std": math.sqrt(self.m2 / self.count) if self.count else None,
+        }
+        if self.histogram is not None:
+            summary["histogram"] = self.histogram
+            summary["bin_edges"] = np.linspace(self.hist_range[0], self.hist_range[1], self.bins + 1)
+        return summary
+
+
+class _Blocks:
+    """A list of raster blocks plus a decoder that turns block i into (band, array) pairs."""
+
+    def __init__(self, count, decode, bands, dtype, nodata, close):
+        self.count = count
+        self.decode = decode
+        self.bands = bands
+        self.dtype = dtype
+        self.nodata = nodata
+        self.close = close
+
+
+def _open_map(path):
+    with open(path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _close_map(buffer):
+    """Close a memory map; if block views are still referenced, it is released with the last of them."""
+    try:
+        buffer.close()
+    except BufferError:
+        pass
+
+
+def _tiff_blocks(path):
+    buffer = _open_map(path)
+    try:
+        tags, _, order = read_tiff_tags(buffer)
+        width, height = tags[256][0], tags[257][0]
+        bands = tags.get(277, (1,))[0]
+        bits = tags.get(258, (1,))[0]
+        data_type = _TIFF_DATA_TYPES.get((tags.get(339, (1,))[0], bits))
+        compression = tags.get(259, (1,))[0]
+        predictor = tags.get(317, (1,))[0]
+        if data_type in (None, "bool") or compression not in (1, 8, 32946) or predictor not in (1, 2):
+            raise NotImplementedError("TIFF layout not supported by the block reader.")
+
+        dtype = np.dtype(data_type).newbyteorder(order)
+        planar = tags.get(284, (1,))[0] == 2
+        if 324 in tags:
+            offsets, byte_counts = tags[324], tags[325]
+            block_width, block_height = tags[322][0], tags[323][0]
+        else:
+            offsets, byte_counts = tags[273], tags[279]
+            block_width, block_height = width, min(tags.get(278, (height,))[0], height)
+        across = -(-width // block_width)
+        down = -(-height // block_height)
+        per_band = across * down
+        samples = 1 if planar else bands
+        nodata = float(tags[42113]) if 42113 in tags else None
+    except Exception:
+        _close_map(buffer)
+        raise
+
+    def decode(i):
+        offset, size = offsets[i], byte_counts[i]
+        if not size:  # sparse block, never written
+            return []
+        raw = buffer[offset:offset + size] if compression != 1 else memoryview(buffer)[offset:offset + size]
+        if compression != 1:
+            raw = zlib.decompress(raw)
+        block_index = i % per_band
+        row, col = divmod(block_index, across)
+        rows = min(block_height, height - row * block_height)
+        cols = min(block_width, width - col * block_width)
+        stored_rows = block_height if 324 in tags else rows  # tiles are padded, strips are not
+        block = np.frombuffer(raw, dtype=dtype, count=stored_rows * block_width * samples)
+        block = block.reshape(stored_rows, block_width, samples)
+        if predictor == 2:
+            block = np.cumsum(block, axis=1, dtype=dtype)
+        block = block[:rows, :cols]
+        if planar:
+            return [(i // per_band, block[..., 0])]
+        return [(band, block[..., band]) for band in range(bands)]
+
+    return _Blocks(per_band * (bands if planar else 1), decode, bands, dtype, nodata, lambda: _close_map(buffer))
+
+
+def _img_blocks(path):
+    buffer = _open_map(path)
+    try:
+        layers = hfa_layers(buffer)
+        width, height, pixel_type, block_width, block_height = hfa_layer_info(buffer, layers[0])
+        data_type = _HFA_DATA_TYPES.get(pixel_type, (None,))[0]
+        if data_type is None or data_type.startswith(("uint1", "uint2", "uint4", "complex")):
+            raise NotImplementedError("ERDAS pixel type not supported by the block reader.")
+        dtype = np.dtype(data_type).newbyteorder("<")
+        nodata = _hfa_nodata(buffer, layers[0])
+
+        # Edms_State: 3 longs, the compression enum, then the Edms_VirtualBlockInfo array
+        # (fileCode short, offset long, size long, logvalid short, compressionType short).
+        block_info = []
+        for layer in layers:
+            state = layer.find("Edms_State")
+            if state is None:
+                raise NotImplementedError("ERDAS file with external (.ige) or missing raster data.")
+            count = struct.unpack_from("<I", buffer, state.data + 14)[0]
+            info = np.frombuffer(buffer, dtype=np.dtype([("file_code", "<i2"), ("offset", "<u4"), ("size", "<u4"),
+                                                         ("valid", "<i2"), ("compression", "<i2")]),
+                                 count=count, offset=state.data + 22).copy()  # no views may outlive the mmap
+            if np.any(info["compression"][info["valid"] != 0] != 0):
+                raise NotImplementedError("RLC-compressed ERDAS blocks are not supported by the block reader.")
+            block_info.append(info)
+        across = -(-width // block_width)
+    except Exception:
+        _close_map(buffer)
+        raise
+
+    per_band = len(block_info[0])
+
+    def decode(i):
+        band, block_index = divmod(i, per_band)
+        info = block_info[band][block_index]
+        if not info["valid"]:
+            return []
+        row, col = divmod(block_index, across)
+        rows = min(block_height, height - row * block_height)
+        cols = min(block_width, width - col * block_width)
+        block = np.frombuffer(buffer, dtype=dtype, count=block_width * block_height, offset=int(info["offset"]))
+        return [(band, block.reshape(block_height, block_width)[:rows, :cols])]
+
+    return _Blocks(per_band * len(layers), decode, len(layers), dtype, nodata, lambda: _close_map(buffer))
+
+
+def _arcpy_blocks(path, window=2048):
+    """Windows of an arbitrary raster read through arcpy.RasterToNumPyArray (for other formats)."""
+    from arcpy_backend import arcpy
+
+    raster = arcpy.Raster(path)
+    width, height, bands = raster.width, raster.height, raster.bandCount
+    cell_width, cell_height = raster.meanCellWidth, raster.meanCellHeight
+    x0, y_top = raster.extent.XMin, raster.extent.YMax
+    across = -(-width // window)
+    down = -(-height // window)
+
+    def decode(i):
+        row, col = divmod(i, across)
+        rows = min(window, height - row * window)
+        cols = min(window, width - col * window)
+        corner = arcpy.Point(x0 + col * window * cell_width, y_top - (row * window + rows) * cell_height)
+        array = arcpy.RasterToNumPyArray(raster, corner, cols, rows)
+        array = array.reshape(bands, rows, cols) if bands > 1 else array[np.newaxis]
+        return [(band, array[band]) for band in range(bands)]
+
+    dtype = np.dtype(arcpy.RasterToNumPyArray(raster, arcpy.Point(x0, y_top - cell_height), 1, 1).dtype)
+    return _Blocks(across * down, decode, bands, dtype, raster.noDataValue, lambda: None)
+
+
+def _open_blocks(path):
+    with open(path, "rb") as f:
+        signature = f.read(15)
+    try:
+        if signature[:2] in (b"II", b"MM"):
+            return _tiff_blocks(path)
+        if signature == b"EHFA_HEADER_TAG":
+            return _img_blocks(path)
+    except NotImplementedError:
+        pass
+    return _arcpy_blocks(path)
+
+
+def default_histogram_range(dtype):
+    """Fixed histogram range for 8/16-bit integer data (one bin per value for 8-bit); None otherwise."""
+    dtype = np.dtype(dtype)
+    if dtype.kind in "iu" and dtype.itemsize <= 2:
+        info = np.iinfo(dtype)
+        return float(info.min), float(info.max) + 1.0
+    return None
+
+
+def _aggregate(blocks, indices, bins, hist_range, nodata):
+    stats = [BandStatistics(bins, hist_range[band]) for band in range(blocks.bands)]
+    for i in indices:
+        for band, values in blocks.decode(i):
+            stats[band].update(values, nodata)
+    return stats
+
+
+def raster_statistics(path, bins=256, hist_range=None, nodata=None, max_workers=4):
+    """
+    Per-band statistics of a raster, computed block by block with bounded memory.
+
+    Parameters
+    ----------
+    path : str
+        GeoTIFF, ERDAS .img or any raster arcpy can read.
+    bins : int, optional
+        Histogram bins per band (default 256).
+    hist_range : tuple(float, float), optional
+        Histogram range for every band. By default 8/16-bit integer rasters use
+        their full type range; other types are scanned once for min/max first
+        (a second, histogram-only pass).
+    nodata : float, optional
+        NoData value; defaults to the one stored in the file. NaN is always NoData.
+    max_workers : int, optional
+        Threads decoding and aggregating blocks concurrently (default 4).
+
+    Returns
+    -------
+    list of dict
+        One BandStatistics.result() per band.
+    """
+    blocks = _open_blocks(path)
+    try:
+        nodata = blocks.nodata if nodata is None else nodata
+        n_workers = max(1, min(max_workers, blocks.count))
+        shards = [range(i, blocks.count, n_workers) for i in range(n_workers)]
+
+        def run(ranges):
+            with ThreadPoolExecutor(max_workers=n_workers) as executor:
+                partials = list(executor.map(lambda indices: _aggregate(blocks, indices, bins, ranges, nodata), shards))
+            merged = partials[0]
+            for partial in partials[1:]:
+                for total, part in zip(merged, partial):
+                    total.merge(part)
+            return merged
+
+        band_range = hist_range or default_histogram_range(blocks.dtype)
+        if band_range is not None:
+            merged = run([band_range] * blocks.bands)
+        else:
+            # Histogram bins for float / 32-bit data need the value range first
+            merged = run([None] * blocks.bands)
+            ranges = [(s.minimum, s.maximum if s.maximum > s.minimum else s.minimum + 1) if s.count else (0.0, 1.0)
+                      for s in merged]
+            for total, histogram_pass in zip(merged, run(ranges)):
+                total.hist_range = histogram_pass.hist_range
+                total.histogram = histogram_pass.histogram
+        return [band.result() for band in merged]
+    finally:
+        blocks.close()
+
+
+def format_statistics(statistics):
+    """Plain-text table of raster_statistics() results."""
+    lines = [f"{'Band':<5}{'Min':>14}{'Max':>14}{'Mean':>14}{'Std':>14}{'NoData %':>10}"]
+    for band, s in enumerate(statistics, 1):
+        if s["count"]:
+            lines.append(f"{band:<5}{s['min']:>14.4f}{s['max']:>14.4f}{s['mean']:>14.4f}{s['std']:>14.4f}"
+                         f"{100 * s['nodata_fraction']:>10.2f}")
+        else:
+            lines.append(f"{band:<5}{'(all NoData)':>56}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    import sys
+
+    for raster_path in sys.argv[1:] or [os.path.join("Guayas", "Salinas_2_.img")]:
+        print(raster_path)
+        print(format_statistics(raster_statistics(raster_path)))
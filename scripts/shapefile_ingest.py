@@ -0,0 +1,266 @@
+"""
+Incremental, parallel loading of shapefiles into a file geodatabase.
+
+A JSON manifest next to the geodatabase records, for every source already
+loaded, its size, modification time and content hash. Sources whose size and
+mtime are unchanged are skipped without being read; touched files are hashed
+(in the workers) and only reloaded when their content changed. Copies run in
+a process pool where every worker writes to its own staging geodatabase, so
+workers never contend for the output geodatabase's locks; staged feature
+classes are merged into the output by the parent process.
+"""
+
+import contextlib
+import hashlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from arcpy_backend import arcpy
+from split_by_attributes import sanitize_fc_name
+
+SHAPEFILE_PARTS = (".shp", ".shx", ".dbf", ".prj", ".cpg")
+
+
+def shapefile_files(path):
+    """The existing component files of a shapefile (.shp, .shx, .dbf, .prj, .cpg)."""
+    base = os.path.splitext(path)[0]
+    return [base + ext for ext in SHAPEFILE_PARTS if os.path.exists(base + ext)]
+
+
+def shapefile_signature(path):
+    """Total size in bytes and latest mtime (ns) of a shapefile's component files."""
+    stats = [os.stat(name) for name in shapefile_files(path)]
+    return sum(s.st_size for s in stats), max((s.st_mtime_ns for s in stats), default=0)
+
+
+def shapefile_hash(path, chunk_size=1 << 20):
+    """SHA-1 over the contents of a shapefile's component files."""
+    digest = hashlib.sha1()
+    for name in shapefile_files(path):
+        digest.update(os.path.splitext(name)[1].lower().encode("ascii"))
+        with open(name, "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def default_manifest_path(output_gdb):
+    """The manifest sits next to the geodatabase: coverage.gdb -> coverage.gdb.manifest.json."""
+    return os.path.abspath(output_gdb).rstrip("\\/") + ".manifest.json"
+
+
+def load_manifest(path):
+    """Read a manifest ({source path: entry}); a missing file is an empty manifest."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_manifest(manifest, path):
+    """Write the manifest atomically (a crash never leaves a truncated file)."""
+    temporary = path + ".tmp"
+    with open(temporary, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(temporary, path)
+
+
+_worker_workspace = {}
+
+
+def _init_worker(scratch_root):
+    """Give each worker process its own staging file geodatabase."""
+    worker_dir = tempfile.mkdtemp(prefix=f"shapefile_ingest_{os.getpid()}_", dir=scratch_root)
+    arcpy.management.CreateFileGDB(worker_dir, "staging.gdb")
+    _worker_workspace["gdb"] = os.path.join(worker_dir, "staging.gdb")
+    arcpy.env.overwriteOutput = True
+
+
+def _stage_in_worker(source, name, known_hash=None):
+    """Hash one shapefile and, if its content is new, copy it into the worker's staging geodatabase."""
+    log = io.StringIO()
+    start = time.perf_counter()
+    result = {"input": source, "name": name, "status": "failed", "features": 0, "staged": None,
+              "worker": os.getpid()}
+    try:
+        result["size"], result["mtime_ns"] = shapefile_signature(source)
+        result["sha1"] = shapefile_hash(source)
+        if result["sha1"] == known_hash:
+            result["status"] = "unchanged"  # touched, but the content is the same
+        else:
+            staged = os.path.join(_worker_workspace["gdb"], name)
+            with contextlib.redirect_stdout(log):
+                arcpy.management.CopyFeatures(source, staged)
+            result["features"] = int(arcpy.management.GetCount(staged)[0])
+            result["staged"] = staged
+            result["status"] = "loaded"
+    except Exception as e:
+        print(e, file=log)
+    result["seconds"] = time.perf_counter() - start
+    result["log"] = log.getvalue()
+    return result
+
+
+def plan_ingest(shapefiles, output_gdb, manifest, force=False):
+    """
+    Decide which shapefiles need loading.
+
+    Returns
+    -------
+    tuple(list, list)
+        (to_load, skipped). to_load holds (source, output name, known hash)
+        triples; the known hash is set when only the mtime/size changed, so
+        the worker can skip files whose content is the same. skipped holds
+        result dicts for sources that are unchanged or missing.
+    """
+    used_names = {entry["output"].lower() for entry in manifest.values()}
+    to_load, skipped = [], []
+    for shapefile in shapefiles:
+        source = os.path.abspath(shapefile)
+        if not os.path.exists(source):
+            skipped.append({"input": source, "name": None, "status": "missing", "features": 0, "seconds": 0.0,
+                            "log": "Shapefile not found.", "worker": None})
+            continue
+
+        entry = manifest.get(source)
+        if entry is not None:
+            name = entry["output"]
+        else:
+            base = name = sanitize_fc_name(os.path.splitext(os.path.basename(source))[0])
+            suffix = 0
+            while name.lower() in used_names:  # same file name in different folders
+                suffix += 1
+                name = f"{base}_{suffix}"
+            used_names.add(name.lower())
+
+        output_exists = entry is not None and arcpy.Exists(os.path.join(output_gdb, name))
+        size, mtime_ns = shapefile_signature(source)
+        if not force and output_exists and (entry["size"], entry["mtime_ns"]) == (size, mtime_ns):
+            skipped.append({"input": source, "name": name, "status": "unchanged", "features": entry["features"],
+                            "seconds": 0.0, "log": "", "worker": None})
+        else:
+            to_load.append((source, name, entry["sha1"] if entry and output_exists and not force else None))
+    return to_load, skipped
+
+
+def ingest_shapefiles(shapefiles, output_gdb, manifest_path=None, max_workers=None, scratch_root=None, force=False):
+    """
+    Load new or changed shapefiles into a file geodatabase, in parallel.
+
+    Parameters
+    ----------
+    shapefiles : list of str
+        Source shapefiles. Each becomes a feature class named after the file
+        (sanitized like sanitize_fc_name; clashing names get a numeric suffix).
+    output_gdb : str
+        Target file geodatabase; created if needed.
+    manifest_path : str, optional
+        Manifest JSON file (default: "<output_gdb>.manifest.json").
+    max_workers : int, optional
+        Worker processes (default: number of CPUs).
+    scratch_root : str, optional
+        Folder for the per-worker staging geodatabases (default: the system
+        temporary folder).
+    force : bool, optional
+        Reload every shapefile regardless of the manifest.
+
+    Returns
+    -------
+    dict
+        "results" (one dict per source, in input order, with "input", "name",
+        "status" — loaded, unchanged, missing or failed — "features",
+        "seconds", "worker" and "log"), "seconds" (wall time), "bytes" (size
+        of the sources loaded) and "features" (features loaded).
+    """
+    start = time.perf_counter()
+    output_gdb = os.path.abspath(output_gdb)
+    if not arcpy.Exists(output_gdb):
+        arcpy.management.CreateFileGDB(os.path.dirname(output_gdb), os.path.basename(output_gdb))
+    manifest_path = manifest_path or default_manifest_path(output_gdb)
+    manifest = load_manifest(manifest_path)
+
+    to_load, skipped = plan_ingest(shapefiles, output_gdb, manifest, force)
+    results = {result["input"]: result for result in skipped}
+    loaded_bytes = 0
+
+    scratch_root = tempfile.mkdtemp(prefix="shapefile_ingest_", dir=scratch_root)
+    try:
+        if to_load:
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                     initargs=(scratch_root,)) as executor:
+                futures = {executor.submit(_stage_in_worker, *job): job for job in to_load}
+                for future in as_completed(futures):
+                    source, name, _ = futures[future]
+                    try:
+                        result = future.result()
+                    except Exception as e:  # e.g. a worker that could not start
+                        result = {"input": source, "name": name, "status": "failed", "features": 0,
+                                  "staged": None, "seconds": 0.0, "log": str(e), "worker": None}
+
+                    if result["status"] == "loaded":
+                        # Merge: replace the output feature class with the staged copy
+                        target = os.path.join(output_gdb, name)
+                        try:
+                            if arcpy.Exists(target):
+                                arcpy.management.Delete(target)
+                            arcpy.management.Copy(result["staged"], target)
+                            loaded_bytes += result["size"]
+                        except arcpy.ExecuteError:
+                            result["status"] = "failed"
+                            result["log"] += arcpy.GetMessages(2)
+                    if result["status"] == "unchanged":
+                        result["features"] = manifest[source]["features"]
+                    if result["status"] in ("loaded", "unchanged"):
+                        loaded_at = manifest.get(source, {}).get("loaded_at")
+                        manifest[source] = {
+                            "output": name, "size": result["size"], "mtime_ns": result["mtime_ns"],
+                            "sha1": result["sha1"], "features": result["features"],
+                            "loaded_at": time.strftime("%Y-%m-%dT%H:%M:%S") if result["status"] == "loaded" else loaded_at,
+                        }
+                    result.pop("staged", None)
+                    results[source] = result
+    finally:
+        save_manifest(manifest, manifest_path)
+        shutil.rmtree(scratch_root, ignore_errors=True)
+
+    ordered = [results[os.path.abspath(shapefile)] for shapefile in shapefiles]
+    return {
+        "results": ordered,
+        "seconds": time.perf_counter() - start,
+        "bytes": loaded_bytes,
+        "features": sum(r["features"] for r in ordered if r["status"] == "loaded"),
+    }
+
+
+def format_ingest_report(report):
+    """Render ingest_shapefiles output as a status table with throughput figures."""
+    headers = ("Input", "Status", "Features", "Seconds", "Feature class")
+    rows = [
+        (r["input"], r["status"], str(r["features"]), f"{r['seconds']:.1f}", r["name"] or "-")
+        for r in report["results"]
+    ]
+    widths = [max(len(str(row[i])) for row in rows + [headers]) for i in range(len(headers))]
+
+    def render(row):
+        return "  ".join(str(cell).ljust(width) for cell, width in zip(row, widths)).rstrip()
+
+    lines = [render(headers), render(["-" * width for width in widths])]
+    lines += [render(row) for row in rows]
+
+    counts = {}
+    for r in report["results"]:
+        counts[r["status"]] = counts.get(r["status"], 0) + 1
+    seconds = max(report["seconds"], 1e-9)
+    lines.append("\n" + ", ".join(f"{n} {status}" for status, n in sorted(counts.items())) + f" in {seconds:.1f} s")
+    lines.append(f"Throughput: {report['features'] / seconds:,.0f} features/s, "
+                 f"{report['bytes'] / 2 ** 20 / seconds:,.1f} MiB/s")
+
+    for r in report["results"]:
+        if r["status"] == "failed" and r["log"]:
+            lines.append(f"\n--- {r['input']} ---\n{r['log'].rstrip()}")
+    return "\n".join(lines)
@@ -0,0 +1,178 @@
+import datetime
+import os
+import struct
+
+import numpy as np
+
+from shapefile_writer import SHAPE_NULL, SHAPE_POINT, SHAPE_POLYGON
+
+SHAPE_POLYLINE = 3
+SHAPE_MULTIPOINT = 8
+
+_FILE_HEADER_SIZE = 100
+_DBF_FIELD_SIZE = 32
+
+
+class ShapefileReader:
+    """
+    Sequential reader for point, multipoint, polyline and polygon shapefiles.
+
+    The counterpart of ShapefileWriter: records are read one at a time from
+    the .shp and .dbf files, and each shape's coordinates are sliced out of
+    the record buffer as NumPy arrays, so memory stays bounded however large
+    the file is. Z and M values are dropped.
+
+    Parameters
+    ----------
+    path : str
+        The .shp path (or its base name); the sibling files share it.
+    encoding : str, optional
+        Text encoding of the .dbf. Defaults to the .cpg contents, or
+        Latin-1 when there is no .cpg (the historical shapefile default).
+
+    Attributes
+    ----------
+    shape_type : int
+        Base shape type (Z/M variants are reported as their 2D type).
+    fields : list of tuple
+        dBase fields as (name, type, length, decimals).
+    bbox : tuple
+        (xmin, ymin, xmax, ymax) from the file header.
+    wkt : str or None
+        The .prj contents.
+    """
+
+    def __init__(self, path, encoding=None):
+        base = os.path.splitext(path)[0]
+        self.path = base + ".shp"
+
+        self.wkt = None
+        if os.path.exists(base + ".prj"):
+            with open(base + ".prj", "r", encoding="ascii", errors="replace") as prj:
+                self.wkt = prj.read().strip()
+        if encoding is None:
+            encoding = "latin-1"
+            if os.path.exists(base + ".cpg"):
+                with open(base + ".cpg", "r", encoding="ascii", errors="replace") as cpg:
+                    encoding = cpg.read().strip() or encoding
+        self.encoding = encoding
+
+        self._shp = open(base + ".shp", "rb")
+        self._dbf = open(base + ".dbf", "rb") if os.path.exists(base + ".dbf") else None
+
+        header = self._shp.read(_FILE_HEADER_SIZE)
+        file_code, file_words = struct.unpack_from(">i20xi", header)
+        if file_code != 9994:
+            raise ValueError(f"{self.path} is not a shapefile.")
+        shape_type, *bbox = struct.unpack_from("<4x i4d", header, 28)
+        self.file_length = 2 * file_words
+        self.shape_type = shape_type % 10 if shape_type else SHAPE_NULL
+        self.bbox = tuple(bbox)
+
+        self.fields = []
+        self.record_count = 0
+        if self._dbf is not None:
+            dbf_header = self._dbf.read(32)
+            self.record_count, header_length, self._record_length = struct.unpack_from("<4xIHH", dbf_header)
+            descriptors = self._dbf.read(header_length - 32)
+            for start in range(0, len(descriptors) - 1, _DBF_FIELD_SIZE):
+                if descriptors[start] == 0x0D:
+                    break
+                name, ftype, length, decimals = struct.unpack_from("<11sc4xBB", descriptors, start)
+                self.fields.append((name.split(b"\x00")[0].decode("ascii", "replace"), ftype.decode("ascii"),
+                                    length, decimals))
+            self._header_length = header_length
+        else:
+            self.record_count = None  # counted from the .shp as records are read
+
+    def __len__(self):
+        if self.record_count is None:
+            raise TypeError("The record count is unknown without a .dbf file.")
+        return self.record_count
+
+    @property
+    def field_names(self):
+        return [name for name, _, _, _ in self.fields]
+
+    def _decode_field(self, raw, ftype, decimals):
+        if ftype == "L":
+            return {b"T": True, b"t": True, b"Y": True, b"y": True,
+                    b"F": False, b"f": False, b"N": False, b"n": False}.get(raw[:1])
+        text = raw.strip(b" \x00")
+        if ftype in ("C", "M"):
+            return text.decode(self.encoding, "replace")
+        if not text or text.startswith(b"*"):
+            return None
+        if ftype in ("N", "F"):
+            return float(text) if decimals or ftype == "F" or b"." in text else int(text)
+        if ftype == "D":
+            try:
+                return datetime.date(int(text[:4]), int(text[4:6]), int(text[6:8]))
+            except ValueError:
+                return None
+        return text.decode(self.encoding, "replace")
+
+    def _read_attributes(self):
+        if self._dbf is None:
+            return {}
+        record = self._dbf.read(self._record_length)
+        position, attributes = 1, {}  # skip the deletion flag
+        for name, ftype, length, decimals in self.fields:
+            attributes[name] = self._decode_field(record[position:position + length], ftype, decimals)
+            position += length
+        return attributes
+
+    def _parse_shape(self, content):
+        """(x, y, part_offsets) arrays for a record, or None for a null shape."""
+        shape_type = struct.unpack_from("<i", content)[0] % 10 if content else SHAPE_NULL
+        if shape_type == SHAPE_NULL:
+            return None
+        if shape_type == SHAPE_POINT:
+            x, y = struct.unpack_from("<2d", content, 4)
+            return np.array([x]), np.array([y]), np.array([0, 1])
+        if shape_type == SHAPE_MULTIPOINT:
+            n_points = struct.unpack_from("<i", content, 36)[0]
+            coords = np.frombuffer(content, dtype="<f8", count=2 * n_points, offset=40).reshape(-1, 2)
+            return coords[:, 0].astype(np.float64), coords[:, 1].astype(np.float64), np.array([0, n_points])
+        if shape_type in (SHAPE_POLYLINE, SHAPE_POLYGON):
+            n_parts, n_points = struct.unpack_from("<2i", content, 36)
+            parts = np.frombuffer(content, dtype="<i4", count=n_parts, offset=44).astype(np.intp)
+            coords = np.frombuffer(content, dtype="<f8", count=2 * n_points, offset=44 + 4 * n_parts).reshape(-1, 2)
+            return (coords[:, 0].astype(np.float64), coords[:, 1].astype(np.float64),
+                    np.concatenate([parts, [n_points]]))
+        raise ValueError(f"Unsupported shape type {shape_type} in {self.path}.")
+
+    def __iter__(self):
+        """
+        Yield (shape, attributes) per record.
+
+        shape is None for null shapes, otherwise (x, y, part_offsets) with
+        part i occupying x[part_offsets[i]:part_offsets[i + 1]]. Points come
+        back as one-vertex arrays. attributes is a dict keyed by field name.
+        """
+        self._shp.seek(_FILE_HEADER_SIZE)
+        if self._dbf is not None:
+            self._dbf.seek(self._header_length)
+        position = _FILE_HEADER_SIZE
+        count = 0
+        while position < self.file_length and (self.record_count is None or count < self.record_count):
+            header = self._shp.read(8)
+            if len(header) < 8:
+                break
+            content_words = struct.unpack(">2i", header)[1]
+            content = self._shp.read(2 * content_words)
+            position += 8 + 2 * content_words
+            count += 1
+            yield self._parse_shape(content), self._read_attributes()
+
+    def close(self):
+        for handle in (self._shp, self._dbf):
+            if handle is not None:
+                handle.close()
+        self._shp = self._dbf = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,480 @@
+import datetime
+import os
+import struct
+
+import numpy as np
+
+SHAPE_NULL = 0
+SHAPE_POINT = 1
+SHAPE_POLYGON = 5
+
+_FILE_HEADER_SIZE = 100
+_DBF_FIELD_SIZE = 32
+
+
+def infer_fields(attributes):
+    """
+    Guess dBase field definitions from one record's attribute dict.
+
+    Returns a list of (name, type, length, decimals) tuples: integers become
+    N(18, 0), floats N(19, 8), booleans L(1) and everything else C(254).
+    """
+    fields = []
+    for name, value in attributes.items():
+        if isinstance(value, bool):
+            fields.append((name, "L", 1, 0))
+        elif isinstance(value, (int, np.integer)):
+            fields.append((name, "N", 18, 0))
+        elif isinstance(value, (float, np.floating)):
+            fields.append((name, "N", 19, 8))
+        else:
+            fields.append((name, "C", 254, 0))
+    return fields
+
+
+class ShapefileWriter:
+    """
+    Streaming writer for a multi-record polygon (or point) shapefile.
+
+    Records are appended to the .shp/.shx/.dbf files as they arrive through a
+    write buffer; only the file headers (record count, bounding box and file
+    length) are patched when the writer is closed, so memory stays bounded no
+    matter how many records are written. A .prj (from an EPSG code or WKT) and
+    a UTF-8 .cpg are written alongside.
+
+    Parameters
+    ----------
+    path : str
+        Output .shp path; the sibling files share its base name.
+    fields : list of tuple
+        dBase fields as (name, type, length, decimals). Types: "C" (text),
+        "N" (numeric), "F" (float), "L" (logical), "D" (date, YYYYMMDD).
+        Names are truncated to the 10 characters dBase allows; names that
+        collide after truncation get a _1, _2, ... suffix. Attribute dicts
+        are still keyed by the full names.
+    shape_type : int, optional
+        SHAPE_POLYGON (default) or SHAPE_POINT.
+    epsg : int, optional
+        WGS 84 or WGS 84 / UTM EPSG code used to write the .prj file.
+    wkt : str, optional
+        Explicit .prj contents; takes precedence over `epsg`.
+    buffer_size : int, optional
+        Bytes buffered in memory before each flush to disk (default 4 MiB).
+
+    Attributes
+    ----------
+    records_written : int
+        Records in the file so far (including the existing ones of a
+        shapefile opened with `append`).
+
+    Notes
+    -----
+    `ShapefileWriter.append(path)` opens an existing shapefile instead and
+    adds records after the last one, so inserting n rows costs O(n) no
+    matter how large the file already is.
+    """
+
+    def __init__(self, path, fields, shape_type=SHAPE_POLYGON, epsg=None, wkt=None, buffer_size=4 << 20):
+        if shape_type not in (SHAPE_POLYGON, SHAPE_POINT):
+            raise ValueError("Only polygon and point shapefiles are supported.")
+
+        base = os.path.splitext(path)[0]
+        folder = os.path.dirname(os.path.abspath(base))
+        if not os.path.exists(folder):
+            os.makedirs(folder)
+
+        self.path = base + ".shp"
+        self.shape_type = shape_type
+        self._set_fields(fields)
+        self.encoding = "utf-8"
+        self.records_written = 0
+        self.buffer_size = buffer_size
+        self._appending = False
+
+        self._bbox = [np.inf, np.inf, -np.inf, -np.inf]
+        self._shp_offset = _FILE_HEADER_SIZE  # bytes
+        self._shp = open(base + ".shp", "wb")
+        self._shx = open(base + ".shx", "wb")
+        self._dbf = open(base + ".dbf", "wb")
+        self._shp_buffer = bytearray()
+        self._shx_buffer = bytearray()
+        self._dbf_buffer = bytearray()
+
+        # Placeholder headers, rewritten with the final values in close()
+        self._shp.write(bytes(_FILE_HEADER_SIZE))
+        self._shx.write(bytes(_FILE_HEADER_SIZE))
+        self._write_dbf_header()
+
+        if wkt is None and epsg is not None:
+            from utm_projection import esri_wkt
+            wkt = esri_wkt(epsg)
+        if wkt is not None:
+            with open(base + ".prj", "w", encoding="ascii") as prj:
+                prj.write(wkt)
+        with open(base + ".cpg", "w", encoding="ascii") as cpg:
+            cpg.write("UTF-8")
+
+    @classmethod
+    def append(cls, path, buffer_size=4 << 20):
+        """
+        Open an existing polygon or point shapefile to add records in place.
+
+        New records are written after the last .shp/.shx/.dbf record; the
+        record count, bounding box and file lengths in the headers are
+        patched on close. Text is encoded with the .cpg encoding (Latin-1
+        without one), like ShapefileReader decodes it.
+
+        Parameters
+        ----------
+        path : str
+            The .shp path (or its base name).
+        buffer_size : int, optional
+            Bytes buffered in memory before each flush to disk (default 4 MiB).
+
+        Raises
+        ------
+        ValueError
+            If the file is not a 2D polygon or point shapefile with a .dbf
+            this class can write.
+        """
+        base = os.path.splitext(path)[0]
+        self = cls.__new__(cls)
+        self.path = base + ".shp"
+        self.buffer_size = buffer_size
+        self._appending = True
+        self.encoding = "latin-1"
+        if os.path.exists(base + ".cpg"):
+            with open(base + ".cpg", "r", encoding="ascii", errors="replace") as cpg:
+                self.encoding = cpg.read().strip() or self.encoding
+
+        handles = []
+        try:
+            for ext in (".shp", ".shx", ".dbf"):
+                handles.append(open(base + ext, "r+b"))
+            self._shp, self._shx, self._dbf = handles
+            header = self._shp.read(_FILE_HEADER_SIZE)
+            file_code, file_words = struct.unpack_from(">i20xi", header)
+            shape_type, *bbox = struct.unpack_from("<4xi4d", header, 28)
+            if file_code != 9994 or shape_type not in (SHAPE_POLYGON, SHAPE_POINT):
+                raise ValueError(f"{self.path} is not a 2D polygon or point shapefile.")
+            self.shape_type = shape_type
+
+            self.records_written, header_length, record_length = struct.unpack("<4xIHH", self._dbf.read(12))
+            self._dbf.seek(32)
+            descriptors = self._dbf.read(header_length - 32)
+            fields = []
+            for start in range(0, len(descriptors) - 1, _DBF_FIELD_SIZE):
+                if descriptors[start] == 0x0D:
+                    break
+                name, ftype, length, decimals = struct.unpack_from("<11sc4xBB", descriptors, start)
+                fields.append((name.split(b"\x00")[0].decode("ascii", "replace"), ftype.decode("ascii"),
+                               length, decimals))
+            self._set_fields(fields)
+            if record_length != 1 + sum(length for _, _, length, _ in self.fields):
+                raise ValueError(f"{self.path}: the .dbf record length does not match its fields.")
+
+            self._bbox = list(bbox) if self.records_written else [np.inf, np.inf, -np.inf, -np.inf]
+            self._shp_offset = 2 * file_words
+            # Position after the last record, dropping anything past it (such as the .dbf end-of-file marker)
+            for handle, end in ((self._shp, self._shp_offset),
+                                (self._shx, _FILE_HEADER_SIZE + 8 * self.records_written),
+                                (self._dbf, header_length + record_length * self.records_written)):
+                handle.seek(end)
+                handle.truncate()
+        except BaseException:
+            for handle in handles:
+                handle.close()
+            raise
+        self._shp_buffer = bytearray()
+        self._shx_buffer = bytearray()
+        self._dbf_buffer = bytearray()
+        return self
+
+    def _set_fields(self, fields):
+        self.fields = []
+        self._keys = []  # attribute keys, before truncation to dBase field names
+        taken = set()
+        for name, ftype, length, decimals in fields:
+            ftype = ftype.upper()
+            if ftype not in ("C", "N", "F", "L", "D"):
+                raise ValueError(f"Unsupported dBase field type '{ftype}' for field '{name}'.")
+            length = {"D": 8, "L": 1}.get(ftype, length)
+            # Names that collide once cut to 10 characters become Name_1, Name_2, ... (still 10 at most)
+            field_name, suffix = name[:10], 0
+            while field_name.lower() in taken:
+                suffix += 1
+                field_name = f"{name[:9 - len(str(suffix))]}_{suffix}"
+            taken.add(field_name.lower())
+            self.fields.append((field_name, ftype, int(length), int(decimals)))
+            self._keys.append(name)
+
+    def _write_dbf_header(self, record_count=0):
+        header_length = 32 + _DBF_FIELD_SIZE * len(self.fields) + 1
+        record_length = 1 + sum(length for _, _, length, _ in self.fields)
+        today = datetime.date.today()
+
+        header = struct.pack("<BBBBIHH20x", 0x03, today.year - 1900, today.month, today.day,
+                             record_count, header_length, record_length)
+        descriptors = b"".join(
+            struct.pack("<11sc4xBB14x", name.encode("ascii", "replace"), ftype.encode("ascii"), length, decimals)
+            for name, ftype, length, decimals in self.fields
+        )
+        self._dbf.seek(0)
+        self._dbf.write(header + descriptors + b"\r")
+
+    def _encode_field(self, value, ftype, length, decimals):
+        """Encode one value as exactly `length` bytes of a fixed-width dBase record."""
+        if ftype == "L":
+            return b"?" if value is None else (b"T" if value else b"F")
+        if value is None:
+            return b" " * length
+        if ftype in ("N", "F"):
+            text = f"{float(value):.{decimals}f}" if decimals else str(int(value))
+            if len(text) > length:
+                raise ValueError(f"Value {value!r} does not fit in a {ftype}({length}, {decimals}) field.")
+            return text.rjust(length).encode("ascii")
+        if ftype == "D":
+            text = value.strftime("%Y%m%d") if isinstance(value, (datetime.date, datetime.datetime)) else str(value)
+            return text[:8].ljust(8).encode("ascii")
+        # Truncate on a character boundary so multi-byte UTF-8 text stays valid.
+        encoded = str(value).encode(self.encoding, "replace")
+        if len(encoded) > length:
+            encoded = encoded[:length].decode(self.encoding, "ignore").encode(self.encoding)
+        return encoded.ljust(length)
+
+    def _write_attributes(self, attributes):
+        self._dbf_buffer += b" "  # record not deleted
+        for key, (_, ftype, length, decimals) in zip(self._keys, self.fields):
+            self._dbf_buffer += self._encode_field(attributes.get(key), ftype, length, decimals)
+
+    def _write_shape(self, content, bbox):
+        self.records_written += 1
+        content_words = len(content) // 2
+
+        self._shx_buffer += struct.pack(">ii", self._shp_offset // 2, content_words)
+        self._shp_buffer += struct.pack(">ii", self.records_written, content_words)
+        self._shp_buffer += content
+        self._shp_offset += 8 + len(content)
+
+        if bbox is not None:
+            self._bbox[0] = min(self._bbox[0], bbox[0])
+            self._bbox[1] = min(self._bbox[1], bbox[1])
+            self._bbox[2] = max(self._bbox[2], bbox[2])
+            self._bbox[3] = max(self._bbox[3], bbox[3])
+
+        if len(self._shp_buffer) + len(self._dbf_buffer) >= self.buffer_size:
+            self.flush()
+
+    def add_polygon(self, rings, attributes=None, exteriors=None):
+        """
+        Append one polygon record.
+
+        Parameters
+        ----------
+        rings : list
+            One or more rings, each a sequence of (X, Y) pairs or an (n, 2)
+            array. The first ring is the exterior; further rings are holes.
+            Rings are closed if needed and re-oriented to the shapefile
+            convention (exterior clockwise, holes counter-clockwise). The
+            caller's sequences are never modified.
+        attributes : dict, optional
+            Field values keyed by field name; missing fields are left blank.
+        exteriors : sequence of bool, optional
+            Which rings are exteriors, for multi-part polygons (each exterior
+            followed by its holes). Defaults to only the first ring.
+        """
+        if self.shape_type != SHAPE_POLYGON:
+            raise ValueError("This shapefile was created for points, not polygons.")
+
+        parts, points = [], []
+        n_points = 0
+        for i, ring in enumerate(rings):
+            coords = np.asarray(ring, dtype=np.float64).reshape(-1, 2)
+            if len(coords) == 0:
+                continue
+            if coords[0, 0] != coords[-1, 0] or coords[0, 1] != coords[-1, 1]:
+                coords = np.vstack([coords, coords[:1]])
+
+            # Shoelace sign (relative to the first vertex for precision): < 0 is clockwise.
+            dx, dy = coords[:, 0] - coords[0, 0], coords[:, 1] - coords[0, 1]
+            clockwise = float(np.dot(dx[:-1], dy[1:]) - np.dot(dx[1:], dy[:-1])) < 0
+            if clockwise != (i == 0 if exteriors is None else bool(exteriors[i])):
+                coords = coords[::-1]
+
+            parts.append(n_points)
+            points.append(coords)
+            n_points += len(coords)
+
+        if not points:
+            self._write_shape(struct.pack("<i", SHAPE_NULL), None)
+        else:
+            points = np.concatenate(points)
+            bbox = (*points.min(axis=0), *points.max(axis=0))
+            content = (
+                struct.pack("<i4dii", SHAPE_POLYGON, *bbox, len(parts), n_points)
+                + np.asarray(parts, dtype="<i4").tobytes()
+                + points.astype("<f8", copy=False).tobytes()
+            )
+            self._write_shape(content, bbox)
+
+        self._write_attributes(attributes or {})
+
+    def add_polygons(self, x, y, offsets, attributes=None):
+        """
+        Append many single-ring polygons in one vectorized pass.
+
+        Ring closing, orientation, bounding boxes and the binary record layout
+        are computed with NumPy for the whole batch and packed into one
+        preallocated buffer, which avoids the per-record overhead of
+        add_polygon. Use add_polygon for polygons with holes or several parts.
+
+        Parameters
+        ----------
+        x, y : array_like
+            Flat vertex coordinates for all rings.
+        offsets : array_like
+            Ring start positions (len(rings) + 1 entries), as produced by
+            sort_utm_clockwise.pack_rings.
+        attributes : dict of sequences, optional
+            Column-wise field values keyed by field name, one entry per ring.
+        """
+        if self.shape_type != SHAPE_POLYGON:
+            raise ValueError("This shapefile was created for points, not polygons.")
+
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        offsets = np.asarray(offsets, dtype=np.intp)
+        counts = np.diff(offsets)
+        n_rings = len(counts)
+        if n_rings == 0:
+            return
+        if np.any(counts < 3):
+            raise ValueError("Every ring needs at least 3 vertices.")
+
+        starts = offsets[:-1]
+        last = offsets[1:] - 1
+        is_open = (x[starts] != x[last]) | (y[starts] != y[last])
+
+        # Gather index of the closed rings: the first vertex is repeated at the
+        # end of every open ring.
+        closed_counts = counts + is_open
+        closed_offsets = np.concatenate([[0], np.cumsum(closed_counts)])
+        ring_ids = np.repeat(np.arange(n_rings), closed_counts)
+        local = np.arange(closed_offsets[-1]) - closed_offsets[:-1][ring_ids]
+        source = starts[ring_ids] + np.where(local < counts[ring_ids], local, 0)
+
+        # Shoelace sign per ring (relative to each ring's first vertex); the
+        # last vertex of each closed ring has no successor and is masked out.
+        dx = x[source] - x[starts][ring_ids]
+        dy = y[source] - y[starts][ring_ids]
+        terms = dx[:-1] * dy[1:] - dx[1:] * dy[:-1]
+        terms[closed_offsets[1:-1] - 1] = 0.0
+        twice_area = np.bincount(ring_ids[:-1], weights=terms, minlength=n_rings)
+        reverse = (twice_area > 0)[ring_ids]  # counter-clockwise exteriors are flipped
+        source = source[closed_offsets[:-1][ring_ids] + np.where(reverse, closed_counts[ring_ids] - 1 - local, local)]
+
+        xy = np.empty((len(source), 2), dtype="<f8")
+        xy[:, 0] = x[source]
+        xy[:, 1] = y[source]
+        bbox = np.column_stack([
+            np.minimum.reduceat(xy[:, 0], closed_offsets[:-1]),
+            np.minimum.reduceat(xy[:, 1], closed_offsets[:-1]),
+            np.maximum.reduceat(xy[:, 0], closed_offsets[:-1]),
+            np.maximum.reduceat(xy[:, 1], closed_offsets[:-1]),
+        ])
+
+        # Record = 8-byte header + 48-byte fixed polygon part + 16 bytes per point
+        record_sizes = 56 + 16 * closed_counts
+        record_starts = np.concatenate([[0], np.cumsum(record_sizes)[:-1]])
+        buffer = np.zeros(int(record_sizes.sum()), dtype=np.uint8)
+
+        def scatter(offset, values, dtype):
+            raw = np.ascontiguousarray(values, dtype=dtype).view(np.uint8).reshape(n_rings, -1)
+            buffer[(record_starts + offset)[:, None] + np.arange(raw.shape[1])] = raw
+
+        record_numbers = self.records_written + 1 + np.arange(n_rings)
+        content_words = (record_sizes - 8) // 2
+        scatter(0, np.column_stack([record_numbers, content_words]), ">i4")
+        scatter(8, np.full(n_rings, SHAPE_POLYGON), "<i4")
+        scatter(12, bbox, "<f8")
+        scatter(44, np.column_stack([np.ones(n_rings), closed_counts, np.zeros(n_rings)]), "<i4")
+
+        point_positions = (record_starts[ring_ids] + 56 + 16 * local)[:, None] + np.arange(16)
+        buffer[point_positions] = xy.view(np.uint8).reshape(-1, 16)
+
+        shx = np.column_stack([(self._shp_offset + record_starts) // 2, content_words]).astype(">i4")
+
+        self._shp_buffer += buffer.tobytes()
+        self._shx_buffer += shx.tobytes()
+        self._shp_offset += len(buffer)
+        self.records_written += n_rings
+        self._bbox = [min(self._bbox[0], bbox[:, 0].min()), min(self._bbox[1], bbox[:, 1].min()),
+                      max(self._bbox[2], bbox[:, 2].max()), max(self._bbox[3], bbox[:, 3].max())]
+
+        self._write_attribute_columns(attributes or {}, n_rings)
+        if len(self._shp_buffer) + len(self._dbf_buffer) >= self.buffer_size:
+            self.flush()
+
+    def _write_attribute_columns(self, columns, n_records):
+        """Encode column-wise attributes into fixed-width dBase records."""
+        blocks = [np.full((n_records, 1), ord(" "), dtype=np.uint8)]  # records not deleted
+        for key, (_, ftype, length, decimals) in zip(self._keys, self.fields):
+            values = columns.get(key)
+            if values is None:
+                values = [None] * n_records
+            encoded = b"".join(self._encode_field(value, ftype, length, decimals) for value in values)
+            blocks.append(np.frombuffer(encoded, dtype=np.uint8).reshape(n_records, length))
+        self._dbf_buffer += np.hstack(blocks).tobytes()
+
+    def add_point(self, x, y, attributes=None):
+        """Append one point record."""
+        if self.shape_type != SHAPE_POINT:
+            raise ValueError("This shapefile was created for polygons, not points.")
+        x, y = float(x), float(y)
+        self._write_shape(struct.pack("<idd", SHAPE_POINT, x, y), (x, y, x, y))
+        self._write_attributes(attributes or {})
+
+    def flush(self):
+        """Write buffered records to disk."""
+        self._shp.write(self._shp_buffer)
+        self._shx.write(self._shx_buffer)
+        self._dbf.write(self._dbf_buffer)
+        self._shp_buffer.clear()
+        self._shx_buffer.clear()
+        self._dbf_buffer.clear()
+
+    def _file_header(self, file_length):
+        bbox = self._bbox if self.records_written and np.isfinite(self._bbox[0]) else [0.0, 0.0, 0.0, 0.0]
+        return (
+            struct.pack(">i20xi", 9994, file_length // 2)
+            + struct.pack("<ii4d4d", 1000, self.shape_type, *bbox, 0.0, 0.0, 0.0, 0.0)
+        )
+
+    def close(self):
+        """Flush the remaining records and patch the file headers."""
+        if self._shp is None:
+            return
+        self.flush()
+
+        self._shp.seek(0)
+        self._shp.write(self._file_header(self._shp_offset))
+        self._shx.seek(0)
+        self._shx.write(self._file_header(_FILE_HEADER_SIZE + 8 * self.records_written))
+
+        self._dbf.write(b"\x1a")
+        if self._appending:
+            # Keep the existing field descriptors (and header length); only the record count changes
+            self._dbf.seek(4)
+            self._dbf.write(struct.pack("<I", self.records_written))
+        else:
+            self._write_dbf_header(self.records_written)
+
+        for handle in (self._shp, self._shx, self._dbf):
+            handle.close()
+        self._shp = self._shx = self._dbf = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,310 @@
+"""
+Point-in-sheet and box-to-sheets lookups over a topographic sheet series.
+
+Sheet series (the cartas of the *ss.json files) are regular grids: every
+sheet has the same width and height and starts on a multiple of them. A
+SheetIndex detects that tiling from the XMin_utm/YMin_utm/XMax_utm/YMax_utm
+records and stores the sheets in a grid hash, so the sheet containing a
+coordinate is two floor divisions and one table lookup, and the sheets
+touching a box are the cells it spans. Sheets that do not fit the grid
+(other sizes, shifted origins, duplicates) go to an STRtree fallback, the
+envelope index also used by carta_index.CartaIndex. Every query takes
+arrays, so millions of GPS points are located in one vectorized call.
+"""
+
+import numpy as np
+
+from carta_index import STRtree
+
+
+def _mode_rows(keys):
+    """The most frequent row of an integer array (first one on ties)."""
+    values, first, counts = np.unique(keys, axis=0, return_index=True, return_counts=True)
+    best = np.lexsort((first, -counts))[0]
+    return values[best]
+
+
+def detect_grid(bounds, tolerance=0.01):
+    """
+    Find the regular grid most sheets are tiles of.
+
+    The grid cell is the most common (width, height) and its origin the most
+    common alignment of the sheet corners; sheets of that size whose lower
+    left corner lies on a grid node (within `tolerance`) are its tiles.
+
+    Parameters
+    ----------
+    bounds : array_like, shape (n, 4)
+        Sheet extents as (xmin, ymin, xmax, ymax) rows.
+    tolerance : float, optional
+        Largest difference in map units still considered equal (default 0.01).
+
+    Returns
+    -------
+    tuple or None
+        ((x0, y0, dx, dy), cells) where cells holds the (column, row) of every
+        sheet, (-1, -1) for sheets off the grid, or None when fewer than two
+        sheets share a grid.
+    """
+    if tolerance <= 0:
+        raise ValueError("tolerance must be positive.")
+    bounds = np.asarray(bounds, dtype=np.float64).reshape(-1, 4)
+    finite = np.isfinite(bounds).all(axis=1)
+    sizes = np.column_stack([bounds[:, 2] - bounds[:, 0], bounds[:, 3] - bounds[:, 1]])
+    valid = finite & (sizes > tolerance).all(axis=1)
+    if np.count_nonzero(valid) < 2:
+        return None
+
+    dx, dy = _mode_rows(np.rint(sizes[valid] / tolerance).astype(np.int64)) * tolerance
+    sized = valid & (np.abs(sizes[:, 0] - dx) <= tolerance) & (np.abs(sizes[:, 1] - dy) <= tolerance)
+
+    # Corner offsets within a cell, wrapped so offsets just below a cell size count as 0
+    steps = np.rint(np.array([dx, dy]) / tolerance).astype(np.int64)
+    phases = np.rint(np.mod(bounds[sized, :2], [dx, dy]) / tolerance).astype(np.int64) % steps
+    px, py = _mode_rows(phases) * tolerance
+
+    columns = (bounds[:, 0] - px) / dx
+    rows = (bounds[:, 1] - py) / dy
+    aligned = sized.copy()
+    aligned[sized] = ((np.abs(columns[sized] - np.rint(columns[sized])) * dx <= tolerance)
+                      & (np.abs(rows[sized] - np.rint(rows[sized])) * dy <= tolerance))
+    if np.count_nonzero(aligned) < 2:
+        return None
+
+    column0 = np.rint(columns[aligned]).min()
+    row0 = np.rint(rows[aligned]).min()
+    cells = np.full((len(bounds), 2), -1, dtype=np.int64)
+    cells[aligned, 0] = np.rint(columns[aligned]) - column0
+    cells[aligned, 1] = np.rint(rows[aligned]) - row0
+    return (px + column0 * dx, py + row0 * dy, dx, dy), cells
+
+
+class SheetIndex:
+    """
+    Grid hash over the sheets of a regular series, with an STRtree for the rest.
+
+    Containment is half-open (xmin <= x < xmax, ymin <= y < ymax), so a
+    point on the edge shared by two sheets belongs to exactly one of them.
+    Where sheets overlap, the first one in record order wins, as in
+    carta_index.CartaIndex.
+
+    Parameters
+    ----------
+    names : list of str
+        Sheet names.
+    bounds : array_like, shape (n, 4)
+        Sheet extents as (xmin, ymin, xmax, ymax).
+    tolerance : float, optional
+        Tolerance of the grid detection in map units (default 0.01).
+    dense_limit : int, optional
+        Largest grid (columns x rows) kept as a dense lookup table (default
+        4M cells); sparser, larger grids use a sorted table and binary search.
+    node_capacity : int, optional
+        Node capacity of the fallback STRtree (default 32).
+    """
+
+    def __init__(self, names, bounds, tolerance=0.01, dense_limit=1 << 22, node_capacity=32):
+        self.names = list(names)
+        self.bounds = np.asarray(bounds, dtype=np.float64).reshape(-1, 4)
+        self.tolerance = tolerance
+        if len(self.names) != len(self.bounds):
+            raise ValueError("names and bounds must have the same length.")
+
+        self.grid = None
+        on_grid = np.zeros(len(self.bounds), dtype=bool)
+        detected = detect_grid(self.bounds, tolerance) if len(self.bounds) else None
+        if detected is not None:
+            self.grid, cells = detected
+            placed = np.flatnonzero(cells[:, 0] >= 0)
+            self.n_columns = int(cells[placed, 0].max()) + 1
+            self.n_rows = int(cells[placed, 1].max()) + 1
+            keys = cells[placed, 1] * self.n_columns + cells[placed, 0]
+            # Duplicated cells keep their first sheet here; the others are indexed by the tree
+            keys, first = np.unique(keys, return_index=True)
+            sheets = placed[first]
+            on_grid[sheets] = True
+            if self.n_columns * self.n_rows <= dense_limit:
+                self._table = np.full(self.n_columns * self.n_rows, -1, dtype=np.intp)
+                self._table[keys] = sheets
+                self._keys = None
+            else:
+                self._keys, self._table = keys, sheets
+
+        self.on_grid = on_grid
+        self._irregular = np.flatnonzero(~on_grid)
+        self._tree = None
+        if len(self._irregular):
+            self._tree = STRtree(self.bounds[self._irregular], node_capacity=node_capacity)
+        if self.grid is not None and self._tree is not None:
+            # Grid cells an irregular sheet reaches into: only points in those (or off the grid) query the tree
+            self._mixed_cells = np.unique(self._spanned_cells(self.bounds[self._irregular])[1])
+
+    def __len__(self):
+        return len(self.names)
+
+    def __repr__(self):
+        return f"SheetIndex({len(self)} sheets, {np.count_nonzero(self.on_grid)} on the grid, {len(self._irregular)} irregular)"
+
+    @classmethod
+    def from_records(cls, cartas, **kwargs):
+        """Build the index from the cartas JSON records (name plus UTM extent keys)."""
+        bounds = [(c["XMin_utm"], c["YMin_utm"], c["XMax_utm"], c["YMax_utm"]) for c in cartas]
+        return cls([c["name"] for c in cartas], bounds, **kwargs)
+
+    def _grid_sheets(self, columns, rows):
+        """Sheet of each (column, row) grid cell given as floats, -1 for empty cells and cells off the grid."""
+        sheets = np.full(len(columns), -1, dtype=np.intp)
+        inside = (columns >= 0) & (columns < self.n_columns) & (rows >= 0) & (rows < self.n_rows)
+        keys = rows[inside].astype(np.int64) * self.n_columns + columns[inside].astype(np.int64)
+        sheets[inside] = self._cell_sheets(keys)
+        return sheets
+
+    def _cell_sheets(self, keys):
+        if self._keys is None:
+            return self._table[keys]
+        positions = np.minimum(np.searchsorted(self._keys, keys), len(self._keys) - 1)
+        return np.where(self._keys[positions] == keys, self._table[positions], -1)
+
+    def _spanned_cells(self, boxes):
+        """(box position, cell key) of the grid cells each box spans, widened by one cell on every side."""
+        x0, y0, dx, dy = self.grid
+        # The extra cells cover sheets whose records stray from the grid lines by up to the tolerance
+        with np.errstate(invalid="ignore"):
+            first_column = np.maximum(np.floor((boxes[:, 0] - x0) / dx) - 1, 0)
+            last_column = np.minimum(np.floor((boxes[:, 2] - x0) / dx) + 1, self.n_columns - 1)
+            first_row = np.maximum(np.floor((boxes[:, 1] - y0) / dy) - 1, 0)
+            last_row = np.minimum(np.floor((boxes[:, 3] - y0) / dy) + 1, self.n_rows - 1)
+        width = np.nan_to_num(last_column - first_column + 1, nan=0).clip(0).astype(np.int64)
+        height = np.nan_to_num(last_row - first_row + 1, nan=0).clip(0).astype(np.int64)
+        counts = width * height
+        spanned = counts > 0
+        query = np.repeat(np.flatnonzero(spanned), counts[spanned])
+        position = np.arange(len(query)) - np.repeat(np.cumsum(counts[spanned]) - counts[spanned], counts[spanned])
+        columns = first_column[query].astype(np.int64) + position % width[query]
+        rows = first_row[query].astype(np.int64) + position // width[query]
+        return query, rows * self.n_columns + columns
+
+    def locate(self, x, y, chunk_size=1 << 20):
+        """
+        Sheet containing each point.
+
+        Parameters
+        ----------
+        x, y : array_like
+            Point coordinates in the sheets' spatial reference.
+        chunk_size : int, optional
+            Points per fallback-tree query (default 1M), which bounds memory.
+
+        Returns
+        -------
+        numpy.ndarray
+            Sheet index of every point, -1 where no sheet contains it (or the
+            coordinates are NaN).
+        """
+        x = np.asarray(x, dtype=np.float64).ravel()
+        y = np.asarray(y, dtype=np.float64).ravel()
+        if len(x) != len(y):
+            raise ValueError("x and y must have the same length.")
+        found = np.full(len(x), -1, dtype=np.intp)
+
+        candidates = None
+        if self.grid is not None:
+            x0, y0, dx, dy = self.grid
+            fx, fy = (x - x0) / dx, (y - y0) / dy
+            columns, rows = np.floor(fx), np.floor(fy)
+            found[:] = self._grid_sheets(columns, rows)
+
+            # Within `tolerance` of a grid line the sheet records decide: the cells on both sides are checked exactly
+            with np.errstate(invalid="ignore"):
+                near = ((np.minimum(fx - columns, columns + 1 - fx) * dx <= self.tolerance)
+                        | (np.minimum(fy - rows, rows + 1 - fy) * dy <= self.tolerance))
+            near = np.flatnonzero(near)
+            if len(near):
+                px, py, near_columns, near_rows = x[near], y[near], columns[near], rows[near]
+                side_x = np.where(fx[near] - near_columns < 0.5, -1, 1)
+                side_y = np.where(fy[near] - near_rows < 0.5, -1, 1)
+                best = np.full(len(near), -1, dtype=np.intp)
+                for column_shift, row_shift in ((0, 0), (side_x, 0), (0, side_y), (side_x, side_y)):
+                    sheets = self._grid_sheets(near_columns + column_shift, near_rows + row_shift)
+                    box = self.bounds[sheets]
+                    contained = ((sheets >= 0) & (box[:, 0] <= px) & (px < box[:, 2])
+                                 & (box[:, 1] <= py) & (py < box[:, 3]))
+                    best = np.where(contained & ((best < 0) | (sheets < best)), sheets, best)
+                found[near] = best
+
+            if self._tree is not None:
+                # Only points in cells an irregular sheet reaches into, or off the grid, can be in one
+                inside = (columns >= 0) & (columns < self.n_columns) & (rows >= 0) & (rows < self.n_rows)
+                mixed = np.zeros(len(x), dtype=bool)
+                if len(self._mixed_cells):
+                    keys = rows[inside].astype(np.int64) * self.n_columns + columns[inside].astype(np.int64)
+                    positions = np.minimum(np.searchsorted(self._mixed_cells, keys), len(self._mixed_cells) - 1)
+                    mixed[inside] = self._mixed_cells[positions] == keys
+                with np.errstate(invalid="ignore"):
+                    candidates = np.flatnonzero(mixed | (~inside & np.isfinite(x) & np.isfinite(y)))
+
+        if self._tree is not None:
+            if candidates is None:
+                candidates = np.arange(len(x))
+            for start in range(0, len(candidates), chunk_size):
+                points = candidates[start:start + chunk_size]
+                cx, cy = x[points], y[points]
+                queries, items = self._tree.query_bulk(np.column_stack([cx, cy, cx, cy]))
+                sheets = self._irregular[items]
+                box = self.bounds[sheets]
+                contained = (cx[queries] < box[:, 2]) & (cy[queries] < box[:, 3])
+                queries, sheets = queries[contained], sheets[contained]
+                # Pairs come sorted by query then item, so the first of each query is its lowest sheet
+                queries, first = np.unique(queries, return_index=True)
+                sheets, points = sheets[first], points[queries]
+                current = found[points]
+                found[points] = np.where((current < 0) | (sheets < current), sheets, current)
+        return found
+
+    def locate_names(self, x, y, **kwargs):
+        """Like locate(), returning sheet names (None outside every sheet) as an object array."""
+        names = np.array(self.names + [None], dtype=object)
+        return names[self.locate(x, y, **kwargs)]
+
+    def touching_bulk(self, boxes):
+        """
+        Sheets whose extent intersects (or touches) each query box.
+
+        Parameters
+        ----------
+        boxes : array_like, shape (m, 4)
+            Query boxes as (xmin, ymin, xmax, ymax) rows. Rows with NaN match
+            nothing.
+
+        Returns
+        -------
+        tuple(numpy.ndarray, numpy.ndarray)
+            Matching (query position, sheet index) pairs, sorted by query then
+            sheet, like STRtree.query_bulk.
+        """
+        boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+        queries, sheets = [], []
+
+        if self.grid is not None and len(boxes):
+            query, keys = self._spanned_cells(boxes)
+            cell_sheets = self._cell_sheets(keys)
+            box, sheet = boxes[query], self.bounds[cell_sheets]
+            hit = ((cell_sheets >= 0) & (sheet[:, 0] <= box[:, 2]) & (sheet[:, 2] >= box[:, 0])
+                   & (sheet[:, 1] <= box[:, 3]) & (sheet[:, 3] >= box[:, 1]))
+            queries.append(query[hit])
+            sheets.append(cell_sheets[hit])
+
+        if self._tree is not None:
+            query, items = self._tree.query_bulk(boxes)
+            queries.append(query)
+            sheets.append(self._irregular[items])
+
+        if not queries:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+        queries, sheets = np.concatenate(queries), np.concatenate(sheets)
+        order = np.lexsort((sheets, queries))
+        return queries[order], sheets[order]
+
+    def touching(self, xmin, ymin, xmax, ymax):
+        """Sorted indices of the sheets whose extent intersects (or touches) the box."""
+        return self.touching_bulk([(xmin, ymin, xmax, ymax)])[1]
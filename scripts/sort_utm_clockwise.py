@@ -1,4 +1,103 @@
-import math
+import numpy as np
+
+
+def pack_rings(rings):
+    """
+    Packs a sequence of rings into flat coordinate arrays plus an offsets array.
+
+    Args:
+        rings: An iterable of rings, where each ring is a sequence of [x, y] points.
+
+    Returns:
+        A tuple (x, y, offsets). Ring i occupies x[offsets[i]:offsets[i + 1]]
+        (and likewise for y); offsets has one more entry than there are rings.
+    """
+    points, counts = [], [0]
+    for ring in rings:
+        points.extend(ring)
+        counts.append(len(ring))
+
+    # One conversion for all rings is far cheaper than one array per ring.
+    coords = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    offsets = np.cumsum(counts, dtype=np.intp)
+    return coords[:, 0].copy(), coords[:, 1].copy(), offsets
+
+
+def clockwise_ring_order(x, y, offsets):
+    """
+    Computes the permutation that orders every ring's vertices clockwise.
+
+    All rings are processed in a single vectorized pass: per-ring centroids are
+    computed segment-wise, the angle of each vertex around its ring centroid is
+    taken with np.arctan2, and one lexicographic sort keyed by ring id sorts every ring at
+    once by descending angle. Vertices never move between rings.
+
+    Args:
+        x: Flat array of x-coordinates (UTM easting) for all rings.
+        y: Flat array of y-coordinates (UTM northing) for all rings.
+        offsets: Non-decreasing array of ring start positions, starting at 0 and
+            ending at len(x).
+
+    Returns:
+        An integer index array such that x[order], y[order] holds every ring
+        sorted clockwise. Rings with fewer than 3 points keep their input order
+        (as clockwise order is not well-defined for fewer than 3 points).
+
+    Raises:
+        ValueError: If the coordinate arrays and offsets are inconsistent.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    offsets = np.asarray(offsets, dtype=np.intp)
+
+    if x.shape != y.shape or x.ndim != 1:
+        raise ValueError("x and y must be one-dimensional arrays of the same length.")
+    if offsets.ndim != 1 or len(offsets) == 0 or offsets[0] != 0 or offsets[-1] != len(x):
+        raise ValueError("offsets must start at 0 and end at the number of points.")
+
+    counts = np.diff(offsets)
+    if np.any(counts < 0):
+        raise ValueError("offsets must be non-decreasing.")
+
+    ring_ids = np.repeat(np.arange(len(counts)), counts)
+
+    # 1. Segment-wise centroid of every ring (bincount tolerates empty rings).
+    divisor = np.maximum(counts, 1)
+    center_x = np.bincount(ring_ids, weights=x, minlength=len(counts)) / divisor
+    center_y = np.bincount(ring_ids, weights=y, minlength=len(counts)) / divisor
+
+    # 2. Angle of each point around its own centroid, in the range [0, 2*pi).
+    angles = np.mod(np.arctan2(y - center_y[ring_ids], x - center_x[ring_ids]), 2 * np.pi)
+
+    # 3. Descending angle is clockwise. Short rings sort by position instead,
+    #    which leaves them untouched.
+    short = (counts < 3)[ring_ids]
+    local_index = np.arange(len(x)) - offsets[:-1][ring_ids]
+    within_ring = np.where(short, local_index, 2 * np.pi - angles)
+
+    # 4. Lexicographic (ring id, within-ring key) sort. Both keys are packed into
+    #    one float64 (ring ids are spaced 8 apart, within-ring keys stay below 8)
+    #    so a single stable argsort replaces the much slower two-key lexsort.
+    key = ring_ids * 8.0 + within_ring
+    return np.argsort(key, kind="stable")
+
+
+def sort_rings_clockwise(x, y, offsets):
+    """
+    Sorts many rings of 2D points (UTM coordinates) clockwise in one pass.
+
+    Args:
+        x: Flat array of x-coordinates for all rings.
+        y: Flat array of y-coordinates for all rings.
+        offsets: Ring start positions, as returned by pack_rings.
+
+    Returns:
+        A tuple (x, y) of new arrays with every ring sorted clockwise. The
+        input offsets remain valid for the returned arrays.
+    """
+    order = clockwise_ring_order(x, y, offsets)
+    return np.asarray(x, dtype=np.float64)[order], np.asarray(y, dtype=np.float64)[order]
+
 
 def sort_clockwise(points):
     """
@@ -20,42 +119,6 @@ def sort_clockwise(points):
     if len(points) < 3:
         return points[:]  # Return a copy for lists with fewer than 3 points
 
-    # 1. Calculate the centroid (center point) of all points.
-    center_x = sum(p[0] for p in points) / len(points)
-    center_y = sum(p[1] for p in points) / len(points)
-    centroid = (center_x, center_y)
-
-    # 2. Define a function to calculate the angle between a point and the centroid.
-    def calculate_angle(point):
-        """Calculates the angle in radians between the centroid and the point."""
-        dx = point[0] - centroid[0]
-        dy = point[1] - centroid[1]
-        return math.atan2(dy, dx)
-
-    # 3. Sort the points based on their angle with the centroid.
-    #    We use a key function with calculate_angle.  We also adjust the angle
-    #    to be in the range [0, 2*pi] instead of [-pi, pi] for easier clockwise sorting
-    #    and reverse the order to make the sorting clockwise.
-
-    sorted_points = sorted(points, key=lambda p: (calculate_angle(p) + 2 * math.pi) % (2 * math.pi), reverse=False)
-
-    # Find the smallest angle point and its index
-    smallest_angle_index = 0
-    smallest_angle = (calculate_angle(sorted_points[0]) + 2 * math.pi) % (2 * math.pi)
-    for i, point in enumerate(sorted_points[1:],1): # enumerate from the second item
-      angle = (calculate_angle(point) + 2 * math.pi) % (2 * math.pi)
-      if angle < smallest_angle:
-        smallest_angle = angle
-        smallest_angle_index = i
-
-    #Rotate the array, to move the smallest angle first
-    sorted_points = sorted_points[smallest_angle_index:] + sorted_points[:smallest_angle_index]
-    
-    # Check if the sorting direction is really clockwise
-    def cross_product(p1, p2, p3):
-        return (p2[0] - p1[0]) * (p3[1] - p1[1]) - (p2[1] - p1[1]) * (p3[0] - p1[0])
-    
-    if cross_product(sorted_points[0], sorted_points[1], sorted_points[2]) > 0:  # Counter-Clockwise
-        sorted_points.reverse()
-    
-    return sorted_points
+    x, y, offsets = pack_rings([points])
+    order = clockwise_ring_order(x, y, offsets)
+    return [points[i] for i in order.tolist()]
@@ -0,0 +1,296 @@
+"""
+Single-pass replacement for arcpy.analysis.SplitByAttributes.
+
+SplitByAttributes runs one selection and one copy per unique value, so the
+source is scanned once per output. Here the source is read once with a
+SearchCursor and every row is routed to the insert cursor of its output.
+Open cursors are kept in a bounded LRU pool: with thousands of distinct
+values the least recently used outputs are closed and transparently reopened
+when their next row arrives, so file handles and locks never run out.
+Optionally, the distinct values are split into contiguous key ranges that are
+partitioned by separate worker processes.
+"""
+
+import os
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from arcpy_backend import arcpy
+
+
+def sanitize_fc_name(name):
+    """Clean a feature class name (same rule as the polygon intersection notebook)."""
+    return "".join(c if c.isalnum() or c == "_" else "_" for c in name)  # Replace invalid characters with "_"
+
+
+def split_output_name(key, geodatabase=True):
+    """
+    Output name for one combination of split values, following SplitByAttributes.
+
+    Values are joined with "_" and sanitized; NULL values become "Null". In a
+    geodatabase, names that do not start with a letter get a "T" prefix.
+    """
+    name = "_".join(sanitize_fc_name("Null" if value is None else str(value)) for value in key) or "Null"
+    if geodatabase and not name[0].isalpha():
+        name = "T" + name
+    return name
+
+
+class InsertCursorPool:
+    """
+    LRU-bounded set of open insert cursors, one per output dataset.
+
+    Parameters
+    ----------
+    fields : list of str
+        Field names passed to every arcpy.da.InsertCursor.
+    max_open : int, optional
+        Maximum number of cursors open at the same time (default 64).
+    """
+
+    def __init__(self, fields, max_open=64):
+        if max_open < 1:
+            raise ValueError("max_open must be at least 1.")
+        self.fields = fields
+        self.max_open = max_open
+        self.opened = 0
+        self._cursors = OrderedDict()
+
+    def insert(self, path, row):
+        """Insert one row into `path`, opening (or reopening) its cursor if needed."""
+        cursor = self._cursors.get(path)
+        if cursor is None:
+            if len(self._cursors) >= self.max_open:
+                _, evicted = self._cursors.popitem(last=False)
+                self._release(evicted)
+            cursor = arcpy.da.InsertCursor(path, self.fields)
+            self._cursors[path] = cursor
+            self.opened += 1
+        else:
+            self._cursors.move_to_end(path)
+        cursor.insertRow(row)
+
+    @staticmethod
+    def _release(cursor):
+        # da cursors have no close(); leaving their context releases the lock and file handles now,
+        # instead of whenever the last reference happens to be dropped
+        cursor.__exit__(None, None, None)
+
+    def close(self):
+        """Release every open cursor."""
+        while self._cursors:
+            _, cursor = self._cursors.popitem(last=False)
+            self._release(cursor)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def _source_fields(in_table, split_fields):
+    """Editable attribute fields of the source (geometry and ObjectID excluded), plus the split fields."""
+    all_fields = {f.name.lower(): f for f in arcpy.ListFields(in_table)}
+    missing = [name for name in split_fields if name.lower() not in all_fields]
+    if missing:
+        raise ValueError(f"Split field(s) not found in {in_table}: {', '.join(missing)}")
+    fields = [f.name for f in all_fields.values() if f.editable and f.type not in ("OID", "Geometry")]
+    split_fields = [all_fields[name.lower()].name for name in split_fields]
+    return fields + [name for name in split_fields if name not in fields], split_fields
+
+
+def _row_selector(read_fields, output):
+    """
+    Match the fields read from the source to the fields of a created output.
+
+    Shapefile outputs truncate names to 10 characters; source fields that did
+    not survive in the output are left out. Returns the output field names and
+    a function picking the matching values out of a source row.
+    """
+    existing = {f.name.lower(): f.name for f in arcpy.ListFields(output)}
+    existing["shape@"] = "SHAPE@"
+    positions, write_fields = [], []
+    for i, name in enumerate(read_fields):
+        match = existing.get(name.lower()) or existing.get(name[:10].lower())
+        if match:
+            positions.append(i)
+            write_fields.append(match)
+    if positions == list(range(len(positions))):
+        n = len(positions)
+        return write_fields, lambda row: row[:n]
+    return write_fields, lambda row: tuple(row[i] for i in positions)
+
+
+def _create_output(path, template, geometry_type, spatial_reference):
+    """Create an empty output with the schema of the source, replacing an existing one."""
+    if arcpy.Exists(path):
+        arcpy.management.Delete(path)
+    folder, name = os.path.split(path)
+    if geometry_type is None:
+        arcpy.management.CreateTable(folder, name, template)
+    else:
+        arcpy.management.CreateFeatureclass(folder, name, geometry_type, template, "SAME_AS_TEMPLATE",
+                                            "SAME_AS_TEMPLATE", spatial_reference)
+
+
+def _partition(in_table, where_clause, read_fields, key_positions, outputs, max_open):
+    """Stream the rows of `in_table` into the existing outputs; returns features written per output."""
+    write_fields, select = _row_selector(read_fields, next(iter(outputs.values())))
+    counts = Counter()
+    with arcpy.da.SearchCursor(in_table, read_fields, where_clause) as cursor, \
+            InsertCursorPool(write_fields, max_open) as pool:
+        for row in cursor:
+            path = outputs[tuple(row[i] for i in key_positions)]
+            pool.insert(path, select(row))
+            counts[path] += 1
+    return dict(counts)
+
+
+def _sql_literal(value):
+    """Render a split value for a where clause."""
+    if isinstance(value, str):
+        return "'" + value.replace("'", "''") + "'"
+    if hasattr(value, "strftime"):
+        return value.strftime("date '%Y-%m-%d %H:%M:%S'")
+    return repr(value)
+
+
+def key_ranges(value_counts, parts):
+    """
+    Split the sorted distinct values of a field into at most `parts` contiguous ranges.
+
+    Parameters
+    ----------
+    value_counts : dict
+        Row count per distinct (non-NULL) value.
+    parts : int
+        Number of ranges wanted.
+
+    Returns
+    -------
+    list of list
+        The values of each range, in sort order; every range holds roughly the
+        same number of rows.
+    """
+    values = sorted(value_counts)
+    target = sum(value_counts.values()) / max(parts, 1)
+    ranges, current, filled = [], [], 0
+    for value in values:
+        current.append(value)
+        filled += value_counts[value]
+        if filled >= target * (len(ranges) + 1) and len(ranges) < parts - 1:
+            ranges.append(current)
+            current = []
+    if current:
+        ranges.append(current)
+    return ranges
+
+
+def split_by_attributes(in_table, target_workspace, split_fields, where_clause=None, max_open=64, max_workers=1):
+    """
+    Split a layer or table into one output per unique combination of split field values.
+
+    Parameters
+    ----------
+    in_table : str
+        Source feature class, table or layer. Layer selections and definition
+        queries are honoured when max_workers is 1; worker processes read the
+        dataset behind the layer, so pass `where_clause` instead.
+    target_workspace : str
+        Geodatabase for feature classes, or a folder for shapefiles/dBase tables.
+    split_fields : str or list of str
+        Field(s) whose values define the outputs.
+    where_clause : str, optional
+        SQL filter applied to the source rows.
+    max_open : int, optional
+        Maximum number of outputs kept open at once, per process (default 64).
+    max_workers : int, optional
+        Worker processes. 1 (default) partitions in this process with a single
+        read of the source; more first counts the distinct values of the first
+        split field, creates every output, and gives each worker a contiguous
+        range of values of about the same number of rows.
+
+    Returns
+    -------
+    dict
+        Features written per output path.
+    """
+    if isinstance(split_fields, str):
+        split_fields = [split_fields]
+    desc = arcpy.Describe(in_table)
+    template = desc.catalogPath
+    geometry_type = getattr(desc, "shapeType", None)
+    spatial_reference = desc.spatialReference if geometry_type else None
+    geodatabase = os.path.splitext(target_workspace)[1].lower() in (".gdb", ".sde")
+    extension = "" if geodatabase else (".shp" if geometry_type else ".dbf")
+
+    source_fields, split_fields = _source_fields(in_table, split_fields)
+    read_fields = (["SHAPE@"] if geometry_type else []) + source_fields
+    key_positions = [read_fields.index(name) for name in split_fields]
+    used_names = set()
+
+    def create_output(key):
+        name = split_output_name(key, geodatabase)
+        unique, suffix = name, 0
+        while unique.lower() in used_names:  # values that sanitize to the same name
+            suffix += 1
+            unique = f"{name}_{suffix}"
+        used_names.add(unique.lower())
+        path = os.path.join(target_workspace, unique + extension)
+        _create_output(path, template, geometry_type, spatial_reference)
+        return path
+
+    if max_workers <= 1:
+        outputs, counts = {}, Counter()
+        pool = select = None
+        try:
+            with arcpy.da.SearchCursor(in_table, read_fields, where_clause) as cursor:
+                for row in cursor:
+                    key = tuple(row[i] for i in key_positions)
+                    path = outputs.get(key)
+                    if path is None:
+                        path = outputs[key] = create_output(key)
+                        if pool is None:  # every output shares the schema of the first one
+                            write_fields, select = _row_selector(read_fields, path)
+                            pool = InsertCursorPool(write_fields, max_open)
+                    pool.insert(path, select(row))
+                    counts[path] += 1
+        finally:
+            if pool is not None:
+                pool.close()
+        return dict(counts)
+
+    # Parallel: count the distinct keys (attributes only), create every output
+    # up front so the workers never change the workspace schema, then fan out
+    # contiguous ranges of values of the first split field.
+    key_counts = Counter()
+    with arcpy.da.SearchCursor(in_table, split_fields, where_clause) as cursor:
+        for row in cursor:
+            key_counts[tuple(row)] += 1
+    if not key_counts:
+        return {}
+    outputs = {key: create_output(key) for key in sorted(key_counts, key=lambda k: [(v is None, v) for v in k])}
+
+    first_counts = Counter()
+    for key, count in key_counts.items():
+        first_counts[key[0]] += count
+    has_null = first_counts.pop(None, None) is not None
+
+    field = arcpy.AddFieldDelimiters(template, split_fields[0])
+    # Ranges are listed value by value: a >=/<= clause would depend on the
+    # collation of the workspace, which need not match Python's sort order.
+    clauses = [f"{field} IN ({', '.join(_sql_literal(value) for value in values)})"
+               for values in key_ranges(first_counts, max_workers)]
+    if has_null:
+        clauses = [f"({clauses[0]}) OR {field} IS NULL"] + clauses[1:] if clauses else [f"{field} IS NULL"]
+    if where_clause:
+        clauses = [f"({where_clause}) AND ({clause})" for clause in clauses]
+
+    counts = {}
+    with ProcessPoolExecutor(max_workers=len(clauses)) as executor:
+        futures = [executor.submit(_partition, template, clause, read_fields, key_positions, outputs, max_open)
+                   for clause in clauses]
+        for future in futures:
+            counts.update(future.result())
+    return counts
@@ -1,27 +1,32 @@
 # -*- coding: utf-8 -*-
 """
 Script de Python para dividir una capa de polígonos (centros comerciales)
-en capas individuales basadas en el atributo "Name" usando la herramienta
-"Split By Attributes" de ArcGIS Pro.
+en capas individuales basadas en el atributo "Name".
+
+En lugar de la herramienta "Split By Attributes" de ArcGIS Pro (una selección
+por cada valor único) se usa split_by_attributes, que lee la capa una sola vez
+y reparte cada fila a la capa de salida de su valor.
 """
 
-import arcpy
+from arcpy_backend import arcpy
+from split_by_attributes import split_by_attributes
 
 try:
     # 1. Definir las variables de entrada y salida
     input_layer_name = "malls"  # **¡Asegúrate de que este sea el nombre EXACTO de tu capa en el panel 'Contents'!**
     output_geodatabase = "C:/ruta/a/tu/Default.gdb"  # **¡Reemplaza con la ruta real a tu Geodatabase!**
     split_field = "Name"  # Campo por el cual dividir (asumimos que es 'Name')
+    max_workers = 1  # Procesos en paralelo; con más de 1 se lee la clase de entidad, no la selección de la capa
 
-    # 2. Ejecutar la herramienta "Split By Attributes"
-    arcpy.analysis.SplitByAttributes(
+    # 2. Dividir la capa en una sola lectura (mismos nombres que "Split By Attributes")
+    salidas = split_by_attributes(
         in_table=input_layer_name,
         target_workspace=output_geodatabase,
-        split_field=split_field
-        # out_location_table=""  # No necesitamos tabla de ubicación en este caso
+        split_fields=split_field,
+        max_workers=max_workers
     )
-    print(f"Herramienta 'Split By Attributes' ejecutada correctamente.")
-    print(f"Capas individuales creadas en: {output_geodatabase}")
+    print(f"División por atributos ejecutada correctamente.")
+    print(f"{len(salidas)} capas individuales creadas en: {output_geodatabase}")
     print(f"Divididas por el campo: '{split_field}' de la capa '{input_layer_name}'")
 
     print("Script de Python completado.")
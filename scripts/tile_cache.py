@@ -0,0 +1,426 @@
+"""
+Local cache and prefetcher for the XYZ / quadkey tile services in basemaps.map_sources.
+
+Tiles are stored in one SQLite file (MBTiles-style: a row per tile with the
+image blob), keyed on (source, z, x, y), together with the HTTP ETag, an
+expiry time and a last-access time. The cache is evicted least recently used
+first once it grows past a byte budget. Expired tiles are revalidated with
+If-None-Match, and are still served when the tile server cannot be reached, so
+repeated exports of the same areas work from local disk and offline.
+
+`serve_tiles` exposes the cache as a local tile service that ArcGIS Pro can
+connect to in place of the remote URL.
+"""
+
+import math
+import re
+import sqlite3
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from email.utils import parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import quote, unquote
+
+WEB_MERCATOR_MAX_LATITUDE = 85.0511287798066
+
+DEFAULT_USER_AGENT = "ArcGIS_WorkflowAutomation tile cache"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tiles (
+    source TEXT NOT NULL,
+    zoom_level INTEGER NOT NULL,
+    tile_column INTEGER NOT NULL,
+    tile_row INTEGER NOT NULL,
+    tile_data BLOB NOT NULL,
+    content_type TEXT,
+    etag TEXT,
+    expires REAL NOT NULL,
+    last_access REAL NOT NULL,
+    size INTEGER NOT NULL,
+    PRIMARY KEY (source, zoom_level, tile_column, tile_row)
+);
+CREATE INDEX IF NOT EXISTS tiles_last_access ON tiles (last_access);
+"""
+
+
+def quadkey(x, y, z):
+    """Bing Maps quadkey of tile (x, y) at zoom level z (e.g. (3, 5, 3) -> "213")."""
+    digits = []
+    for level in range(z, 0, -1):
+        mask = 1 << (level - 1)
+        digits.append(str((1 if x & mask else 0) + (2 if y & mask else 0)))
+    return "".join(digits)
+
+
+def quadkey_to_tile(key):
+    """Inverse of quadkey(): return (x, y, z) for a quadkey string."""
+    x = y = 0
+    z = len(key)
+    for level, digit in zip(range(z, 0, -1), key):
+        mask = 1 << (level - 1)
+        if digit not in "0123":
+            raise ValueError(f"Invalid quadkey digit '{digit}' in '{key}'.")
+        if digit in "13":
+            x |= mask
+        if digit in "23":
+            y |= mask
+    return x, y, z
+
+
+def tile_url(template, z, x, y):
+    """
+    Expand a map_sources URL template for one tile.
+
+    Supports {z}/{x}/{y}, the Bing {q} quadkey and percent-encoded braces
+    (%7Bz%7D), which some entries of map_sources use.
+    """
+    template = re.sub("%7B", "{", re.sub("%7D", "}", template, flags=re.I), flags=re.I)
+    return (template.replace("{z}", str(z)).replace("{x}", str(x)).replace("{y}", str(y))
+            .replace("{q}", quadkey(x, y, z)))
+
+
+def lonlat_to_tile(lon, lat, z):
+    """Web Mercator tile (x, y) containing a WGS 84 longitude/latitude at zoom z."""
+    n = 1 << z
+    lat = max(-WEB_MERCATOR_MAX_LATITUDE, min(WEB_MERCATOR_MAX_LATITUDE, lat))
+    x = int((lon + 180.0) / 360.0 * n)
+    y = int((1.0 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def tiles_for_extent(xmin, ymin, xmax, ymax, zoom_levels):
+    """
+    Yield every (z, x, y) tile covering a WGS 84 extent for the given zoom levels.
+
+    Parameters
+    ----------
+    xmin, ymin, xmax, ymax : float
+        Extent in decimal degrees (longitude/latitude).
+    zoom_levels : iterable of int
+        Zoom levels to cover, e.g. range(10, 17).
+    """
+    for z in zoom_levels:
+        x0, y0 = lonlat_to_tile(xmin, ymax, z)  # tile rows grow southwards
+        x1, y1 = lonlat_to_tile(xmax, ymin, z)
+        for x in range(x0, x1 + 1):
+            for y in range(y0, y1 + 1):
+                yield z, x, y
+
+
+def _expiry(headers, now, default_max_age):
+    """Expiry timestamp from Cache-Control max-age or Expires, else now + default_max_age."""
+    cache_control = headers.get("Cache-Control") or ""
+    match = re.search(r"max-age=(\d+)", cache_control)
+    if match and "no-store" not in cache_control:
+        return now + int(match.group(1))
+    expires = headers.get("Expires")
+    if expires:
+        try:
+            return parsedate_to_datetime(expires).timestamp()
+        except (TypeError, ValueError):
+            pass
+    return now + default_max_age
+
+
+class TileCache:
+    """
+    SQLite-backed tile cache with LRU eviction by size and HTTP revalidation.
+
+    Safe to share between threads: downloads run concurrently and only the
+    database access and the `stats` counters are serialized.
+
+    Parameters
+    ----------
+    path : str
+        SQLite file holding the tiles (created if missing).
+    sources : dict, optional
+        Source name -> URL template, typically basemaps.map_sources. Templates
+        can also be passed directly wherever a source name is expected.
+    max_bytes : int, optional
+        Byte budget for the tile blobs; least recently used tiles are evicted
+        beyond it (default 2 GiB).
+    default_max_age : float, optional
+        Seconds a tile stays fresh when the server sends no caching headers
+        (default 7 days).
+    timeout : float, optional
+        HTTP timeout in seconds.
+    user_agent : str, optional
+        User-Agent sent to the tile servers (OpenStreetMap requires one).
+
+    Examples
+    --------
+    >>> from basemaps import map_sources
+    >>> with TileCache("tiles.sqlite", map_sources) as cache:
+    ...     cache.prefetch("Esri Satellite", (-80.0, -2.3, -79.8, -2.1), range(10, 17))
+    """
+
+    def __init__(self, path, sources=None, max_bytes=2 << 30, default_max_age=7 * 24 * 3600, timeout=30,
+                 user_agent=DEFAULT_USER_AGENT):
+        self.path = path
+        self.sources = dict(sources or {})
+        self.max_bytes = max_bytes
+        self.default_max_age = default_max_age
+        self.timeout = timeout
+        self.user_agent = user_agent
+        self.stats = {"hits": 0, "misses": 0, "revalidated": 0, "stale": 0, "evicted": 0}
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self.size_bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM tiles").fetchone()[0]
+
+    def _template(self, source):
+        template = self.sources.get(source, source)
+        if "{" not in template and "%7B" not in template.upper():
+            raise ValueError(f"Unknown tile source '{source}'.")
+        return template
+
+    def _count(self, stat):
+        with self._lock:
+            self.stats[stat] += 1
+
+    def _lookup(self, key):
+        with self._lock:
+            return self._db.execute(
+                "SELECT tile_data, content_type, etag, expires FROM tiles "
+                "WHERE source=? AND zoom_level=? AND tile_column=? AND tile_row=?", key).fetchone()
+
+    def _touch(self, key, expires=None):
+        with self._lock:
+            if expires is None:
+                self._db.execute("UPDATE tiles SET last_access=? WHERE source=? AND zoom_level=? AND tile_column=? "
+                                 "AND tile_row=?", (time.time(), *key))
+            else:
+                self._db.execute("UPDATE tiles SET last_access=?, expires=? WHERE source=? AND zoom_level=? "
+                                 "AND tile_column=? AND tile_row=?", (time.time(), expires, *key))
+
+    def _store(self, key, data, content_type, etag, expires):
+        with self._lock:
+            previous = self._db.execute("SELECT size FROM tiles WHERE source=? AND zoom_level=? AND tile_column=? "
+                                        "AND tile_row=?", key).fetchone()
+            self._db.execute("INSERT OR REPLACE INTO tiles VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                             (*key, sqlite3.Binary(data), content_type, etag, expires, time.time(), len(data)))
+            self.size_bytes += len(data) - (previous[0] if previous else 0)
+            if self.size_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Drop least recently used tiles until the cache fits its budget (caller holds the lock)."""
+        while self.size_bytes > self.max_bytes:
+            rows = self._db.execute("SELECT rowid, size FROM tiles ORDER BY last_access LIMIT 256").fetchall()
+            if not rows:
+                break
+            freed, victims = 0, []
+            for rowid, size in rows:
+                victims.append((rowid,))
+                freed += size
+                if self.size_bytes - freed <= self.max_bytes:
+                    break
+            self._db.executemany("DELETE FROM tiles WHERE rowid=?", victims)
+            self.size_bytes -= freed
+            self.stats["evicted"] += len(victims)
+
+    def _download(self, url, etag=None):
+        request = urllib.request.Request(url, headers={"User-Agent": self.user_agent})
+        if etag:
+            request.add_header("If-None-Match", etag)
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return response.status, response.read(), response.headers
+        except urllib.error.HTTPError as e:
+            if e.code == 304:
+                return 304, None, e.headers
+            raise
+
+    def get(self, source, z, x, y, offline=False):
+        """
+        Return the image bytes of one tile, downloading it only when needed.
+
+        Fresh cached tiles are returned without network access. Expired tiles
+        are revalidated (a 304 response only extends their expiry), and are
+        returned as they are if the server cannot be reached.
+
+        Parameters
+        ----------
+        source : str
+            A name from `sources` or a URL template.
+        z, x, y : int
+            Tile address.
+        offline : bool, optional
+            Never contact the server; return None for tiles not in the cache.
+
+        Returns
+        -------
+        bytes or None
+            The tile image, or None if it is not cached and cannot be fetched
+            (offline, or the server returned 404).
+        """
+        return self.get_with_type(source, z, x, y, offline)[0]
+
+    def get_with_type(self, source, z, x, y, offline=False):
+        """Like get(), but return (data, content_type)."""
+        template = self._template(source)
+        key = (source, z, x, y)
+        cached = self._lookup(key)
+        now = time.time()
+
+        if cached is not None and (offline or cached[3] > now):
+            self._count("hits")
+            self._touch(key)
+            return bytes(cached[0]), cached[1]
+        if offline:
+            self._count("misses")
+            return None, None
+
+        try:
+            status, data, headers = self._download(tile_url(template, z, x, y), cached[2] if cached else None)
+        except (urllib.error.URLError, OSError) as e:
+            if cached is not None:  # server unreachable: serve the stale copy
+                self._count("stale")
+                self._touch(key)
+                return bytes(cached[0]), cached[1]
+            if isinstance(e, urllib.error.HTTPError) and e.code == 404:
+                self._count("misses")
+                return None, None
+            raise
+
+        expires = _expiry(headers, now, self.default_max_age)
+        if status == 304 and cached is not None:
+            self._count("revalidated")
+            self._touch(key, expires)
+            return bytes(cached[0]), cached[1]
+
+        self._count("misses")
+        content_type = headers.get("Content-Type")
+        self._store(key, data, content_type, headers.get("ETag"), expires)
+        return data, content_type
+
+    def prefetch(self, source, extent, zoom_levels, max_workers=8, progress=None):
+        """
+        Download every tile of an extent and zoom range into the cache.
+
+        At most `max_workers` downloads run at once, and at most a few times
+        that many tiles are queued, so very large extents do not build huge
+        task lists.
+
+        Parameters
+        ----------
+        source : str
+            A name from `sources` or a URL template.
+        extent : tuple of float
+            (xmin, ymin, xmax, ymax) in WGS 84 degrees.
+        zoom_levels : iterable of int
+            Zoom levels to fetch, e.g. range(10, 17).
+        max_workers : int, optional
+            Number of download threads (default 8; keep it low for public servers).
+        progress : callable, optional
+            Called as progress(done, counts) after each tile.
+
+        Returns
+        -------
+        dict
+            Tile counts: "cached" (already fresh), "downloaded", "failed".
+        """
+        counts = {"cached": 0, "downloaded": 0, "failed": 0}
+        now = time.time()
+
+        def fetch(tile):
+            z, x, y = tile
+            cached = self._lookup((source, z, x, y))
+            if cached is not None and cached[3] > now:
+                return "cached"
+            return "downloaded" if self.get(source, z, x, y) is not None else "failed"
+
+        tiles = tiles_for_extent(*extent, zoom_levels)
+        done = 0
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = set()
+            for tile in tiles:
+                pending.add(executor.submit(fetch, tile))
+                if len(pending) >= 4 * max_workers:
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    done += self._tally(finished, counts, done, progress)
+            done += self._tally(pending, counts, done, progress)
+        return counts
+
+    @staticmethod
+    def _tally(futures, counts, done, progress):
+        for future in futures:
+            try:
+                counts[future.result()] += 1
+            except Exception:  # network and HTTP errors count as failed tiles
+                counts["failed"] += 1
+            done += 1
+            if progress is not None:
+                progress(done, counts)
+        return len(futures)
+
+    def close(self):
+        """Close the SQLite connection."""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def serve_tiles(cache, host="127.0.0.1", port=8765, offline=False):
+    """
+    Serve a TileCache over HTTP as http://host:port/<source>/{z}/{x}/{y}.
+
+    Point ArcGIS Pro at local_tile_url(...) instead of the remote template and
+    renders are answered from the cache (and filled from the remote server on
+    a miss, unless offline is True). Runs in a daemon thread.
+
+    Returns
+    -------
+    http.server.ThreadingHTTPServer
+        Call .shutdown() to stop serving.
+    """
+
+    class TileHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            match = re.fullmatch(r"/(.+)/(\d+)/(\d+)/(\d+)(?:\.\w+)?", self.path.split("?")[0])
+            if not match:
+                self.send_error(404)
+                return
+            source = unquote(match.group(1))
+            z, x, y = (int(v) for v in match.group(2, 3, 4))
+            try:
+                data, content_type = cache.get_with_type(source, z, x, y, offline=offline)
+            except ValueError:
+                self.send_error(404, "Unknown tile source")
+                return
+            except (urllib.error.URLError, OSError) as e:
+                self.send_error(502, str(e))
+                return
+            if data is None:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", content_type or "application/octet-stream")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):  # keep the console quiet
+            pass
+
+    server = ThreadingHTTPServer((host, port), TileHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def local_tile_url(source, host="127.0.0.1", port=8765):
+    """URL template of a source as served by serve_tiles()."""
+    return f"http://{host}:{port}/{quote(source, safe='')}/{{z}}/{{x}}/{{y}}"
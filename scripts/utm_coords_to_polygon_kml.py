@@ -1,7 +1,64 @@
 import os
-import arcpy
+from itertools import islice
 
-def create_kml_from_utm(coordinates, output_folder, kml_name="polygon.kml", utm_zone=17, hemisphere="S"):
+from arcpy_backend import arcpy
+from feature_writer import write_features
+from kml_writer import KMLWriter
+from polygon_set import PolygonSet
+from projection_cache import spatial_reference
+from sort_utm_clockwise import pack_rings
+from utm_projection import WGS84_EPSG, utm_epsg_code, utm_to_wgs84
+
+
+def create_kml_from_utm_batch(polygons, output_folder, kml_name="polygons.kml", utm_zone=17, hemisphere="S", chunk_size=10000,
+                              cache=None):
+    """
+    Creates a single KML (or KMZ) file holding many polygons given in UTM coordinates.
+
+    Polygons are read in chunks; every chunk is projected to WGS 84 in one
+    vectorized call and streamed to the output as one <Placemark> per polygon,
+    so no intermediate geodatabase, feature class or arcpy geometry is created.
+
+    Parameters:
+    - polygons: Iterable of (name, coordinates) or (name, coordinates, attributes) tuples,
+      where coordinates is a list of (X, Y) UTM tuples and attributes is a dict.
+    - output_folder: Path to the folder where the KML will be saved.
+    - kml_name: Name of the output file; a ".kmz" extension writes a zipped KMZ (default: "polygons.kml").
+    - utm_zone: UTM Zone number (default: 17).
+    - hemisphere: "N" for North or "S" for South (default: "S" for Southern Hemisphere).
+    - chunk_size: Number of polygons projected per vectorized call (default: 10000).
+    - cache: Optional projection_cache.ProjectionCache; chunks projected by an earlier run
+      are loaded from it instead of projected again.
+
+    Returns:
+    - Path to the created KML/KMZ file.
+    """
+    epsg_code = utm_epsg_code(utm_zone, hemisphere)
+    kml_path = os.path.join(output_folder, kml_name)
+    polygons = iter(polygons)
+
+    with KMLWriter(kml_path) as kml:
+        while True:
+            chunk = list(islice(polygons, chunk_size))
+            if not chunk:
+                break
+
+            x, y, offsets = pack_rings(polygon[1] for polygon in chunk)
+            # KML requires WGS 84 (EPSG: 4326)
+            if cache is None:
+                lon, lat = utm_to_wgs84(x, y, epsg_code)
+            else:
+                lon, lat = cache.project(x, y, epsg_code, WGS84_EPSG)
+
+            for polygon, start, end in zip(chunk, offsets[:-1], offsets[1:]):
+                attributes = polygon[2] if len(polygon) > 2 else None
+                kml.add_polygon(polygon[0], [(lon[start:end], lat[start:end])], attributes)
+
+    print(f"KML file with {kml.features_written} polygons created successfully at: {kml_path}")
+    return kml_path
+
+
+def create_kml_from_utm(coordinates, output_folder, kml_name="polygon.kml", utm_zone=17, hemisphere="S", backend="native"):
     """
     Creates a KML file from given UTM coordinates.
 
@@ -11,48 +68,55 @@ def create_kml_from_utm(coordinates, output_folder, kml_name="polygon.kml", utm_
     - kml_name: Name of the output KML file (default: "polygon.kml").
     - utm_zone: UTM Zone number (default: 17).
     - hemisphere: "N" for North or "S" for South (default: "S" for Southern Hemisphere").
+    - backend: "native" streams the KML directly (default); "arcpy" goes through a
+      temporary file geodatabase and LayerToKML_conversion.
 
     Returns:
     - Path to the created KML file.
     """
+    if backend == "native":
+        name = os.path.splitext(kml_name)[0]
+        return create_kml_from_utm_batch([(name, coordinates)], output_folder, kml_name, utm_zone, hemisphere)
+    if backend != "arcpy":
+        raise ValueError(f"Unknown backend '{backend}'; expected 'native' or 'arcpy'.")
 
     # Select correct EPSG code based on hemisphere
-    epsg_code = 32600 + utm_zone if hemisphere.upper() == "N" else 32700 + utm_zone
-    spatial_ref_utm = arcpy.SpatialReference(epsg_code)
-    spatial_ref_wgs84 = arcpy.SpatialReference(4326)  # KML requires WGS 84 (EPSG: 4326)
-
-    # Ensure the polygon is closed
-    if coordinates[0] != coordinates[-1]:
-        coordinates.append(coordinates[0])  # Closing the polygon
+    epsg_code = utm_epsg_code(utm_zone, hemisphere)
+    spatial_ref_utm = spatial_reference(epsg_code)
+    spatial_ref_wgs84 = spatial_reference(WGS84_EPSG)  # KML requires WGS 84 (EPSG: 4326)
 
-    # Create Polygon Geometry
-    polygon = arcpy.Polygon(arcpy.Array([arcpy.Point(x, y) for x, y in coordinates]), spatial_ref_utm)
+    # Array-backed polygon; it is closed and turned into WKB only when written
+    polygons = PolygonSet.from_coordinates([coordinates])
 
     # Define output paths
     temp_gdb = os.path.join(output_folder, "temp.gdb")
     polygon_fc = os.path.join(temp_gdb, "PolygonFeature")
+    projected_fc = os.path.join(temp_gdb, "PolygonProjected")
+    polygon_layer = "PolygonLayer"
     kml_path = os.path.join(output_folder, kml_name)
 
     # Ensure output folder and geodatabase exist
     if not os.path.exists(output_folder):
         os.makedirs(output_folder)
-    
+
     if not arcpy.Exists(temp_gdb):
         arcpy.CreateFileGDB_management(output_folder, "temp.gdb")
 
+    # Remove leftovers of a previous call so the names can be reused
+    for leftover in (polygon_layer, projected_fc, polygon_fc):
+        if arcpy.Exists(leftover):
+            arcpy.Delete_management(leftover)
+
     # Create Feature Class to store the polygon
     arcpy.CreateFeatureclass_management(temp_gdb, "PolygonFeature", "POLYGON", spatial_reference=spatial_ref_utm)
 
     # Insert the polygon into the feature class
-    with arcpy.da.InsertCursor(polygon_fc, ["SHAPE@"]) as cursor:
-        cursor.insertRow([polygon])
+    write_features(polygon_fc, ((wkb, ()) for wkb in polygons.to_wkb()), shape_field="SHAPE@WKB")
 
     # Project the feature class to WGS 84 (for KML compatibility)
-    projected_fc = os.path.join(temp_gdb, "PolygonProjected")
     arcpy.Project_management(polygon_fc, projected_fc, spatial_ref_wgs84)
 
     # Create a layer from the projected feature class
-    polygon_layer = "PolygonLayer"
     arcpy.MakeFeatureLayer_management(projected_fc, polygon_layer)
 
     # Export the layer to KML
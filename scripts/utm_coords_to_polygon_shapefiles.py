@@ -1,5 +1,13 @@
-import arcpy
 import os
+from itertools import chain, islice
+
+from arcpy_backend import arcpy
+from feature_writer import write_features
+from polygon_set import PolygonSet
+from projection_cache import spatial_reference
+from shapefile_writer import ShapefileWriter, infer_fields
+from sort_utm_clockwise import pack_rings
+from utm_projection import utm_epsg_code
 
 def create_polygon_from_utm(coordinates, output_folder, shapefile_name="polygon.shp", utm_zone=17, hemisphere="S"):
     """
@@ -17,15 +25,11 @@ def create_polygon_from_utm(coordinates, output_folder, shapefile_name="polygon.
     """
     
     # Select correct EPSG code based on hemisphere
-    epsg_code = 32600 + utm_zone if hemisphere.upper() == "N" else 32700 + utm_zone
-    spatial_ref = arcpy.SpatialReference(epsg_code)
-
-    # Ensure the polygon is closed
-    if coordinates[0] != coordinates[-1]:
-        coordinates.append(coordinates[0])  # Closing the polygon
+    epsg_code = utm_epsg_code(utm_zone, hemisphere)
+    spatial_ref = spatial_reference(epsg_code)
 
-    # Create Polygon Geometry
-    polygon = arcpy.Polygon(arcpy.Array([arcpy.Point(x, y) for x, y in coordinates]), spatial_ref)
+    # Array-backed polygon; it is closed and turned into WKB only when written
+    polygons = PolygonSet.from_coordinates([coordinates])
 
     # Define output path
     shapefile_path = os.path.join(output_folder, shapefile_name)
@@ -38,19 +42,72 @@ def create_polygon_from_utm(coordinates, output_folder, shapefile_name="polygon.
     arcpy.CreateFeatureclass_management(output_folder, shapefile_name, "POLYGON", spatial_reference=spatial_ref)
 
     # Insert the polygon into the shapefile
-    with arcpy.da.InsertCursor(shapefile_path, ["SHAPE@"]) as cursor:
-        cursor.insertRow([polygon])
+    write_features(shapefile_path, ((wkb, ()) for wkb in polygons.to_wkb()), shape_field="SHAPE@WKB")
 
     print(f"Polygon created successfully at: {shapefile_path}")
     return shapefile_path
 
-# usage
-utm_coordinates = [
-    (..., ...), 
-]
+def create_polygons_from_utm(polygons, output_folder, shapefile_name="polygons.shp", utm_zone=17, hemisphere="S",
+                             fields=None, chunk_size=50000):
+    """
+    Creates one multi-record polygon shapefile from many sets of UTM coordinates.
+
+    The .shp/.shx/.dbf/.prj files are written natively: polygons are consumed in
+    chunks, packed into binary records with NumPy and streamed to disk, so there is
+    no per-feature geoprocessing call and memory stays bounded however many
+    polygons the iterable yields.
+
+    Parameters:
+    - polygons: Iterable of (name, coordinates) or (name, coordinates, attributes) tuples,
+      where coordinates is a list of (X, Y) UTM tuples and attributes is a dict.
+    - output_folder: Path to the folder where the shapefile will be saved.
+    - shapefile_name: Name of the output shapefile (default: "polygons.shp").
+    - utm_zone: UTM Zone number (default: 17).
+    - hemisphere: "N" for North or "S" for South (default: "S" for Southern Hemisphere).
+    - fields: Optional list of (name, type, length, decimals) dBase fields for the attributes;
+      inferred from the first polygon's attributes when omitted. A "Name" text field is always added.
+    - chunk_size: Number of polygons packed per batch (default: 50000).
+
+    Returns:
+    - Path to the created shapefile.
+    """
+    polygons = iter(polygons)
+    first = next(polygons, None)
+    if first is None:
+        raise ValueError("No polygons were given.")
+
+    if fields is None:
+        fields = infer_fields(first[2]) if len(first) > 2 and first[2] else []
+    fields = [("Name", "C", 254, 0)] + [field for field in fields if field[0] != "Name"]
+
+    shapefile_path = os.path.join(output_folder, shapefile_name)
+    polygons = chain([first], polygons)
+
+    with ShapefileWriter(shapefile_path, fields, epsg=utm_epsg_code(utm_zone, hemisphere)) as writer:
+        while True:
+            chunk = list(islice(polygons, chunk_size))
+            if not chunk:
+                break
+
+            x, y, offsets = pack_rings(polygon[1] for polygon in chunk)
+            columns = {"Name": [polygon[0] for polygon in chunk]}
+            for name, *_ in fields[1:]:
+                columns[name] = [polygon[2].get(name) if len(polygon) > 2 and polygon[2] else None for polygon in chunk]
+
+            writer.add_polygons(x, y, offsets, columns)
+
+    print(f"{writer.records_written} polygons created successfully at: {shapefile_path}")
+    return shapefile_path
+
+
+if __name__ == "__main__":
+    # usage
+    utm_coordinates = [
+        (..., ...), 
+    ]
 
-# Call the function with desired output location
-output_shapefile = create_polygon_from_utm(utm_coordinates, 
-                                           output_folder="C:/GIS", ### replace it to the desired directory
-                                           shapefile_name="polygon.shp"
-                                          )
+    # Call the function with desired output location
+    output_shapefile = create_polygon_from_utm(utm_coordinates, 
+                                               output_folder="C:/GIS", ### replace it to the desired directory
+                                               shapefile_name="polygon.shp"
+                                              )
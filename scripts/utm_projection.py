@@ -0,0 +1,274 @@
+"""
+Vectorized WGS 84 / UTM projection (transverse Mercator, Krüger series).
+
+Forward and inverse transforms operate on whole NumPy coordinate arrays and
+follow Karney (2011), "Transverse Mercator with an accuracy of a few
+nanometers", using the series to sixth order in the third flattening n. Within
+a UTM zone the error is far below a millimetre, so bulk reprojection needs no
+arcpy geometry objects and also runs where arcpy is not installed.
+"""
+
+import math
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+
+WGS84_EPSG = 4326
+
+# WGS 84 ellipsoid
+WGS84_A = 6378137.0
+WGS84_F = 1 / 298.257223563
+
+UTM_K0 = 0.9996
+UTM_FALSE_EASTING = 500000.0
+UTM_FALSE_NORTHING_SOUTH = 10000000.0
+
+TransverseMercator = namedtuple(
+    "TransverseMercator",
+    ["epsg", "zone", "hemisphere", "lon0", "false_easting", "false_northing", "k0", "e", "scale", "alpha", "beta"],
+)
+
+
+def utm_epsg_code(utm_zone=17, hemisphere="S"):
+    """Return the WGS 84 / UTM EPSG code for a zone and hemisphere ("N" or "S")."""
+    return 32600 + utm_zone if hemisphere.upper() == "N" else 32700 + utm_zone
+
+
+@lru_cache(maxsize=None)
+def _ellipsoid_series(a, f):
+    """Rectifying radius and Krüger alpha/beta coefficients for an ellipsoid."""
+    n = f / (2 - f)
+    n2, n3, n4, n5, n6 = n ** 2, n ** 3, n ** 4, n ** 5, n ** 6
+
+    rectifying_radius = a / (1 + n) * (1 + n2 / 4 + n4 / 64 + n6 / 256)
+
+    alpha = np.array([
+        n / 2 - 2 * n2 / 3 + 5 * n3 / 16 + 41 * n4 / 180 - 127 * n5 / 288 + 7891 * n6 / 37800,
+        13 * n2 / 48 - 3 * n3 / 5 + 557 * n4 / 1440 + 281 * n5 / 630 - 1983433 * n6 / 1935360,
+        61 * n3 / 240 - 103 * n4 / 140 + 15061 * n5 / 26880 + 167603 * n6 / 181440,
+        49561 * n4 / 161280 - 179 * n5 / 168 + 6601661 * n6 / 7257600,
+        34729 * n5 / 80640 - 3418889 * n6 / 1995840,
+        212378941 * n6 / 319334400,
+    ])
+    beta = np.array([
+        n / 2 - 2 * n2 / 3 + 37 * n3 / 96 - n4 / 360 - 81 * n5 / 512 + 96199 * n6 / 604800,
+        n2 / 48 + n3 / 15 - 437 * n4 / 1440 + 46 * n5 / 105 - 1118711 * n6 / 3870720,
+        17 * n3 / 480 - 37 * n4 / 840 - 209 * n5 / 4480 + 5569 * n6 / 90720,
+        4397 * n4 / 161280 - 11 * n5 / 504 - 830251 * n6 / 7257600,
+        4583 * n5 / 161280 - 108847 * n6 / 3991680,
+        20648693 * n6 / 638668800,
+    ])
+    alpha.flags.writeable = False
+    beta.flags.writeable = False
+    return rectifying_radius, alpha, beta
+
+
+@lru_cache(maxsize=None)
+def utm_parameters(epsg):
+    """
+    Precomputed transverse Mercator constants for a WGS 84 / UTM EPSG code.
+
+    Results are cached per EPSG code, so repeated conversions only pay for
+    the array arithmetic.
+
+    Parameters
+    ----------
+    epsg : int
+        32601–32660 (northern zones) or 32701–32760 (southern zones).
+
+    Returns
+    -------
+    TransverseMercator
+
+    Raises
+    ------
+    ValueError
+        If the code is not a WGS 84 / UTM zone.
+    """
+    epsg = int(epsg)
+    zone = epsg % 100
+    if epsg // 100 not in (326, 327) or not 1 <= zone <= 60:
+        raise ValueError(f"EPSG:{epsg} is not a WGS 84 / UTM zone (expected 32601-32660 or 32701-32760).")
+
+    hemisphere = "N" if epsg // 100 == 326 else "S"
+    rectifying_radius, alpha, beta = _ellipsoid_series(WGS84_A, WGS84_F)
+
+    return TransverseMercator(
+        epsg=epsg,
+        zone=zone,
+        hemisphere=hemisphere,
+        lon0=math.radians(zone * 6 - 183),
+        false_easting=UTM_FALSE_EASTING,
+        false_northing=0.0 if hemisphere == "N" else UTM_FALSE_NORTHING_SOUTH,
+        k0=UTM_K0,
+        e=math.sqrt(WGS84_F * (2 - WGS84_F)),
+        scale=UTM_K0 * rectifying_radius,
+        alpha=alpha,
+        beta=beta,
+    )
+
+
+def _harmonics(coefficients, xi, eta):
+    """Return Σ c_j sin(2jξ)cosh(2jη) and Σ c_j cos(2jξ)sinh(2jη) over all points at once."""
+    j2 = 2 * np.arange(1, len(coefficients) + 1).reshape(-1, *([1] * xi.ndim))
+    d_xi = np.tensordot(coefficients, np.sin(j2 * xi) * np.cosh(j2 * eta), axes=1)
+    d_eta = np.tensordot(coefficients, np.cos(j2 * xi) * np.sinh(j2 * eta), axes=1)
+    return d_xi, d_eta
+
+
+def wgs84_to_utm(lon, lat, epsg):
+    """
+    Project WGS 84 longitude/latitude (degrees) to UTM easting/northing (metres).
+
+    Parameters
+    ----------
+    lon, lat : array_like
+        Geographic coordinates in decimal degrees.
+    epsg : int
+        Target WGS 84 / UTM EPSG code.
+
+    Returns
+    -------
+    tuple(numpy.ndarray, numpy.ndarray)
+        Easting and northing arrays with the broadcast shape of the inputs.
+    """
+    tm = utm_parameters(epsg)
+    phi = np.radians(np.asarray(lat, dtype=np.float64))
+    lam = np.radians(np.asarray(lon, dtype=np.float64)) - tm.lon0
+    lam = (lam + np.pi) % (2 * np.pi) - np.pi
+
+    # Conformal latitude, via tau = tan(phi) to stay accurate near the poles.
+    tau = np.tan(phi)
+    sigma = np.sinh(tm.e * np.arctanh(tm.e * tau / np.hypot(1, tau)))
+    tau_prime = tau * np.hypot(1, sigma) - sigma * np.hypot(1, tau)
+
+    xi_prime = np.arctan2(tau_prime, np.cos(lam))
+    eta_prime = np.arcsinh(np.sin(lam) / np.hypot(tau_prime, np.cos(lam)))
+
+    d_xi, d_eta = _harmonics(tm.alpha, xi_prime, eta_prime)
+
+    easting = tm.false_easting + tm.scale * (eta_prime + d_eta)
+    northing = tm.false_northing + tm.scale * (xi_prime + d_xi)
+    return easting, northing
+
+
+def utm_to_wgs84(x, y, epsg):
+    """
+    Unproject UTM easting/northing (metres) to WGS 84 longitude/latitude (degrees).
+
+    Parameters
+    ----------
+    x, y : array_like
+        UTM easting and northing.
+    epsg : int
+        Source WGS 84 / UTM EPSG code.
+
+    Returns
+    -------
+    tuple(numpy.ndarray, numpy.ndarray)
+        Longitude and latitude arrays with the broadcast shape of the inputs.
+    """
+    tm = utm_parameters(epsg)
+    xi = (np.asarray(y, dtype=np.float64) - tm.false_northing) / tm.scale
+    eta = (np.asarray(x, dtype=np.float64) - tm.false_easting) / tm.scale
+
+    d_xi, d_eta = _harmonics(tm.beta, xi, eta)
+    xi_prime = xi - d_xi
+    eta_prime = eta - d_eta
+
+    # Conformal latitude tau' = tan(chi), then Newton's method for tau = tan(phi).
+    sinh_eta = np.sinh(eta_prime)
+    cos_xi = np.cos(xi_prime)
+    tau_prime = np.sin(xi_prime) / np.hypot(sinh_eta, cos_xi)
+
+    e2m = 1 - tm.e ** 2
+    tau = tau_prime.copy()
+    for _ in range(3):  # converges to double precision within three steps
+        sigma = np.sinh(tm.e * np.arctanh(tm.e * tau / np.hypot(1, tau)))
+        tau_i = tau * np.hypot(1, sigma) - sigma * np.hypot(1, tau)
+        tau += (tau_prime - tau_i) / np.hypot(1, tau_i) * (1 + e2m * tau ** 2) / (e2m * np.hypot(1, tau))
+
+    lat = np.degrees(np.arctan(tau))
+    lon = np.degrees(tm.lon0 + np.arctan2(sinh_eta, cos_xi))
+    lon = (lon + 180) % 360 - 180
+    return lon, lat
+
+
+def project(x, y, source_epsg, target_epsg):
+    """
+    Reproject coordinate arrays between WGS 84 (4326) and WGS 84 / UTM zones.
+
+    UTM-to-UTM conversions (e.g. across a zone boundary) pass through
+    geographic coordinates.
+
+    Parameters
+    ----------
+    x, y : array_like
+        Input coordinates (lon/lat in degrees for EPSG:4326, metres for UTM).
+    source_epsg, target_epsg : int
+        EPSG codes; 4326 or any WGS 84 / UTM zone.
+
+    Returns
+    -------
+    tuple(numpy.ndarray, numpy.ndarray)
+    """
+    source_epsg, target_epsg = int(source_epsg), int(target_epsg)
+    if source_epsg == target_epsg:
+        return np.asarray(x, dtype=np.float64).copy(), np.asarray(y, dtype=np.float64).copy()
+
+    lon, lat = (x, y) if source_epsg == WGS84_EPSG else utm_to_wgs84(x, y, source_epsg)
+    if target_epsg == WGS84_EPSG:
+        return np.asarray(lon, dtype=np.float64), np.asarray(lat, dtype=np.float64)
+    return wgs84_to_utm(lon, lat, target_epsg)
+
+
+def project_extent(xmin, ymin, xmax, ymax, source_epsg, target_epsg, densify=8):
+    """
+    Project an envelope and return the envelope of the result.
+
+    The rectangle's edges are densified before projecting, since straight
+    edges in one system become curves in the other.
+
+    Returns
+    -------
+    tuple(float, float, float, float)
+        (xmin, ymin, xmax, ymax) in the target system.
+    """
+    steps = np.linspace(0.0, 1.0, densify + 1)
+    xs = np.concatenate([xmin + (xmax - xmin) * steps, np.full_like(steps, xmax),
+                         xmax - (xmax - xmin) * steps, np.full_like(steps, xmin)])
+    ys = np.concatenate([np.full_like(steps, ymin), ymin + (ymax - ymin) * steps,
+                         np.full_like(steps, ymax), ymax - (ymax - ymin) * steps])
+    px, py = project(xs, ys, source_epsg, target_epsg)
+    return float(px.min()), float(py.min()), float(px.max()), float(py.max())
+
+
+_GEOGCS_WGS84 = (
+    'GEOGCS["GCS_WGS_1984",DATUM["D_WGS_1984",SPHEROID["WGS_1984",6378137.0,298.257223563]],'
+    'PRIMEM["Greenwich",0.0],UNIT["Degree",0.0174532925199433]]'
+)
+
+
+def esri_wkt(epsg):
+    """
+    Esri-flavoured WKT (as written to shapefile .prj files) for EPSG:4326 or a WGS 84 / UTM zone.
+
+    Raises
+    ------
+    ValueError
+        If the code is neither 4326 nor a WGS 84 / UTM zone.
+    """
+    if int(epsg) == WGS84_EPSG:
+        return _GEOGCS_WGS84
+
+    tm = utm_parameters(epsg)
+    return (
+        f'PROJCS["WGS_1984_UTM_Zone_{tm.zone}{tm.hemisphere}",{_GEOGCS_WGS84},'
+        'PROJECTION["Transverse_Mercator"],'
+        f'PARAMETER["False_Easting",{tm.false_easting}],'
+        f'PARAMETER["False_Northing",{tm.false_northing}],'
+        f'PARAMETER["Central_Meridian",{math.degrees(tm.lon0)}],'
+        f'PARAMETER["Scale_Factor",{tm.k0}],'
+        'PARAMETER["Latitude_Of_Origin",0.0],UNIT["Meter",1.0]]'
+    )
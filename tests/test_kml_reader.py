@@ -0,0 +1,45 @@
+"""
+ingest_kml into a shapefile, read back with ShapefileReader.
+
+Run from the repository root:
+    python -m pytest tests
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "scripts"))
+
+from kml_reader import ingest_kml  # noqa: E402
+from shapefile_reader import ShapefileReader  # noqa: E402
+
+PLACEMARK = """
+  <Placemark>
+    <name>{name}</name>
+    <ExtendedData>
+      <Data name="OwnerFullNameLong"><value>{owner}</value></Data>
+      <Data name="OwnerFullNameLonger"><value>{owner} Jr.</value></Data>
+      <Data name="ownerfullnamelongest"><value>{owner} III</value></Data>
+    </ExtendedData>
+    <Polygon><outerBoundaryIs><LinearRing>
+      <coordinates>-79.9,-2.1 -79.8,-2.1 -79.8,-2.0 -79.9,-2.1</coordinates>
+    </LinearRing></outerBoundaryIs></Polygon>
+  </Placemark>"""
+
+
+def test_long_extended_data_names_get_unique_fields(tmp_path):
+    kml = tmp_path / "parcels.kml"
+    placemarks = "".join(PLACEMARK.format(name=f"Lote {i}", owner=f"Owner {i}") for i in range(3))
+    kml.write_text(f'<kml xmlns="http://www.opengis.net/kml/2.2"><Document>{placemarks}</Document></kml>',
+                   encoding="utf-8")
+    output = str(tmp_path / "parcels.shp")
+
+    summary = ingest_kml([str(kml)], output, max_workers=1)
+
+    assert summary["features"] == 3 and not summary["errors"]
+    with ShapefileReader(output) as reader:
+        assert reader.field_names == ["Name", "OwnerFullN", "OwnerFul_1", "ownerful_2", "source"]
+        rows = [attributes for _, attributes in reader]
+    assert [row["OwnerFullN"] for row in rows] == ["Owner 0", "Owner 1", "Owner 2"]
+    assert rows[2]["OwnerFul_1"] == "Owner 2 Jr."
+    assert rows[2]["ownerful_2"] == "Owner 2 III"
@@ -0,0 +1,79 @@
+"""
+Local-backend InsertCursor appending to shapefiles in place.
+
+Run from the repository root:
+    python -m pytest tests
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "scripts"))
+
+import arcpy_local as arcpy  # noqa: E402
+from shapefile_reader import ShapefileReader  # noqa: E402
+from shapefile_writer import ShapefileWriter  # noqa: E402
+
+
+def square(x, y, size=5.0):
+    return arcpy.Polygon(arcpy.Array([arcpy.Point(x, y), arcpy.Point(x + size, y),
+                                      arcpy.Point(x + size, y + size), arcpy.Point(x, y + size)]))
+
+
+@pytest.fixture
+def polygons(tmp_path):
+    path = str(tmp_path / "parcels.shp")
+    arcpy.CreateFeatureclass(str(tmp_path), "parcels.shp", "POLYGON", spatial_reference=32717)
+    arcpy.AddField(path, "NAME", "TEXT", field_length=20)
+    arcpy.AddField(path, "AREA", "DOUBLE")
+    return path
+
+
+def test_cursors_append_after_existing_records(polygons):
+    fids = []
+    for batch in range(3):
+        with arcpy.da.InsertCursor(polygons, ["SHAPE@", "NAME", "AREA"]) as cursor:
+            for i in range(4):
+                fids.append(cursor.insertRow([square(600000 + 10 * (4 * batch + i), 9700000), f"Lote ñ{batch}{i}", 25.0]))
+    assert fids == list(range(12))
+
+    with arcpy.da.SearchCursor(polygons, ["OID@", "NAME", "AREA", "SHAPE@"]) as cursor:
+        rows = list(cursor)
+    assert [row[0] for row in rows] == fids
+    assert rows[-1][1:3] == ("Lote ñ23", 25.0)
+    assert rows[-1][3].area == pytest.approx(25.0)
+
+    with ShapefileReader(polygons) as reader:
+        assert len(reader) == 12
+        assert reader.bbox == (600000.0, 9700000.0, 600115.0, 9700005.0)
+        assert reader.file_length == os.path.getsize(polygons)
+    assert os.path.getsize(polygons[:-4] + ".shx") == 100 + 8 * 12
+    description = arcpy.Describe(polygons)
+    assert description.spatialReference.factoryCode == 32717
+
+
+def test_open_cursor_leaves_the_file_valid(polygons):
+    with arcpy.da.InsertCursor(polygons, ["SHAPE@"]) as cursor:
+        cursor.insertRow([square(0, 0)])
+    # A cursor that inserts nothing, and one that fails on an unknown column
+    arcpy.da.InsertCursor(polygons, ["SHAPE@"]).close()
+    with pytest.raises(RuntimeError):
+        arcpy.da.InsertCursor(polygons, ["SHAPE@", "MISSING"])
+    assert arcpy.GetCount(polygons)[0] == "1"
+
+
+def test_append_keeps_the_dbf_encoding(tmp_path):
+    path = str(tmp_path / "latin.shp")
+    with ShapefileWriter(path, [("NAME", "C", 10, 0)], epsg=32717) as writer:
+        writer.add_polygon([[(0, 0), (1, 0), (1, 1)]], {"NAME": "uno"})
+    os.remove(str(tmp_path / "latin.cpg"))  # Latin-1, the default without a .cpg
+
+    writer = ShapefileWriter.append(path)
+    writer.add_polygon([[(2, 0), (3, 0), (3, 1)]], {"NAME": "año"})
+    writer.close()
+
+    with ShapefileReader(path) as reader:
+        assert [attributes["NAME"] for _, attributes in reader] == ["uno", "año"]
+        assert reader.bbox == (0.0, 0.0, 3.0, 1.0)
@@ -0,0 +1,88 @@
+"""
+SheetIndex against a brute-force scan of the sheet records.
+
+Run from the repository root:
+    python -m pytest tests
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "scripts"))
+
+from sheet_index import SheetIndex  # noqa: E402
+
+
+def scan_locate(bounds, x, y):
+    found = np.full(len(x), -1, dtype=np.intp)
+    for i, (px, py) in enumerate(zip(x, y)):
+        hits = np.flatnonzero((bounds[:, 0] <= px) & (px < bounds[:, 2]) & (bounds[:, 1] <= py) & (py < bounds[:, 3]))
+        if len(hits):
+            found[i] = hits[0]
+    return found
+
+
+def scan_touching(bounds, box):
+    xmin, ymin, xmax, ymax = box
+    return np.flatnonzero((bounds[:, 0] <= xmax) & (bounds[:, 2] >= xmin) & (bounds[:, 1] <= ymax) & (bounds[:, 3] >= ymin))
+
+
+def random_layout(rng, n_irregular):
+    """A 12 x 8 grid with holes, one duplicated sheet and irregular sheets anywhere (also far off the grid)."""
+    x0, y0, dx, dy = 500000.3, 9700000.7, 15000.0, 10000.0
+    cells = [(c, r) for c in range(12) for r in range(8) if rng.random() < 0.85]
+    bounds = [(x0 + c * dx, y0 + r * dy, x0 + (c + 1) * dx, y0 + (r + 1) * dy) for c, r in cells]
+    bounds.append(bounds[len(bounds) // 2])
+    corners = rng.uniform((x0 - 5 * dx, y0 - 5 * dy), (x0 + 20 * dx, y0 + 15 * dy), (n_irregular, 2))
+    sizes = rng.uniform(0.2, 2.5, (n_irregular, 2)) * (dx, dy)
+    bounds.extend(np.column_stack([corners, corners + sizes]).tolist())
+    bounds = np.array(bounds)[rng.permutation(len(bounds))]
+
+    x = rng.uniform(x0 - 6 * dx, x0 + 22 * dx, 3000)
+    y = rng.uniform(y0 - 6 * dy, y0 + 16 * dy, 3000)
+    # Points exactly on grid lines and sheet corners
+    x[:300] = x0 + rng.integers(-1, 13, 300) * dx
+    y[:300] = y0 + rng.integers(-1, 9, 300) * dy
+    return bounds, x, y
+
+
+@pytest.mark.parametrize("seed", range(40))
+@pytest.mark.parametrize("dense_limit", [1 << 22, 1])
+def test_matches_scan(seed, dense_limit):
+    rng = np.random.default_rng(seed)
+    bounds, x, y = random_layout(rng, n_irregular=seed % 4)
+    index = SheetIndex([f"s{i}" for i in range(len(bounds))], bounds, dense_limit=dense_limit)
+
+    assert np.array_equal(index.locate(x, y, chunk_size=500), scan_locate(bounds, x, y))
+
+    boxes = np.column_stack([x[:500], y[:500], x[:500] + rng.uniform(0, 40000, 500), y[:500] + rng.uniform(0, 30000, 500)])
+    queries, sheets = index.touching_bulk(boxes)
+    for i, box in enumerate(boxes):
+        assert np.array_equal(sheets[queries == i], scan_touching(bounds, box))
+
+
+def test_off_grid_sheets_outside_every_cell():
+    index = SheetIndex(["a", "b", "far"], [(0, 0, 10, 10), (10, 0, 20, 10), (1000, 1000, 1005, 1003)])
+    assert index.grid is not None
+    assert index.locate([5, 15, 1002, 500], [5, 5, 1001, 500]).tolist() == [0, 1, 2, -1]
+    assert index.touching(0, 0, 2000, 2000).tolist() == [0, 1, 2]
+
+
+def test_no_grid_and_empty():
+    index = SheetIndex(["a", "b"], [(0, 0, 1, 1), (0.5, 0.5, 3, 2)])
+    assert index.grid is None
+    assert index.locate([0.7, 2, 5], [0.7, 1, 5]).tolist() == [0, 1, -1]
+    assert index.touching(0.9, 0.9, 1, 1).tolist() == [0, 1]
+
+    empty = SheetIndex([], np.empty((0, 4)))
+    assert empty.locate([1], [1]).tolist() == [-1]
+    assert len(empty.touching(0, 0, 1, 1)) == 0
+
+
+def test_nan_points_match_nothing():
+    index = SheetIndex(["a", "b", "far"], [(0, 0, 10, 10), (10, 0, 20, 10), (1000, 1000, 1005, 1003)])
+    assert index.locate([np.nan, 5], [5, np.nan]).tolist() == [-1, -1]
+    assert index.locate_names([5, np.nan], [5, 5]).tolist() == ["a", None]
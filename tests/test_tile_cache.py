@@ -0,0 +1,147 @@
+"""
+TileCache against a tile server on localhost (http.server): revalidation, 404s and eviction.
+
+Run from the repository root:
+    python -m pytest tests
+"""
+
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "scripts"))
+
+from tile_cache import TileCache, tiles_for_extent  # noqa: E402
+
+MISSING_ROW = 99  # tiles in this row answer 404
+
+
+class TileServer:
+    """Serves /{z}/{x}/{y}.png as 1 KiB tiles with an ETag per version, counting requests by status."""
+
+    def __init__(self, max_age=3600):
+        self.max_age = max_age
+        self.version = 1
+        self.requests = {200: 0, 304: 0, 404: 0}
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                z, x, y = (int(part) for part in self.path.split(".")[0].strip("/").split("/"))
+                etag = f'"{z}-{x}-{y}-v{server.version}"'
+                if y == MISSING_ROW:
+                    status = 404
+                elif self.headers.get("If-None-Match") == etag:
+                    status = 304
+                else:
+                    status = 200
+                with server._lock:
+                    server.requests[status] += 1
+                if status == 404:
+                    self.send_error(404)
+                    return
+                self.send_response(status)
+                self.send_header("ETag", etag)
+                self.send_header("Cache-Control", f"max-age={server.max_age}")
+                if status == 304:
+                    self.end_headers()
+                    return
+                body = etag.encode().ljust(1024, b".")
+                self.send_header("Content-Type", "image/png")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.template = f"http://127.0.0.1:{self.httpd.server_address[1]}/{{z}}/{{x}}/{{y}}.png"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def server():
+    server = TileServer()
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def cache(tmp_path, server):
+    with TileCache(str(tmp_path / "tiles.sqlite"), {"local": server.template}, timeout=5) as cache:
+        yield cache
+
+
+def test_fresh_tiles_are_served_from_the_cache(cache, server):
+    first = cache.get("local", 3, 1, 2)
+    assert first.startswith(b'"3-1-2-v1"')
+    assert cache.get("local", 3, 1, 2) == first
+    assert server.requests == {200: 1, 304: 0, 404: 0}
+    assert cache.stats["hits"] == 1 and cache.stats["misses"] == 1
+
+
+def test_expired_tiles_are_revalidated_with_their_etag(cache, server):
+    server.max_age = 0
+    first = cache.get("local", 3, 1, 2)
+    assert cache.get("local", 3, 1, 2) == first  # expired, same ETag: 304
+    assert server.requests[304] == 1 and cache.stats["revalidated"] == 1
+
+    server.version = 2
+    assert cache.get("local", 3, 1, 2).startswith(b'"3-1-2-v2"')  # expired, new ETag: 200
+    assert server.requests[200] == 2
+
+
+def test_missing_tiles_return_none(cache, server):
+    assert cache.get("local", 3, 1, MISSING_ROW) is None
+    assert cache.get_with_type("local", 3, 1, MISSING_ROW) == (None, None)
+    assert server.requests[404] == 2
+    assert cache.stats["misses"] == 2
+
+
+def test_stale_tiles_are_served_when_the_server_is_gone(cache, server):
+    server.max_age = 0
+    first = cache.get("local", 3, 1, 2)
+    server.close()
+    cache.timeout = 1
+    assert cache.get("local", 3, 1, 2) == first
+    assert cache.stats["stale"] == 1
+    assert cache.get("local", 3, 1, 3, offline=True) is None
+
+
+def test_least_recently_used_tiles_are_evicted(tmp_path, server):
+    with TileCache(str(tmp_path / "tiles.sqlite"), {"local": server.template}, max_bytes=3 * 1024) as cache:
+        for x in range(3):
+            cache.get("local", 5, x, 0)
+        cache.get("local", 5, 0, 0)  # touch: (5, 1, 0) is now the least recently used
+        cache.get("local", 5, 3, 0)
+
+        assert cache.size_bytes == 3 * 1024
+        assert cache.stats["evicted"] == 1
+        assert cache.get("local", 5, 1, 0, offline=True) is None
+        assert cache.get("local", 5, 0, 0, offline=True) is not None
+
+
+def test_stats_add_up_under_concurrent_prefetch(cache, server):
+    server.max_age = 0  # every later prefetch revalidates every tile
+    extent, zooms = (-180, -85, 180, 85), range(1, 4)  # 4 + 16 + 64 tiles
+    assert cache.prefetch("local", extent, zooms, max_workers=8)["downloaded"] == 84
+    for _ in range(3):
+        cache.prefetch("local", extent, zooms, max_workers=8)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        tiles = list(tiles_for_extent(*extent, zooms)) * 4
+        assert all(executor.map(lambda tile: cache.get("local", *tile, offline=True), tiles))
+
+    assert cache.stats["misses"] == server.requests[200] == 84
+    assert cache.stats["revalidated"] == server.requests[304] == 3 * 84
+    assert cache.stats["hits"] == 4 * 84